@@ -0,0 +1,108 @@
+"""Benchmark of read_files() on a thread pool against IGRABase.read().
+
+Usage::
+
+    python benchmarks/bulk.py [number of files, default 16] [soundings per file, default 2000]
+
+read_files() runs the byte matrix parsing on the threads and builds the (date, hour) keys and
+str fields afterwards in the calling thread. For every thread count the wall time and the CPU
+time of the threads (time.thread_time()) are reported, and the time of the serial part. The
+CPU/wall ratio is the number of threads that parsed at the same time on average: close to 1
+means the threads took turns, close to the number of threads (at most the number of cores)
+means they ran in parallel, i.e. the GIL was released. On a single core the ratio is at most 1
+and scaling can not be shown, the benchmark warns then.
+
+Measured on a 1 CPU container (Python 3.11, NumPy 1.23), 16 files of 2000 soundings (96 MB):
+IGRABase.read() 1.6-1.8 MB/s, read_files() 16-21 MB/s for 1-8 threads, CPU/wall 0.95-0.99 as
+expected on one core. The serial part takes 0.5-0.8 s of 4.6-5.9 s (10-15 %), which bounds
+the speed up on N cores to about 1 / (0.15 + 0.85 / N). Not yet measured on several cores.
+"""
+
+# STD-lib
+import concurrent.futures
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import warnings
+
+# 3rd-party
+
+# Local
+from pyigra2.bulk import _build_table, _parse_bytes
+from pyigra2.observations import Observations
+
+DATA = pathlib.Path(__file__).parent.parent / "tests" / "data"
+
+
+def write_files(directory, num_files, num_soundings):
+    """Observation files made of copies of the test file, one year per copy"""
+    text = (DATA / "SWM00002527_observation_multi.txt").read_text()
+    copies = max(num_soundings // text.count("#"), 1)
+    content = "".join(
+        text.replace("#SWM00002527 2018", f"#SWM00002527 {1000 + copy}")
+        for copy in range(copies)
+    )
+
+    paths = []
+    for number in range(num_files):
+        path = pathlib.Path(directory) / f"SWM{number:08d}-data.txt"
+        path.write_text(content)
+        paths.append(path)
+    return paths
+
+
+def main(num_files=16, num_soundings=2000):
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_files(directory, num_files, num_soundings)
+        size = sum(path.stat().st_size for path in paths) / 1e6
+        print(f"{num_files} files, {size:.1f} MB, {os.cpu_count()} CPUs")
+
+        started = time.perf_counter()
+        for path in paths[:2]:
+            obs = Observations(path)
+            obs.read()
+            obs.convert_to_numpy()
+        seconds = (time.perf_counter() - started) * num_files / 2
+        print(f"IGRABase.read: {seconds:.3f} s ({size / seconds:.1f} MB/s, estimated)")
+
+        if os.cpu_count() == 1:
+            warnings.warn("1 CPU: thread scaling and GIL release can not be shown.")
+
+        for threads in (1, 2, 4, 8):
+            seconds, cpu_seconds, serial = threaded_parse(paths, threads)
+            total = seconds + serial
+            print(
+                f"read_files, {threads} threads: {total:.3f} s ({size / total:.1f} MB/s), "
+                f"threads {seconds:.3f} s with CPU/wall {cpu_seconds / seconds:.2f}, "
+                f"keys and str fields {serial:.3f} s"
+            )
+
+
+def threaded_parse(paths, threads):
+    """Parse paths as read_files() does
+
+    :return: (wall seconds of the threads, CPU seconds summed over the threads, seconds of
+             the serial part in the calling thread)
+    """
+
+    def timed_parse(path):
+        started = time.thread_time()
+        columns = _parse_bytes(path, True)
+        return columns, time.thread_time() - started
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+        results = list(executor.map(timed_parse, paths))
+    seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    tables = [_build_table(columns) for columns, _ in results]
+    serial = time.perf_counter() - started
+    assert len(tables) == len(paths)
+    return seconds, sum(cpu for _, cpu in results), serial
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,70 @@
+"""Benchmark of the SQLite ingest of converted soundings.
+
+Usage::
+
+    python benchmarks/database.py [number of copies of the test file, default 2000]
+
+The target is at least 1e5 levels/s, the benchmark exits with status 1 below it.
+
+Measured on a 1 CPU container (Python 3.11, SQLite 3.40, NumPy 1.23), 10000 soundings with
+552000 levels: 0.98e5 to 1.9e5 levels/s over six runs. Almost all of the time is spent in
+executemany(), i.e. in SQLite, so the result varies with the disk and the load of the machine.
+"""
+
+# STD-lib
+import pathlib
+import sys
+import tempfile
+import time
+import warnings
+
+# 3rd-party
+
+# Local
+from pyigra2.database import connect, insert, query
+from pyigra2.observations import Observations
+from pyigra2.table import SoundingTable
+
+DATA = pathlib.Path(__file__).parent.parent / "tests" / "data"
+
+# Required ingest rate [levels/s]
+TARGET = 1e5
+
+
+def main(copies=2000):
+    obs = Observations(DATA / "SWM00002527_observation_multi.txt")
+    obs.read()
+    obs.convert_to_numpy()
+
+    # The same soundings many times, with distinct keys
+    data = {
+        f"{copy}-{date}": hours
+        for copy in range(copies)
+        for date, hours in obs.converted_data.items()
+    }
+    table = SoundingTable.from_data(data)
+    num_levels = int(table.offsets[-1])
+    print(f"{len(table)} soundings, {num_levels} levels")
+
+    with tempfile.TemporaryDirectory() as directory:
+        connection = connect(pathlib.Path(directory) / "igra2.sqlite")
+
+        started = time.perf_counter()
+        insert(connection, table)
+        seconds = time.perf_counter() - started
+
+        stored = query(connection, "SELECT COUNT(*) AS n FROM levels")["n"][0]
+        connection.close()
+
+    assert stored == num_levels
+    rate = num_levels / seconds
+    print(f"insert: {seconds:.3f} s ({rate:.0f} levels/s)")
+
+    if rate < TARGET:
+        warnings.warn(f"Ingest rate {rate:.0f} levels/s is below {TARGET:.0f} levels/s.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(arg) for arg in sys.argv[1:]]))
@@ -0,0 +1,82 @@
+"""Benchmark of the vectorized wind module against a per-sounding loop.
+
+Usage::
+
+    python benchmarks/wind.py [number of copies of the test file, default 2000]
+"""
+
+# STD-lib
+import pathlib
+import sys
+import time
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.observations import Observations
+from pyigra2.table import SoundingTable
+from pyigra2.wind import bulk_shear
+
+DATA = pathlib.Path(__file__).parent.parent / "tests" / "data"
+
+
+def per_sounding_shear(data, top=6000.0):
+    """0-top bulk shear, one sounding at a time from converted_data"""
+    shear = []
+    for hours in data.values():
+        for head_param in hours.values():
+            parameters = head_param["parameters"]
+            u = -parameters["WSPD"] * np.sin(parameters["WDIR"])
+            v = -parameters["WSPD"] * np.cos(parameters["WDIR"])
+            height = parameters["GPH"]
+            ground = np.nanmin(height)
+
+            valid = np.isfinite(height) & np.isfinite(u) & np.isfinite(v)
+            order = np.argsort(height[valid])
+            z = height[valid][order] - ground
+            if not len(z) or z[-1] < top:
+                shear.append((np.nan, np.nan))
+                continue
+            shear.append(
+                (
+                    np.interp(top, z, u[valid][order])
+                    - np.interp(0, z, u[valid][order]),
+                    np.interp(top, z, v[valid][order])
+                    - np.interp(0, z, v[valid][order]),
+                )
+            )
+    return np.array(shear)
+
+
+def main(copies=2000):
+    obs = Observations(DATA / "SWM00002527_observation_multi.txt")
+    obs.read()
+    obs.convert_to_numpy()
+
+    # The same soundings many times, as dict and as table
+    data = {
+        f"{copy}-{date}": hours
+        for copy in range(copies)
+        for date, hours in obs.converted_data.items()
+    }
+    table = SoundingTable.from_data(data)
+    print(f"{len(table)} soundings, {int(table.offsets[-1])} levels")
+
+    started = time.perf_counter()
+    loop = per_sounding_shear(data)
+    loop_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    du, dv = bulk_shear(table)
+    vector_seconds = time.perf_counter() - started
+
+    np.testing.assert_allclose(np.column_stack([du, dv]), loop, atol=1e-9)
+    print(f"per sounding: {loop_seconds:.3f} s")
+    print(
+        f"vectorized:   {vector_seconds:.3f} s ({loop_seconds / vector_seconds:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -3,3 +3,6 @@
 __author__ = """Patrick Jonsson"""
 __email__ = "patrickjonssonbbg@gmail.com"
 __version__ = "0.1.0"
+
+# Local
+from pyigra2.reader import open_igra2  # noqa: F401
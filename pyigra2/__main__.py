@@ -0,0 +1,7 @@
+# STD-lib
+import sys
+
+# Local
+from pyigra2.cli import main
+
+sys.exit(main())
@@ -1,10 +1,37 @@
 # STD-lib
 import pathlib
+import sys
 
 # 3rd-party
 import numpy as np
 
 # Local
+from pyigra2 import render
+from pyigra2.lazy import DEFAULT_CACHE_SIZE, LazyConvertedData
+from pyigra2.levels import LevelIndex, series
+from pyigra2.table import SoundingTable
+from pyigra2.timeindex import TimeIndex
+from pyigra2.validation import validate_data
+
+
+def fixed_width_columns(lines, name_index):
+    """Fields of many fixed-width lines, sliced as columns of one byte matrix
+
+    The lines are copied once into a (num_lines, width) byte matrix, no line is split in
+    python. Short lines are padded with zero bytes, which numpy strips from 'S' values.
+
+    :param lines: list of lines (bytes)
+    :param name_index: {name: [first, last]}, 1-based inclusive, as _header_name_index
+    :return: dict name: bytes array(num_lines)
+    """
+    width = max(last for _, last in name_index.values())
+    matrix = np.array(lines, dtype=f"S{width}").view(np.uint8).reshape(len(lines), width)
+    return {
+        name: np.ascontiguousarray(matrix[:, first - 1 : last])
+        .view(f"S{last - first + 1}")
+        .ravel()
+        for name, (first, last) in name_index.items()
+    }
 
 
 class IGRABase:
@@ -26,12 +53,28 @@ class IGRABase:
         self.raw_data = {}
         self.converted_data = {}
 
+        # Malformed soundings removed in tolerant mode, structured as raw_data with an
+        # additional "errors" list per sounding
+        self.quarantine = {}
+
         # Internal params:
         self._header_name_index = {}
         self._header_units = {}
         self._parameters_name_index = {}
         self._parameter_units = {}
 
+        # Non-numeric fields and numeric fields that may be blank, used by validate()
+        self._text_fields = set()
+        self._blank_fields = set()
+
+        # Line number of the current header and of the header of every sounding
+        self._header_line = None
+        self._header_lines = {}
+
+        # SoundingTable of converted_data and its LevelIndex per coordinate, see level_series()
+        self._level_table = None
+        self._level_indexes = {}
+
         # Duplicate hour counter
         self._dublicate_hour_counter = 0
 
@@ -42,9 +85,13 @@ class IGRABase:
         self._header = {}
         self._parameters = {}
 
-    def read(self):
+    def read(self, tolerant=False):
         """Reads the file and stores the data in self.raw_data
 
+        In tolerant mode malformed soundings (see validate()) are moved from raw_data to
+        quarantine instead of failing later in convert_to_numpy().
+
+        :param tolerant: quarantine malformed soundings
         :return: None
         """
         # Run read if and only if header and parameter names and indies are non-empty
@@ -58,35 +105,115 @@ class IGRABase:
             with open(self.filename, "r") as f:
                 lines = f.readlines()
 
-            # Reset header and parameters:
-            self._reset_header_parameters()
+            self._read_lines(lines)
 
-            # Loop through all lines in lines
-            for line in lines:
-                # Lines starting with # are headers
-                if line[0] == "#":
-                    # Add data to self.raw_data?
-                    if self._add_data_bool:
-                        self._add_data()
+            if tolerant:
+                self._quarantine(self.validate())
+
+    def validate(self):
+        """Check raw_data for short lines, non-numeric fields and NUMLEV mismatches
+
+        The check is vectorized over all fields of all soundings, see
+        validation.validate_data().
+
+        :return: dict (date, hour): list of error messages, only malformed soundings
+        """
+        return validate_data(
+            self.raw_data,
+            self._header_name_index,
+            self._parameters_name_index,
+            self._text_fields,
+            self._blank_fields,
+            self._header_lines,
+        )
+
+    def iter_chunks(self, chunk_size=1000, convert=True):
+        """Read the file in chunks of soundings instead of all at once.
+
+        Every chunk is a new instance of the same class holding at most about chunk_size soundings
+        in raw_data (and converted_data if convert is True). Chunks are only split between dates,
+        so the HOUR_X keys are identical to the ones created by read(). The file is streamed line
+        by line, i.e. the whole file is never held in memory.
 
-                    # Set _add_data_bool to true to save for all loop exclude the first
-                    self._add_data_bool = True
+        :param chunk_size: number of soundings per chunk
+        :param convert: call convert_to_numpy() on each chunk before it is yielded
+        :return: generator of chunks
+        """
+        # Run if and only if header and parameter names and indies are non-empty
+        if not (self._header_name_index and self._parameters_name_index):
+            return
+
+        # Check if file exists:
+        if not self.filename.exists():
+            raise FileNotFoundError(f"File {self.filename.as_posix()} not found.")
 
-                    # Set _header:
-                    self._set_header(line)
+        chunk = self._new_chunk()
+        num_soundings = 0
+
+        with open(self.filename, "r") as f:
+            for line in f:
+                # Lines starting with # are headers
+                if line[0] == "#":
+                    if chunk._add_data_bool:
+                        previous_date = self._header_date(chunk._header)
+                        chunk._add_data()
+                        num_soundings += 1
+
+                        # Yield chunk when full, but never split a date
+                        if (
+                            num_soundings >= chunk_size
+                            and self._line_date(line) != previous_date
+                        ):
+                            yield self._finish_chunk(chunk, convert)
+                            chunk = self._new_chunk()
+                            num_soundings = 0
+
+                    chunk._add_data_bool = True
+                    chunk._set_header(line)
 
                 else:
-                    # Set _parameters:
-                    self._set_parameters(line)
+                    chunk._set_parameters(line)
 
-            # Add last instance of data:
-            self._add_data()
+        # Add last instance of data:
+        if chunk._add_data_bool:
+            chunk._add_data()
+            yield self._finish_chunk(chunk, convert)
 
-    def convert_to_numpy(self):
+    def convert_to_numpy(
+        self, lazy=False, cache_size=DEFAULT_CACHE_SIZE, tolerant=False
+    ):
         """Convert raw_data to correct types and SI-units.
 
+        With lazy=True nothing is converted up front. converted_data becomes a read-only
+        mapping (LazyConvertedData) that converts a sounding when it is first accessed and
+        keeps the last cache_size converted soundings in memory.
+
+        With tolerant=True malformed soundings are quarantined (see read()) before the
+        conversion, and soundings that still fail to convert are quarantined too.
+
+        :param lazy: convert soundings on access instead of all at once
+        :param cache_size: number of soundings cached in lazy mode, None = all
+        :param tolerant: quarantine malformed soundings instead of raising
         :return: None
         """
+        # Level indexes of earlier converted data
+        self._level_table = None
+        self._level_indexes = {}
+
+        if tolerant:
+            self._quarantine(self.validate())
+
+        if lazy:
+            self.converted_data = LazyConvertedData(self, cache_size)
+            return
+
+        # Replace a lazy mapping by a dict
+        if not isinstance(self.converted_data, dict):
+            self.converted_data = {}
+
+        # Soundings failing the conversion in tolerant mode
+        failed = {}
+
         for date, hours in self.raw_data.items():
 
             if date not in self.converted_data:
@@ -96,11 +223,61 @@ class IGRABase:
                 if hour not in self.converted_data[date]:
                     self.converted_data[date][hour] = {}
 
-                # Convert headers
-                self._convert_header(head_param["header"], date, hour)
+                try:
+                    # Convert headers
+                    self._convert_header(head_param["header"], date, hour)
+
+                    # Convert parameters
+                    self._convert_parameters(head_param["parameters"], date, hour)
+                except ValueError as error:
+                    if not tolerant:
+                        raise
+                    failed[(date, hour)] = [f"Conversion failed: {error}"]
+
+        self._quarantine(failed)
+
+    def level_series(self, name, level, coordinate="PRESS", interpolate=False):
+        """Time series of one converted parameter at one level, e.g. TEMP at 50000 Pa
+
+        The columnar table of converted_data and a LevelIndex per coordinate are built on the
+        first call and kept until convert_to_numpy() is called again, so repeated series only
+        cost a lookup.
+
+        :param name: parameter name
+        :param level: level in the unit of the coordinate, e.g. 50000 [Pa] or 5000 [m]
+        :param coordinate: parameter to locate the level with, e.g. PRESS, GPH or CALCGPH
+        :param interpolate: interpolate between the levels around the level, else exact match
+        :return: (times, values) sorted in time, values are np.nan where missing
+        """
+        if self._level_table is None:
+            self._level_table = SoundingTable.from_reader(self, "converted")
+        if coordinate not in self._level_indexes:
+            self._level_indexes[coordinate] = LevelIndex(self._level_table, coordinate)
+
+        return series(
+            self._level_table,
+            self._level_indexes[coordinate],
+            name,
+            level,
+            interpolate,
+        )
 
-                # Convert parameters
-                self._convert_parameters(head_param["parameters"], date, hour)
+    def time_index(self, source="raw"):
+        """Build a sorted datetime64 index over all soundings
+
+        :param source: 'raw' or 'converted', the data to build the index from
+        :return: TimeIndex
+        """
+        if source == "converted":
+            data = self.converted_data
+        elif source == "raw":
+            data = self.raw_data
+        else:
+            raise ValueError(
+                f"The source variable should equal to 'converted or 'raw', got {source}' "
+            )
+
+        return TimeIndex.from_data(data)
 
     def print(self, date, hour, source="converted"):
         """Print date and hour to screen based on converted data
@@ -109,6 +286,26 @@ class IGRABase:
         :param hour: hour to print
         :return: None
         """
+        sys.stdout.write(self.render([(date, hour)], fmt="text", source=source))
+
+    def render(self, keys=None, fmt="text", source="converted", file=None):
+        """Render soundings as text, CSV or fixed-width columns
+
+        All levels of all soundings are formatted column by column with vectorized string
+        operations and written with a single call.
+
+        Formats:
+
+        * text - the layout of print(), one block per sounding
+        * csv - one row per level, DATE and HOUR as first columns
+        * fixed - as csv, but right aligned fixed-width columns
+
+        :param keys: list of (date, hour) to render, None = all soundings
+        :param fmt: 'text', 'csv' or 'fixed'
+        :param source: 'converted' or 'raw'
+        :param file: path or file object to write to, None = return the str
+        :return: rendered str if file is None, else None
+        """
         if source == "converted":
             data = self.converted_data
             unit_index = 1
@@ -120,65 +317,80 @@ class IGRABase:
                 f"The source variable should equal to 'converted or 'raw', got {source}' "
             )
 
-        if date not in data:
-            raise KeyError(f"Date {date} not in data.")
+        if keys is None:
+            keys = [(date, hour) for date, hours in data.items() for hour in hours]
+
+        # Collect the soundings to render
+        selected = {}
+        for date, hour in keys:
+            if date not in data:
+                raise KeyError(f"Date {date} not in data.")
+
+            if hour not in data[date]:
+                raise KeyError(f"Hour {hour} not found for date {date} in data.")
+
+            selected.setdefault(date, {})[hour] = data[date][hour]
+
+        table = SoundingTable.from_data(selected)
+        if fmt == "text":
+            headers = [data[date][hour]["header"] for date, hour in table.keys]
+            out = render.text(
+                table,
+                headers,
+                self._header_units,
+                self._parameter_units,
+                source,
+                unit_index,
+            )
+        elif fmt == "csv":
+            out = render.csv(table)
+        elif fmt == "fixed":
+            out = render.fixed_width(table)
+        else:
+            raise ValueError(
+                f"The fmt variable should equal to 'text', 'csv' or 'fixed', got {fmt}"
+            )
 
-        if hour not in data[date]:
-            raise KeyError(f"Hour {hour} not found for date {date} in data.")
+        if file is None:
+            return out
 
-        # Helpers
-        params = data[date][hour]["parameters"]
-        header = data[date][hour]["header"]
+        if hasattr(file, "write"):
+            file.write(out)
+        else:
+            with open(file, "w") as f:
+                f.write(out)
 
-        # Print title
-        print(150 * "-")
-        print(
-            f"Station: {header['ID']}\n"
-            f"Date: {header['YEAR']}-{header['MONTH']}-{header['DAY']}\n"
-            f"Hour: {header['HOUR']}\n"
-            f"Data type: {source}\n"
-        )
+    def _read_lines(self, lines, first_line=1):
+        """Collect the soundings of lines in self.raw_data
 
-        # Print data:
-        width_add = 7
-        width_all = 0
-        width_vertical = 20
-
-        # Print headers:
-        print(f"Header information:")
-        for name, value in header.items():
-            if name == "HEADREC":
-                continue
-            name_unit = f"{name} [{self._header_units[name][unit_index]}]"
-            print(f"{name_unit.rjust(width_vertical)}: {value}")
-
-        # Print parameter units
-        print(f"\nParameters and units:")
-        for name, value in self._parameter_units.items():
-            print(f"{name.rjust(width_vertical)}: [{value[unit_index]}]")
-        print("\n", end="")
-
-        # Print parameter names:
-        for param_name in params.keys():
-            width = len(param_name) + width_add
-            print(param_name.rjust(width), end="")
-            width_all += width
-        print("\n" + (width_all + width_add) * "-")
-
-        # Print parameter data
-        num_data_points = len(params[list(params.keys())[0]])
-        for idx in range(num_data_points):
-            for param_name, value in params.items():
-                width = len(param_name) + width_add
-                item = value[idx]
-                if isinstance(item, np.float):
-                    item = f"{item:.2f}"
-                else:
-                    item = f"{item}"
-                print(item.rjust(width), end="")
-            print("\n", end="")
+        :param lines: lines of the file, starting with a header line
+        :param first_line: line number of the first line in the file
+        :return: None
+        """
+        # Reset header and parameters:
+        self._reset_header_parameters()
+
+        # Loop through all lines in lines
+        for line_number, line in enumerate(lines, start=first_line):
+            # Lines starting with # are headers
+            if line[0] == "#":
+                # Add data to self.raw_data?
+                if self._add_data_bool:
+                    self._add_data()
+
+                # Set _add_data_bool to true to save for all loop exclude the first
+                self._add_data_bool = True
+                self._header_line = line_number
+
+                # Set _header:
+                self._set_header(line)
+
+            else:
+                # Set _parameters:
+                self._set_parameters(line)
 
-        print((width_all + width_add) * "_")
+        # Add last instance of data:
+        self._add_data()
 
     def _add_data(self):
         """Add collected data to self.raw_data
@@ -186,11 +398,7 @@ class IGRABase:
         :return: None
         """
         # Get date
-        date = (
-            f"{self._header['YEAR']}-"
-            f"{self._header['MONTH']}-"
-            f"{self._header['DAY']}"
-        )
+        date = self._header_date(self._header)
 
         # Add date to data. This should happen only ones
         if date not in self.raw_data:
@@ -210,10 +418,72 @@ class IGRABase:
             "header": self._header,
             "parameters": self._parameters,
         }
+        self._header_lines[(date, hour)] = self._header_line
 
         # Reset headers and parameters
         self._reset_header_parameters()
 
+    def _quarantine(self, problems):
+        """Move soundings from raw_data (and converted_data) to quarantine
+
+        :param problems: dict (date, hour): list of error messages
+        :return: None
+        """
+        for (date, hour), errors in problems.items():
+            sounding = self.raw_data[date].pop(hour)
+            sounding["errors"] = errors
+            self.quarantine.setdefault(date, {})[hour] = sounding
+
+            if not self.raw_data[date]:
+                del self.raw_data[date]
+
+            if isinstance(self.converted_data, dict) and date in self.converted_data:
+                self.converted_data[date].pop(hour, None)
+                if not self.converted_data[date]:
+                    del self.converted_data[date]
+
+    def _new_chunk(self):
+        """Create an empty instance of the same class used as a chunk by iter_chunks()
+
+        :return: new instance
+        """
+        chunk = type(self)(self.filename)
+        chunk._reset_header_parameters()
+        return chunk
+
+    @staticmethod
+    def _finish_chunk(chunk, convert):
+        """Convert chunk if requested
+
+        :param chunk: chunk to finish
+        :param convert: call convert_to_numpy()
+        :return: chunk
+        """
+        if convert:
+            chunk.convert_to_numpy()
+        return chunk
+
+    @staticmethod
+    def _header_date(header):
+        """Date key (YYYY-MM-DD) of a header
+
+        :param header: header dict
+        :return: date as str
+        """
+        return f"{header['YEAR']}-{header['MONTH']}-{header['DAY']}"
+
+    def _line_date(self, line):
+        """Date key (YYYY-MM-DD) of a header line
+
+        :param line: header line from file
+        :return: date as str
+        """
+        header = {}
+        for header_name in ("YEAR", "MONTH", "DAY"):
+            index = self._header_name_index[header_name]
+            header[header_name] = line[index[0] - 1 : index[1]]
+        return self._header_date(header)
+
     def _reset_header_parameters(self):
         """Reset the internal parameters for the next sounding.
 
@@ -0,0 +1,211 @@
+# STD-lib
+import concurrent.futures
+import pathlib
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.conversions import CONVERSIONS, INTEGER_FIELDS
+from pyigra2.reader import READERS, detect_format
+from pyigra2.table import SoundingTable
+from pyigra2.timeindex import sounding_keys
+
+NEWLINE = ord("\n")
+CARRIAGE_RETURN = ord("\r")
+BLANK = ord(" ")
+MINUS = ord("-")
+ZERO = ord("0")
+NINE = ord("9")
+
+
+def parse_file(path, convert=True, unique=True):
+    """Parse an observation or derived file into a SoundingTable with array operations
+
+    The file is read as one byte buffer and every line is sliced into a fixed width byte
+    matrix. Numbers are computed from the digit bytes with vectorized arithmetic. The result
+    equals SoundingTable.from_reader() of a read (and converted) reader: of soundings with the
+    same (date, hour) key the last one is kept, at the place of the first. Blank lines are
+    skipped (the reader fails to convert them). Without unique every sounding is kept in file
+    order, also repeated (date, hour) keys (see duplicates.file_duplicates()).
+
+    :param path: /path/to/file.txt
+    :param convert: convert the values as convert_to_numpy(), else raw field text
+    :param unique: keep one sounding per (date, hour) key as the reader
+    :return: SoundingTable
+    """
+    return _build_table(_parse_bytes(path, convert), unique)
+
+
+def read_files(paths, convert=True, max_workers=None):
+    """Parse many files concurrently on a thread pool, see parse_file()
+
+    Threads share the memory of the process, no worker processes are started. The threads
+    only run the byte matrix operations, which are NumPy operations on numeric arrays. The
+    (date, hour) keys and the str fields need the GIL and are built afterwards in the calling
+    thread, benchmarks/bulk.py measures both parts.
+
+    :param paths: /path/to/files
+    :param convert: convert the values as convert_to_numpy()
+    :param max_workers: number of threads, None = ThreadPoolExecutor default
+    :return: list of SoundingTable, in the order of paths
+    """
+    paths = list(paths)
+    if max_workers == 1:
+        return [parse_file(path, convert) for path in paths]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        parsed = list(executor.map(lambda path: _parse_bytes(path, convert), paths))
+    return [_build_table(columns) for columns in parsed]
+
+
+def _parse_bytes(path, convert):
+    """Fields of a file as numeric and bytes (dtype 'S') arrays, see parse_file()
+
+    :return: dict with header, parameters, num_levels and time_fields (raw header bytes)
+    """
+    path = pathlib.Path(path)
+    fmt = detect_format(path)
+    reader = READERS[fmt](path)
+    conversions = CONVERSIONS[fmt] if convert else None
+
+    data = np.fromfile(path, dtype=np.uint8)
+    line_starts = np.concatenate([[0], np.flatnonzero(data == NEWLINE) + 1])
+    line_ends = np.concatenate([line_starts[1:] - 1, [len(data)]])
+    keep = line_starts < len(data)
+    line_starts, line_ends = line_starts[keep], line_ends[keep]
+
+    # Lines of blanks only are skipped
+    is_text = (data != BLANK) & (data != NEWLINE) & (data != CARRIAGE_RETURN)
+    keep = np.logical_or.reduceat(is_text, line_starts) if len(data) else keep
+    line_starts, line_ends = line_starts[keep], line_ends[keep]
+
+    # Data lines belong to the previous header, lines before the first header are skipped
+    is_header = data[line_starts] == ord("#")
+    sounding = np.cumsum(is_header) - 1
+    is_level = ~is_header & (sounding >= 0)
+
+    header_lines = _line_matrix(
+        data, line_starts[is_header], line_ends[is_header], reader._header_name_index
+    )
+    level_lines = _line_matrix(
+        data, line_starts[is_level], line_ends[is_level], reader._parameters_name_index
+    )
+
+    time_fields = {
+        name: _text(header_lines[:, first - 1 : last], strip=False)
+        for name, (first, last) in reader._header_name_index.items()
+        if name in ("YEAR", "MONTH", "DAY", "HOUR")
+    }
+    header = {
+        name: _field(header_lines[:, first - 1 : last], name, conversions)
+        for name, (first, last) in reader._header_name_index.items()
+    }
+    parameters = {
+        name: _field(level_lines[:, first - 1 : last], name, conversions)
+        for name, (first, last) in reader._parameters_name_index.items()
+    }
+    num_levels = np.bincount(sounding[is_level], minlength=len(header_lines))
+    return dict(
+        header=header,
+        parameters=parameters,
+        num_levels=num_levels,
+        time_fields=time_fields,
+    )
+
+
+def _build_table(columns, unique=True):
+    """SoundingTable of the output of _parse_bytes(), bytes fields are decoded to str"""
+    time_fields = {
+        name: values.astype(f"U{values.itemsize}")
+        for name, values in columns["time_fields"].items()
+    }
+    header = {name: _decode(values) for name, values in columns["header"].items()}
+    parameters = {
+        name: _decode(values) for name, values in columns["parameters"].items()
+    }
+    offsets = np.concatenate([[0], np.cumsum(columns["num_levels"])])
+    keys = sounding_keys(
+        time_fields["YEAR"], time_fields["MONTH"], time_fields["DAY"], time_fields["HOUR"]
+    )
+    table = SoundingTable(keys, header, parameters, offsets)
+    if not unique:
+        return table
+
+    # As raw_data of the reader: soundings grouped by date in order of appearance, the last
+    # sounding of a (date, hour) key replaces the earlier ones
+    rows = {}
+    for row, (date, hour) in enumerate(keys):
+        rows.setdefault(date, {})[hour] = row
+    rows = [row for hours in rows.values() for row in hours.values()]
+    if rows != list(range(len(keys))):
+        table = table.take(np.array(rows, dtype=np.int64))
+    return table
+
+
+def _line_matrix(data, starts, ends, name_index):
+    """Lines as a uint8 matrix(num_lines, width), blank beyond the end of short lines"""
+    width = max(last for _, last in name_index.values())
+    columns = starts[:, None] + np.arange(width)
+    lines = data.take(columns, mode="clip")
+    lines[columns >= ends[:, None]] = BLANK
+    lines[lines == CARRIAGE_RETURN] = BLANK
+    return lines
+
+
+def _field(matrix, name, conversions):
+    """Values of one field, matrix is the uint8 matrix(num_lines, field width)"""
+    if conversions is None:
+        return _text(matrix, strip=False)
+    if name in INTEGER_FIELDS:
+        return _numbers(matrix, name).astype(np.int64)
+    if name not in conversions:
+        return _text(matrix, strip=True)
+
+    missing, divisor, offset = conversions[name]
+    values = _numbers(matrix, name)
+    values[np.isin(values, missing)] = np.nan
+    if divisor != 1.0:
+        values = values / divisor
+    if offset != 0.0:
+        values = values + offset
+    return values
+
+
+def _numbers(matrix, name):
+    """Right aligned integers of a uint8 matrix(num_lines, field width), np.nan if blank"""
+    num_lines, width = matrix.shape
+    is_digit = (matrix >= ZERO) & (matrix <= NINE)
+    is_minus = matrix == MINUS
+    if not (is_digit | is_minus | (matrix == BLANK)).all():
+        raise ValueError(f"Values of {name} are not numbers.")
+
+    # Place value of every column relative to the last digit of the line
+    digits = np.where(is_digit, matrix - ZERO, 0).astype(np.float64)
+    powers = 10.0 ** np.arange(width - 1, -1, -1)
+    last_digit = width - 1 - np.argmax(is_digit[:, ::-1], axis=1)
+    values = (digits @ powers) / powers[last_digit]
+
+    values[is_minus.any(axis=1)] *= -1
+    values[~is_digit.any(axis=1)] = np.nan
+    return values
+
+
+def _decode(values):
+    """Bytes (dtype 'S') to str, other arrays unchanged"""
+    if values.dtype.kind == "S":
+        return values.astype(f"U{values.itemsize}")
+    return values
+
+
+def _text(matrix, strip):
+    """Bytes (dtype 'S') of a uint8 matrix(num_lines, field width), without blanks if strip"""
+    num_lines, width = matrix.shape
+    if strip:
+        # Blanks to NUL moved to the end (stable), trailing NULs are dropped by the 'S' dtype
+        matrix = np.where(matrix == BLANK, 0, matrix).astype(np.uint8)
+        order = np.argsort(matrix == 0, axis=1, kind="stable")
+        matrix = np.take_along_axis(matrix, order, axis=1)
+        width = max(int((matrix != 0).sum(axis=1).max(initial=0)), 1)
+        matrix = matrix[:, :width]
+    return np.ascontiguousarray(matrix).view(f"S{width}").reshape(num_lines)
@@ -0,0 +1,169 @@
+# STD-lib
+# 3rd-party
+import numpy as np
+
+# Data source codes for pressure levels, see P_SRC in igra2-data-format. Code 0 is blank.
+P_SRC_CODES = (
+    "",
+    "bas-data",
+    "cdmp-amr",
+    "cdmp-awc",
+    "cdmp-mgr",
+    "cdmp-zdm",
+    "chuan101",
+    "erac-hud",
+    "iorgc-id",
+    "mfwa-ptu",
+    "ncar-ccd",
+    "ncar-mit",
+    "ncdc6210",
+    "ncdc6301",
+    "ncdc6309",
+    "ncdc6310",
+    "ncdc6314",
+    "ncdc6315",
+    "ncdc6316",
+    "ncdc6319",
+    "ncdc6322",
+    "ncdc6323",
+    "ncdc6324",
+    "ncdc6326",
+    "ncdc6355",
+    "ncdc-gts",
+    "ncdc-nws",
+    "ngdc-har",
+    "usaf-ds3",
+)
+
+# Data source codes for non-pressure levels, see NP_SRC in igra2-data-format. Code 0 is blank.
+NP_SRC_CODES = (
+    "",
+    "cdmp-adp",
+    "cdmp-awc",
+    "cdmp-us2",
+    "cdmp-us3",
+    "cdmp-usm",
+    "chuan101",
+    "erac-hud",
+    "mfwa-wnd",
+    "ncdc6301",
+    "ncdc6309",
+    "ncdc6314",
+    "ncdc-gts",
+    "ncdc-nws",
+    "ngdc-har",
+    "usaf-ds3",
+)
+
+# Dictionary encoded header fields and their fixed categories. Fields without fixed categories
+# (ID) get the sorted unique values of the table.
+CATEGORIES = {"ID": (), "P_SRC": P_SRC_CODES, "NP_SRC": NP_SRC_CODES}
+
+# Integer encoded header fields: [dtype, width in the file]
+INTEGER_FIELDS = {
+    "YEAR": [np.int16, 4],
+    "MONTH": [np.int8, 2],
+    "DAY": [np.int8, 2],
+    "HOUR": [np.int8, 2],
+    "RELTIME": [np.int16, 4],
+}
+
+
+def encode(values, categories=()):
+    """Dictionary encode string values
+
+    Values not in categories are added after them, sorted, so the encoding is lossless and
+    the codes of the given categories do not change.
+
+    :param values: str or bytes array like
+    :param categories: known categories, the code of a value is its position
+    :return: (codes, categories), codes is the smallest unsigned int array that fits,
+             categories is a tuple of str
+    """
+    values = _strings(values)
+    categories = tuple(categories)
+
+    unique, inverse = np.unique(values, return_inverse=True)
+    known = set(categories)
+    categories += tuple(value for value in unique.tolist() if value not in known)
+
+    position = {category: code for code, category in enumerate(categories)}
+    lookup = np.array([position[value] for value in unique.tolist()], dtype=np.int64)
+    dtype = np.min_scalar_type(max(len(categories) - 1, 0))
+    return lookup[inverse.ravel()].astype(dtype), categories
+
+
+def decode(codes, categories):
+    """Values of dictionary encoded codes
+
+    :param codes: int array from encode()
+    :param categories: categories from encode()
+    :return: str array
+    """
+    return np.asarray(categories, dtype=str)[np.asarray(codes, dtype=np.int64)]
+
+
+def encode_header(header, categories=None):
+    """Compact header: dictionary encoded CATEGORIES and integer INTEGER_FIELDS
+
+    Other fields are kept as they are.
+
+    :param header: dict of header arrays, e.g. SoundingTable.header
+    :param categories: dict name: categories to encode with, default CATEGORIES
+    :return: (header, categories), categories holds every encoded field
+    """
+    if categories is None:
+        categories = CATEGORIES
+
+    result = {}
+    used = {}
+    for name, values in header.items():
+        if name in categories:
+            result[name], used[name] = encode(values, categories[name])
+        elif name in INTEGER_FIELDS:
+            result[name] = _strings(values).astype(INTEGER_FIELDS[name][0])
+        else:
+            result[name] = values
+    return result, used
+
+
+def decode_header(header, categories):
+    """Header of encode_header() with the encoded fields as str arrays
+
+    Integer fields are zero padded to their width in the file (e.g. MONTH '05').
+
+    :param header: dict of header arrays from encode_header()
+    :param categories: categories from encode_header()
+    :return: dict of header arrays
+    """
+    result = {}
+    for name, values in header.items():
+        if name in categories:
+            result[name] = decode(values, categories[name])
+        elif name in INTEGER_FIELDS and np.asarray(values).dtype.kind in "iu":
+            width = INTEGER_FIELDS[name][1]
+            result[name] = np.char.zfill(np.asarray(values).astype(str), width)
+        else:
+            result[name] = values
+    return result
+
+
+def code(categories, value):
+    """Code of one value
+
+    :param categories: categories of a field
+    :param value: str
+    :return: int
+    """
+    try:
+        return categories.index(value)
+    except ValueError:
+        raise KeyError(f"{value} is not a category.") from None
+
+
+def _strings(values):
+    """Array of str without surrounding spaces, bytes are decoded"""
+    values = np.asarray(values)
+    if values.dtype.kind == "S":
+        values = np.char.decode(values, "ascii")
+    return np.char.strip(values.astype(str))
@@ -0,0 +1,415 @@
+"""Command line interface for pyigra2.
+
+Usage::
+
+    pyigra2 convert data/*.txt --output store/ --format store --workers 4
+
+Exit codes:
+
+* 0 - all files converted (or skipped with --resume)
+* 1 - at least one file failed
+* 2 - invalid command line arguments
+* 3 - no input files found
+"""
+
+# STD-lib
+import argparse
+import concurrent.futures
+import glob
+import hashlib
+import json
+import pathlib
+import sys
+import time
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.reader import READERS, detect_format, open_igra2
+from pyigra2.store import Store
+from pyigra2.table import SoundingTable
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_NO_INPUT = 3
+
+# Directory (inside the output directory) with markers of finished input files
+DONE_DIR = ".pyigra2-done"
+
+
+def main(argv=None):
+    """Entry point of the pyigra2 command
+
+    :param argv: command line arguments, default sys.argv[1:]
+    :return: exit code
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        return _convert(args)
+
+    parser.print_help()
+    return EXIT_USAGE
+
+
+def _build_parser():
+    """Create the argument parser"""
+    parser = argparse.ArgumentParser(
+        prog="pyigra2",
+        description="Tools for IGRA2 observation and derived files.",
+        epilog="Exit codes: 0 = ok, 1 = some files failed, 2 = usage error, 3 = no input files.",
+    )
+    sub_parsers = parser.add_subparsers(dest="command")
+
+    convert = sub_parsers.add_parser(
+        "convert",
+        help="convert IGRA2 text files to a binary format",
+        description="Convert IGRA2 text files (observation or derived, detected from the "
+        "header layout) to a binary format.",
+    )
+    convert.add_argument(
+        "inputs", nargs="+", help="files, directories (all *.txt) or glob patterns"
+    )
+    convert.add_argument("-o", "--output", required=True, help="output directory")
+    convert.add_argument(
+        "-f",
+        "--format",
+        choices=("store", "npz"),
+        default="store",
+        help="store = memory mappable pyigra2 store, npz = one .npz file per station. "
+        "Output goes to OUTPUT/observations or OUTPUT/derived",
+    )
+    convert.add_argument(
+        "-w", "--workers", type=int, default=1, help="number of worker processes"
+    )
+    convert.add_argument(
+        "--source",
+        choices=("converted", "raw"),
+        default="converted",
+        help="convert data to SI-units (converted) or keep the text values (raw)",
+    )
+    convert.add_argument(
+        "--start", help="first sounding time to include, e.g. 2000-01-01"
+    )
+    convert.add_argument("--stop", help="sounding time to stop at (exclusive)")
+    convert.add_argument(
+        "--columns", help="comma separated header and parameter names to keep"
+    )
+    convert.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="number of soundings parsed at a time",
+    )
+    convert.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip input files already converted to the output directory",
+    )
+    convert.add_argument(
+        "-q", "--quiet", action="store_true", help="do not report progress"
+    )
+    return parser
+
+
+def _convert(args):
+    """Run the convert command
+
+    :param args: parsed arguments
+    :return: exit code
+    """
+    paths = _expand_inputs(args.inputs)
+    if not paths:
+        _report(args, "No input files found.")
+        return EXIT_NO_INPUT
+
+    output = pathlib.Path(args.output)
+    (output / DONE_DIR).mkdir(parents=True, exist_ok=True)
+
+    columns = None
+    if args.columns:
+        columns = [name.strip() for name in args.columns.split(",") if name.strip()]
+
+    # Files of a station are converted together by one writer, skip stations already converted
+    todo = []
+    for paths_station in _group_inputs(paths):
+        if args.resume and all(_is_done(output, path) for path in paths_station):
+            for path in paths_station:
+                _report(args, f"Skipping {path} (done)")
+        else:
+            todo.append(paths_station)
+
+    options = dict(
+        output=output.as_posix(),
+        fmt=args.format,
+        source=args.source,
+        start=args.start,
+        stop=args.stop,
+        columns=columns,
+        chunk_size=args.chunk_size,
+    )
+
+    num_failed = 0
+    num_soundings = 0
+    num_levels = 0
+    started = time.perf_counter()
+
+    for done, (paths_station, result, error) in enumerate(
+        _run(todo, options, args.workers), start=1
+    ):
+        prefix = f"[{done}/{len(todo)}] {', '.join(paths_station)}"
+        if error is not None:
+            num_failed += len(paths_station)
+            _report(args, f"{prefix}: FAILED {error}")
+            continue
+
+        num_soundings += result["soundings"]
+        num_levels += result["levels"]
+        for path in paths_station:
+            _mark_done(output, path, result)
+        _report(
+            args,
+            f"{prefix}: {result['soundings']} soundings, {result['levels']} levels "
+            f"in {result['seconds']:.2f} s",
+        )
+
+    num_files = sum(len(paths_station) for paths_station in todo)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    _report(
+        args,
+        f"Converted {num_files - num_failed}/{num_files} files, {num_soundings} soundings, "
+        f"{num_levels} levels in {elapsed:.2f} s "
+        f"({num_soundings / elapsed:.0f} soundings/s, {num_levels / elapsed:.0f} levels/s)",
+    )
+
+    return EXIT_FAILED if num_failed else EXIT_OK
+
+
+def _run(groups, options, workers):
+    """Convert groups of paths, in worker processes if workers > 1
+
+    :return: generator of (paths, result, error) in order of completion
+    """
+    if workers <= 1:
+        for paths in groups:
+            try:
+                yield paths, convert_station(paths, **options), None
+            except Exception as error:
+                yield paths, None, error
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(convert_station, paths, **options): paths
+            for paths in groups
+        }
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as error:
+                yield futures[future], None, error
+
+
+def convert_station(
+    paths,
+    output,
+    fmt="store",
+    source="converted",
+    start=None,
+    stop=None,
+    columns=None,
+    chunk_size=1000,
+):
+    """Convert the IGRA2 text files of one station and layout, e.g. data-por and data-y2d
+
+    The station is (over)written from all files. Files are taken in order of their first
+    sounding time, the first file is written and the others are appended (see Store.append),
+    so soundings up to the last time of the previous files are skipped. With the npz format
+    the files are concatenated, sorted in time and soundings with a (date, hour) key seen
+    before are dropped.
+
+    :param paths: paths of files of the same station and layout, see _group_inputs()
+    :param output: output directory, data is written to output/observations or output/derived
+    :param fmt: 'store' or 'npz'
+    :param source: 'converted' or 'raw'
+    :param start: first sounding time to include
+    :param stop: stop time (exclusive)
+    :param columns: header and parameter names to keep, None = all
+    :param chunk_size: number of soundings per chunk
+    :return: dict with number of soundings, levels and elapsed seconds
+    """
+    started = time.perf_counter()
+    readers = [open_igra2(path) for path in paths]
+    kinds = set(type(reader).__name__ for reader in readers)
+    if len(kinds) != 1:
+        raise ValueError(f"Files of different layouts {sorted(kinds)} in one station.")
+
+    def tables(reader):
+        """Filtered tables of a reader, one per chunk"""
+        for chunk in reader.iter_chunks(
+            chunk_size=chunk_size, convert=source == "converted"
+        ):
+            table = SoundingTable.from_reader(chunk, source)
+            table = _filter_table(table, start, stop, columns)
+            if len(table):
+                yield table
+
+    # Observations and derived files of a station go to separate sub directories
+    output = pathlib.Path(output) / kinds.pop().lower()
+    station = _first_header(paths[0])[0]
+
+    if fmt == "store":
+        store = Store(output)
+        store.remove(station)
+        store.write(tables(readers[0]), station, source)
+        for reader in readers[1:]:
+            store.append(tables(reader), station, source)
+        if station not in store.stations():
+            return dict(soundings=0, levels=0, seconds=time.perf_counter() - started)
+        manifest = store.manifest(station)
+        counts = dict(
+            soundings=manifest["num_soundings"], levels=manifest["num_levels"]
+        )
+    elif fmt == "npz":
+        chunks = [table for reader in readers for table in tables(reader)]
+        counts = dict(soundings=0, levels=0)
+        if chunks:
+            table = _unique_sorted(SoundingTable.concatenate(chunks))
+            _write_npz(output, table, station, paths[0])
+            counts = dict(soundings=len(table), levels=int(table.offsets[-1]))
+    else:
+        raise ValueError(f"Unknown output format {fmt}")
+
+    return dict(counts, seconds=time.perf_counter() - started)
+
+
+def _group_inputs(paths):
+    """Group paths by layout and station id, each group sorted by first sounding time
+
+    Files that cannot be sniffed get a group of their own and fail on conversion.
+
+    :param paths: list of paths
+    :return: list of lists of paths
+    """
+    groups = {}
+    for path in paths:
+        try:
+            station, first_time = _first_header(path)
+            key = (detect_format(path), station)
+        except (OSError, ValueError):
+            key, first_time = (None, path), ""
+        groups.setdefault(key, []).append((first_time, path))
+    return [[path for _, path in sorted(group)] for group in groups.values()]
+
+
+def _first_header(path):
+    """Station id and time (YYYYMMDDHH) of the first header line of an IGRA2 file"""
+    index = READERS[detect_format(path)](path)._header_name_index
+    with open(path, "r") as f:
+        line = f.readline()
+
+    def field(name):
+        first, last = index[name]
+        return line[first - 1 : last].strip()
+
+    return field("ID"), "".join(field(name) for name in ("YEAR", "MONTH", "DAY", "HOUR"))
+
+
+def _unique_sorted(table):
+    """Table sorted in time, of soundings with equal keys only the first is kept"""
+    order = np.argsort(table.times, kind="stable")
+    seen = set()
+    keep = []
+    for idx in order.tolist():
+        if table.keys[idx] not in seen:
+            seen.add(table.keys[idx])
+            keep.append(idx)
+    return table.take(np.array(keep, dtype=np.int64))
+
+
+def _filter_table(table, start, stop, columns):
+    """Apply time and column filters"""
+    if start is not None or stop is not None:
+        mask = np.ones(len(table), dtype=bool)
+        if start is not None:
+            mask &= table.times >= np.datetime64(start, "m")
+        if stop is not None:
+            mask &= table.times < np.datetime64(stop, "m")
+        if not mask.all():
+            table = table.take(mask)
+
+    if columns is not None:
+        table = table.select(columns)
+    return table
+
+
+def _write_npz(output, table, station, path):
+    """Write a table to output/STATION.npz
+
+    The station id is taken from the first header of the input, the ID column may not be
+    in the table (see --columns). Without id, the file is named after the input path.
+    """
+    output.mkdir(parents=True, exist_ok=True)
+    station = station or pathlib.Path(path).stem
+
+    arrays = {
+        "keys": np.array(table.keys, dtype=str),
+        "offsets": table.offsets,
+        "times": table.times,
+        "hour_missing": table.hour_missing,
+    }
+    arrays.update({f"header_{name}": values for name, values in table.header.items()})
+    arrays.update(
+        {f"parameters_{name}": values for name, values in table.parameters.items()}
+    )
+    np.savez(output / f"{station}.npz", **arrays)
+
+
+def _expand_inputs(inputs):
+    """Expand files, directories and glob patterns to a sorted list of unique files"""
+    paths = set()
+    for item in inputs:
+        path = pathlib.Path(item)
+        if path.is_dir():
+            paths.update(p for p in path.glob("*.txt") if p.is_file())
+        elif path.is_file():
+            paths.add(path)
+        else:
+            paths.update(
+                pathlib.Path(p) for p in glob.glob(item) if pathlib.Path(p).is_file()
+            )
+    return sorted(path.as_posix() for path in paths)
+
+
+def _done_marker(output, path):
+    """Marker file of a finished input, keyed on the resolved path"""
+    path = pathlib.Path(path).resolve()
+    digest = hashlib.sha1(path.as_posix().encode("utf-8")).hexdigest()[:16]
+    return output / DONE_DIR / f"{path.name}-{digest}.json"
+
+
+def _is_done(output, path):
+    """Input converted and not modified since"""
+    marker = _done_marker(output, path)
+    return (
+        marker.exists() and marker.stat().st_mtime >= pathlib.Path(path).stat().st_mtime
+    )
+
+
+def _mark_done(output, path, result):
+    """Write marker of a finished input"""
+    with open(_done_marker(output, path), "w") as f:
+        json.dump(dict(result, input=pathlib.Path(path).resolve().as_posix()), f)
+
+
+def _report(args, message):
+    """Progress message to stderr"""
+    if not args.quiet:
+        print(message, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+# STD-lib
+import warnings
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.table import STANDARD_PRESSURE_LEVELS, SoundingTable
+
+
+def group_labels(times, group, hour_missing=None):
+    """Group label of every sounding time
+
+    Groups:
+
+    * month - 1-12
+    * season - 0 = DJF, 1 = MAM, 2 = JJA, 3 = SON
+    * hour - 0-23, soundings with a missing hour get label -1 (excluded)
+    * year - yyyy
+
+    :param times: datetime64 sounding times
+    :param group: 'month', 'season', 'hour' or 'year'
+    :param hour_missing: bool array, True where the hour is missing
+    :return: int array with one label per sounding
+    """
+    times = np.asarray(times, dtype="datetime64[m]")
+    month = times.astype("datetime64[M]").astype(np.int64) % 12 + 1
+
+    if group == "month":
+        labels = month
+    elif group == "season":
+        labels = (month % 12) // 3
+    elif group == "year":
+        labels = times.astype("datetime64[Y]").astype(np.int64) + 1970
+    elif group == "hour":
+        labels = (times - times.astype("datetime64[D]")).astype(np.int64) // 60
+        if hour_missing is not None:
+            labels[np.asarray(hour_missing, dtype=bool)] = -1
+    else:
+        raise ValueError(
+            f"The group variable should be 'month', 'season', 'hour' or 'year', got {group}"
+        )
+    return labels
+
+
+class Climatology:
+    """NaN-aware aggregate statistics per group (month, season, hour or year) and level.
+
+    Statistics are accumulated one SoundingTable at a time with update(), so files can be
+    streamed through IGRABase.iter_chunks(). Count, mean and std are merged between chunks with
+    the parallel variance algorithm (Chan et al.) and need memory proportional to
+    groups x levels only. Quantiles need the level values and are only kept when quantiles=True.
+
+    Results are arrays with shape (num_groups, num_levels), rows ordered as in self.labels.
+    """
+
+    def __init__(
+        self,
+        parameters,
+        group="month",
+        levels=STANDARD_PRESSURE_LEVELS,
+        coordinate="PRESS",
+        quantiles=False,
+    ):
+        """Init method
+
+        :param parameters: parameter names to aggregate, e.g. ("TEMP", "GPH")
+        :param group: 'month', 'season', 'hour' or 'year'
+        :param levels: levels to aggregate, default standard pressure levels [Pa]
+        :param coordinate: parameter the levels refer to
+        :param quantiles: keep level values to be able to compute quantiles
+        """
+        # Validate group
+        group_labels(np.array([], dtype="datetime64[m]"), group)
+
+        self.parameters = tuple(parameters)
+        self.group = group
+        self.levels = np.asarray(levels, dtype=float)
+        self.coordinate = coordinate
+        self.keep_values = quantiles
+
+        self.labels = np.array([], dtype=np.int64)
+
+        # Internal accumulators, structure: parameter_name: array(num_groups, num_levels)
+        self._count = {name: self._empty() for name in self.parameters}
+        self._mean = {name: self._empty() for name in self.parameters}
+        self._m2 = {name: self._empty() for name in self.parameters}
+
+        # Structure: parameter_name: [(labels, matrix), ...]
+        self._values = {name: [] for name in self.parameters}
+
+    @classmethod
+    def from_reader(cls, reader, parameters, chunk_size=1000, **kwargs):
+        """Aggregate a whole file by streaming it in chunks
+
+        :param reader: Observations or Derived object (does not need to be read)
+        :param parameters: parameter names to aggregate
+        :param chunk_size: number of soundings per chunk
+        :param kwargs: passed on to Climatology()
+        :return: Climatology
+        """
+        climatology = cls(parameters, **kwargs)
+        for chunk in reader.iter_chunks(chunk_size=chunk_size):
+            climatology.update(SoundingTable.from_reader(chunk))
+        return climatology
+
+    def update(self, table):
+        """Add the soundings in table to the statistics
+
+        :param table: SoundingTable with converted data
+        :return: None
+        """
+        labels = group_labels(table.times, self.group, table.hour_missing)
+        valid = labels >= 0
+        labels = labels[valid]
+        if not len(labels):
+            return
+
+        # Map chunk labels to rows in the accumulators
+        self._add_labels(np.unique(labels))
+        rows = np.searchsorted(self.labels, labels)
+        num_groups = len(self.labels)
+
+        for name in self.parameters:
+            matrix = table.level_matrix(name, self.levels, self.coordinate)[valid]
+            finite = np.isfinite(matrix)
+            zeroed = np.where(finite, matrix, 0.0)
+
+            # Chunk statistics per group with one bincount per statistic
+            flat = (
+                rows[:, None] * len(self.levels) + np.arange(len(self.levels))
+            ).ravel()
+            size = num_groups * len(self.levels)
+            shape = (num_groups, len(self.levels))
+
+            count = np.bincount(flat, finite.ravel(), size).reshape(shape)
+            total = np.bincount(flat, zeroed.ravel(), size).reshape(shape)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean = np.where(count > 0, total / count, 0.0)
+            deviation = np.where(finite, matrix - mean[rows], 0.0)
+            m2 = np.bincount(flat, (deviation**2).ravel(), size).reshape(shape)
+
+            self._merge(name, count, mean, m2)
+
+            if self.keep_values:
+                self._values[name].append((labels, matrix))
+
+    def count(self, name):
+        """Number of valid values per group and level"""
+        return self._count[name].astype(np.int64)
+
+    def mean(self, name):
+        """NaN-aware mean per group and level, np.nan where count is zero"""
+        count = self._count[name]
+        return np.where(count > 0, self._mean[name], np.nan)
+
+    def std(self, name, ddof=1):
+        """NaN-aware standard deviation per group and level
+
+        :param name: parameter name
+        :param ddof: delta degrees of freedom
+        :return: array(num_groups, num_levels), np.nan where count <= ddof
+        """
+        count = self._count[name]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(
+                count > ddof, np.sqrt(self._m2[name] / (count - ddof)), np.nan
+            )
+
+    def quantile(self, name, q):
+        """NaN-aware quantiles per group and level
+
+        :param name: parameter name
+        :param q: quantile or sequence of quantiles in [0, 1]
+        :return: array(num_groups, num_levels) or array(len(q), num_groups, num_levels)
+        """
+        if not self.keep_values:
+            raise ValueError("Quantiles require Climatology(..., quantiles=True).")
+
+        q = np.asarray(q, dtype=float)
+        out = np.full(q.shape + (len(self.labels), len(self.levels)), np.nan)
+        if not self._values[name]:
+            return out
+
+        labels = np.concatenate([chunk[0] for chunk in self._values[name]])
+        matrix = np.concatenate([chunk[1] for chunk in self._values[name]])
+
+        # Sort by group once and reduce every group with a vectorized nanquantile
+        order = np.argsort(labels, kind="stable")
+        labels = labels[order]
+        matrix = matrix[order]
+        bounds = np.searchsorted(labels, self.labels, side="left")
+        bounds = np.append(bounds, len(labels))
+
+        # All-NaN levels give np.nan, silence the RuntimeWarning
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            for row in range(len(self.labels)):
+                group = matrix[bounds[row] : bounds[row + 1]]
+                if len(group):
+                    out[..., row, :] = np.nanquantile(group, q, axis=0)
+        return out
+
+    def anomalies(self, table, name):
+        """Deviation from the group mean for every sounding in table
+
+        :param table: SoundingTable with converted data
+        :param name: parameter name
+        :return: array(num_soundings, num_levels), np.nan where no baseline exists
+        """
+        labels = group_labels(table.times, self.group, table.hour_missing)
+        matrix = table.level_matrix(name, self.levels, self.coordinate)
+
+        rows = np.clip(
+            np.searchsorted(self.labels, labels), 0, max(len(self.labels) - 1, 0)
+        )
+        known = np.zeros(len(labels), dtype=bool)
+        if len(self.labels):
+            known = self.labels[rows] == labels
+
+        baseline = np.full(matrix.shape, np.nan)
+        baseline[known] = self.mean(name)[rows[known]]
+        return matrix - baseline
+
+    def _empty(self):
+        """Empty accumulator"""
+        return np.zeros((0, len(self.levels)))
+
+    def _add_labels(self, labels):
+        """Add new group labels and grow the accumulators
+
+        :param labels: sorted unique labels
+        :return: None
+        """
+        new_labels = np.union1d(self.labels, labels)
+        if len(new_labels) == len(self.labels):
+            return
+
+        rows = np.searchsorted(new_labels, self.labels)
+        for accumulator in (self._count, self._mean, self._m2):
+            for name, old in accumulator.items():
+                grown = np.zeros((len(new_labels), len(self.levels)))
+                grown[rows] = old
+                accumulator[name] = grown
+        self.labels = new_labels
+
+    def _merge(self, name, count, mean, m2):
+        """Merge chunk statistics into the accumulators (parallel variance algorithm)
+
+        :param name: parameter name
+        :param count: chunk counts
+        :param mean: chunk means
+        :param m2: chunk sum of squared deviations
+        :return: None
+        """
+        count_a = self._count[name]
+        mean_a = self._mean[name]
+        total = count_a + count
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean - mean_a
+            new_mean = np.where(total > 0, mean_a + delta * count / total, 0.0)
+            new_m2 = np.where(
+                total > 0, self._m2[name] + m2 + delta**2 * count_a * count / total, 0.0
+            )
+
+        self._count[name] = total
+        self._mean[name] = new_mean
+        self._m2[name] = new_m2
@@ -0,0 +1,95 @@
+# STD-lib
+# 3rd-party
+import numpy as np
+
+# Local
+
+# Numeric fields of the converted data: name: [missing raw values, divisor, offset], converted
+# value = raw / divisor + offset, blank values are missing. Mirrors _convert_header() and
+# _convert_parameters() of Observations and Derived, fields not listed are text (blanks
+# removed) or INTEGER_FIELDS. Raw values are written back as round((value - offset) * divisor),
+# np.nan as the first missing value (blank if there is none).
+MISSING_OBSERVATION = (-9999, -8888)
+MISSING_DERIVED = (-99999,)
+CONVERSIONS = {
+    "observations": {
+        "NUMLEV": [(), 1.0, 0.0],
+        "LAT": [(), 1.0, 0.0],
+        "LON": [(), 1.0, 0.0],
+        "ETIME": [MISSING_OBSERVATION, 1.0, 0.0],
+        "PRESS": [(-9999,), 1.0, 0.0],
+        "GPH": [MISSING_OBSERVATION, 1.0, 0.0],
+        "TEMP": [MISSING_OBSERVATION, 10.0, 273.15],
+        "RH": [MISSING_OBSERVATION, 10.0, 0.0],
+        "DPDP": [MISSING_OBSERVATION, 10.0, 273.15],
+        "WDIR": [MISSING_OBSERVATION, 180.0 / np.pi, 0.0],
+        "WSPD": [MISSING_OBSERVATION, 10.0, 0.0],
+    },
+    "derived": {
+        "NUMLEV": [MISSING_DERIVED, 1.0, 0.0],
+        "PW": [MISSING_DERIVED, 100.0, 0.0],
+        "INVPRESS": [MISSING_DERIVED, 1.0, 0.0],
+        "INVHGT": [MISSING_DERIVED, 1.0, 0.0],
+        "INVTEMPDIF": [MISSING_DERIVED, 10.0, 0.0],
+        "MIXPRESS": [MISSING_DERIVED, 1.0, 0.0],
+        "MIXHGT": [MISSING_DERIVED, 1.0, 0.0],
+        "FRZPRESS": [MISSING_DERIVED, 1.0, 0.0],
+        "FRZHGT": [MISSING_DERIVED, 1.0, 0.0],
+        "LCLPRESS": [MISSING_DERIVED, 1.0, 0.0],
+        "LCLHGT": [MISSING_DERIVED, 1.0, 0.0],
+        "LFCPRESS": [MISSING_DERIVED, 1.0, 0.0],
+        "LFCHGT": [MISSING_DERIVED, 1.0, 0.0],
+        "LNBPRESS": [MISSING_DERIVED, 1.0, 0.0],
+        "LNBHGT": [MISSING_DERIVED, 1.0, 0.0],
+        "LI": [MISSING_DERIVED, 1.0, 273.15],
+        "SI": [MISSING_DERIVED, 1.0, 273.15],
+        "KI": [MISSING_DERIVED, 1.0, 273.15],
+        "TTI": [MISSING_DERIVED, 1.0, 273.15],
+        "CAPE": [MISSING_DERIVED, 1.0, 0.0],
+        "CIN": [MISSING_DERIVED, 1.0, 0.0],
+        "PRESS": [MISSING_DERIVED, 1.0, 0.0],
+        "REPGPH": [MISSING_DERIVED, 1.0, 0.0],
+        "CALCGPH": [MISSING_DERIVED, 1.0, 0.0],
+        "TEMP": [MISSING_DERIVED, 10.0, 0.0],
+        "TEMPGRAD": [MISSING_DERIVED, 10000.0, 0.0],
+        "PTEMP": [MISSING_DERIVED, 10.0, 0.0],
+        "PTEMPGRAD": [MISSING_DERIVED, 10000.0, 0.0],
+        "VTEMP": [MISSING_DERIVED, 10.0, 0.0],
+        "VPTEMP": [MISSING_DERIVED, 10.0, 0.0],
+        "VAPPRESS": [MISSING_DERIVED, 10.0, 0.0],
+        "SATVAP": [MISSING_DERIVED, 10.0, 0.0],
+        "REPRH": [MISSING_DERIVED, 10.0, 0.0],
+        "CALCRH": [MISSING_DERIVED, 10.0, 0.0],
+        "RHGRAD": [MISSING_DERIVED, 10000.0, 0.0],
+        "UWND": [MISSING_DERIVED, 10.0, 0.0],
+        "UWDGRAD": [MISSING_DERIVED, 10000.0, 0.0],
+        "VWND": [MISSING_DERIVED, 10.0, 0.0],
+        "VWNDGRAD": [MISSING_DERIVED, 10000.0, 0.0],
+        "N": [MISSING_DERIVED, 1.0, 0.0],
+    },
+}
+
+# Converted to int, see Observations._convert_parameters()
+INTEGER_FIELDS = ("LVLTYP1", "LVLTYP2")
+
+
+def converted_values(values, name, fmt):
+    """Numeric field values as convert_to_numpy() gives them
+
+    Raw field text (str) is converted with CONVERSIONS: missing values and blanks become
+    np.nan and the unit is converted. Values that are already numbers are returned as float.
+
+    :param values: raw (str) or converted values of one field
+    :param name: field name, a key of CONVERSIONS[fmt]
+    :param fmt: 'observations' or 'derived'
+    :return: float array
+    """
+    values = np.asarray(values)
+    if values.dtype.kind not in "US":
+        return values.astype(float)
+
+    missing, divisor, offset = CONVERSIONS[fmt][name]
+    text = np.char.strip(values.astype(str))
+    numbers = np.where(text == "", "nan", text).astype(float)
+    numbers[np.isin(numbers, missing)] = np.nan
+    return numbers / divisor + offset
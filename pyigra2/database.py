@@ -0,0 +1,258 @@
+# STD-lib
+import sqlite3
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.derived import Derived
+from pyigra2.table import SoundingTable
+
+# Columns of every sounding and level besides the header and parameter columns. Names differ
+# from the IGRA2 names also ignoring case (e.g. ID, HOUR), as SQLite does.
+SOUNDING_COLUMNS = {
+    "sounding_id": "INTEGER PRIMARY KEY",
+    "station": "TEXT NOT NULL",
+    "format": "TEXT NOT NULL",
+    "time": "TEXT NOT NULL",
+    "key_date": "TEXT NOT NULL",
+    "key_hour": "TEXT NOT NULL",
+}
+LEVEL_COLUMNS = {
+    "sounding_id": "INTEGER NOT NULL REFERENCES soundings(sounding_id)",
+    "level": "INTEGER NOT NULL",
+}
+
+INDEXES = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS soundings_key "
+    "ON soundings(station, format, key_date, key_hour)",
+    "CREATE INDEX IF NOT EXISTS soundings_station_time ON soundings(station, time)",
+    "CREATE INDEX IF NOT EXISTS soundings_time ON soundings(time)",
+    "CREATE INDEX IF NOT EXISTS levels_sounding ON levels(sounding_id, level)",
+    'CREATE INDEX IF NOT EXISTS levels_press ON levels("PRESS")',
+)
+
+# SQLite column type of a numpy dtype kind
+SQL_TYPES = {"f": "REAL", "i": "INTEGER", "u": "INTEGER", "b": "INTEGER"}
+
+
+def connect(path):
+    """Open (or create) a sounding database
+
+    Schema:
+
+    * soundings - one row per sounding: sounding_id, station, format ('observations' or
+      'derived'), time ('YYYY-MM-DD HH:MM'), key_date and key_hour (the keys of
+      IGRABase.raw_data) and one column per header field
+    * levels - one row per level: sounding_id, level (0 = first level of the sounding) and one
+      column per parameter
+
+    Observations and derived data share the tables, header and parameter columns are added as
+    they are first inserted. Missing values (np.nan) are stored as NULL.
+
+    :param path: /path/to/database.sqlite, ':memory:' for an in-memory database
+    :return: sqlite3.Connection
+    """
+    connection = sqlite3.connect(str(path))
+    for name, columns in (("soundings", SOUNDING_COLUMNS), ("levels", LEVEL_COLUMNS)):
+        definition = ", ".join(f"{column} {kind}" for column, kind in columns.items())
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {name} ({definition})")
+    connection.commit()
+    return connection
+
+
+def insert(connection, data, source="converted", chunk_size=1000):
+    """Bulk insert soundings into a database opened with connect()
+
+    Rows are built column-wise from SoundingTables and inserted with executemany() in one
+    transaction per table. Soundings already in the database (same station, format, date and
+    hour) are skipped.
+
+    :param connection: sqlite3.Connection from connect()
+    :param data: Observations/Derived object, SoundingTable or iterable of SoundingTables. A
+        reader that has not been read is streamed from file in chunks.
+    :param source: 'raw' or 'converted' data of a reader
+    :param chunk_size: number of soundings per chunk when streaming
+    :return: number of soundings inserted
+    """
+    fmt = "derived" if isinstance(data, Derived) else None
+    num_inserted = 0
+    for table in _tables(data, source, chunk_size):
+        if len(table):
+            num_inserted += _insert_table(connection, table, fmt or _format(table))
+
+    with connection:
+        for statement in INDEXES:
+            connection.execute(statement)
+    return num_inserted
+
+
+def query(connection, sql, parameters=()):
+    """Run a query and return the result column-wise
+
+    :param connection: sqlite3.Connection from connect()
+    :param sql: SELECT statement
+    :param parameters: query parameters
+    :return: dict column name: np.array, NULL values are None (or np.nan in float columns).
+        The type of a column of only NULL values is taken from the declared type of the
+        column: object array of None for TEXT columns, float array of np.nan otherwise.
+    """
+    cursor = connection.execute(sql, parameters)
+    names = [description[0] for description in cursor.description]
+    rows = cursor.fetchall()
+
+    columns = {}
+    for name, values in zip(names, zip(*rows) if rows else [()] * len(names)):
+        numbers = [value for value in values if value is not None]
+        if not numbers and values:
+            if _declared_type(connection, name) == "TEXT":
+                values = np.full(len(values), None, dtype=object)
+            else:
+                values = [np.nan] * len(values)
+        elif all(isinstance(value, (int, float)) for value in numbers) and len(
+            numbers
+        ) < len(values):
+            values = [np.nan if value is None else value for value in values]
+        columns[name] = np.array(values)
+    return columns
+
+
+def _insert_table(connection, table, fmt):
+    """Insert the soundings of one table
+
+    :return: number of soundings inserted
+    """
+    stations = np.char.strip(np.asarray(table.header["ID"]).astype(str))
+    dates, hours = (np.array(values, dtype=str) for values in zip(*table.keys))
+
+    with connection:
+        _add_columns(connection, "soundings", table.header)
+        _add_columns(connection, "levels", table.parameters)
+
+        # Skip soundings already in the database
+        stored = set()
+        for station in np.unique(stations).tolist():
+            stored.update(
+                (station, date, hour)
+                for date, hour in connection.execute(
+                    "SELECT key_date, key_hour FROM soundings "
+                    "WHERE station = ? AND format = ?",
+                    (station, fmt),
+                )
+            )
+        if stored:
+            keep = np.array(
+                [
+                    key not in stored
+                    for key in zip(stations.tolist(), dates.tolist(), hours.tolist())
+                ],
+                dtype=bool,
+            )
+            if not keep.any():
+                return 0
+            table = table.take(keep)
+            stations, dates, hours = stations[keep], dates[keep], hours[keep]
+
+        first_id = connection.execute(
+            "SELECT COALESCE(MAX(sounding_id), 0) + 1 FROM soundings"
+        ).fetchone()[0]
+        ids = np.arange(first_id, first_id + len(table))
+        times = np.datetime_as_string(table.times, unit="m")
+        times = np.char.replace(times, "T", " ")
+
+        header_names = list(table.header)
+        columns = list(SOUNDING_COLUMNS) + header_names
+        rows = zip(
+            ids.tolist(),
+            stations.tolist(),
+            [fmt] * len(table),
+            times.tolist(),
+            dates.tolist(),
+            hours.tolist(),
+            *[_column(table.header[name]) for name in header_names],
+        )
+        connection.executemany(_insert_statement("soundings", columns), rows)
+
+        # Level number within its sounding
+        sounding = table.sounding_index()
+        level = np.arange(len(sounding)) - table.offsets[sounding]
+
+        parameter_names = list(table.parameters)
+        columns = list(LEVEL_COLUMNS) + parameter_names
+        rows = zip(
+            ids[sounding].tolist(),
+            level.tolist(),
+            *[_column(table.parameters[name]) for name in parameter_names],
+        )
+        connection.executemany(_insert_statement("levels", columns), rows)
+    return len(table)
+
+
+def _declared_type(connection, column):
+    """Declared type of a column of the soundings or levels table, None if not found
+
+    Result columns are matched by name, so expressions and aliases have no type.
+    """
+    for table in ("levels", "soundings"):
+        for row in connection.execute(f"PRAGMA table_info({table})"):
+            if row[1].lower() == column.lower():
+                return row[2].split()[0].upper() if row[2] else None
+    return None
+
+
+def _add_columns(connection, name, columns):
+    """Add the columns missing in table name"""
+    existing = {row[1] for row in connection.execute(f"PRAGMA table_info({name})")}
+    for column, values in columns.items():
+        if column not in existing:
+            kind = SQL_TYPES.get(np.asarray(values).dtype.kind, "TEXT")
+            connection.execute(f'ALTER TABLE {name} ADD COLUMN "{column}" {kind}')
+
+
+def _insert_statement(name, columns):
+    """INSERT statement for columns"""
+    names = ", ".join(f'"{column}"' for column in columns)
+    placeholders = ", ".join("?" * len(columns))
+    return f"INSERT INTO {name} ({names}) VALUES ({placeholders})"
+
+
+def _column(values):
+    """Values as a list of python objects, np.nan -> None (NULL)"""
+    values = np.asarray(values)
+    if values.dtype.kind == "S":
+        return np.char.decode(values, "ascii").tolist()
+    if values.dtype.kind == "f":
+        missing = np.isnan(values)
+        if missing.any():
+            values = values.astype(object)
+            values[missing] = None
+    return values.tolist()
+
+
+def _format(table):
+    """'derived' or 'observations' from the header columns of a table"""
+    return "derived" if "CAPE" in table.header else "observations"
+
+
+def _tables(data, source, chunk_size):
+    """SoundingTables from a reader or table
+
+    :return: generator of SoundingTable
+    """
+    if isinstance(data, SoundingTable):
+        yield data.decode_header()
+        return
+
+    # Iterable of SoundingTables
+    if not hasattr(data, "iter_chunks"):
+        for table in data:
+            yield table.decode_header()
+        return
+
+    in_memory = data.converted_data if source == "converted" else data.raw_data
+    if in_memory:
+        yield SoundingTable.from_reader(data, source=source)
+        return
+
+    for chunk in data.iter_chunks(chunk_size=chunk_size, convert=source == "converted"):
+        yield SoundingTable.from_reader(chunk, source=source)
@@ -127,6 +127,9 @@ class Derived(IGRABase):
             "N": ["-", "-"],
         }
 
+        # Fields that are not numbers (checked by validate())
+        self._text_fields = {"HEADREC", "ID"}
+
     def _convert_header(self, header, date, hour):
         """Convert header
 
@@ -0,0 +1,299 @@
+# STD-lib
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.table import SoundingTable
+
+# Gas constant of dry air [J/(kg K)], standard gravity [m/s2] and R/cp of dry air
+RD = 287.05
+G = 9.80665
+KAPPA = 0.2857
+
+# Freezing point [K] and reference pressure of the potential temperature [Pa]
+FREEZING_POINT = 273.15
+REFERENCE_PRESSURE = 100000.0
+
+# WMO lapse rate tropopause: lapse rate [K/km], depth of the layer above [m] and the highest
+# pressure [Pa] where a tropopause is searched
+TROPOPAUSE_LAPSE_RATE = 2.0
+TROPOPAUSE_DEPTH = 2000.0
+TROPOPAUSE_MAX_PRESSURE = 50000.0
+
+
+def diagnostics(data, height=None, source="converted"):
+    """Freezing level, inversion, mixed layer and tropopause of every sounding
+
+    Heights are in meters above the surface, the surface being the level with the highest
+    pressure. Pressure and temperature are interpolated as in the Derived headers (see
+    igra2-derived-format): linearly in ln(pressure) between adjacent levels.
+
+    :param data: SoundingTable or IGRABase child, read and converted, with PRESS and TEMP
+    :param height: height parameter (e.g. CALCGPH), None = CALCGPH if available, else the
+        height is integrated from the surface with the hypsometric equation
+    :param source: 'converted' or 'raw', used for readers only
+    :return: dict name: float array(num_soundings), names as in the Derived header where
+             they exist: FRZPRESS, FRZHGT, INVPRESS, INVHGT, INVTEMPDIF, MIXPRESS, MIXHGT,
+             TROPPRESS, TROPHGT, TROPTEMP. np.nan where not found.
+    """
+    profiles = _Profiles(SoundingTable.from_object(data, source), height)
+    result = {}
+    result["FRZPRESS"], result["FRZHGT"] = profiles.freezing_level()
+    result["INVPRESS"], result["INVHGT"], result["INVTEMPDIF"] = profiles.inversion()
+    result["MIXPRESS"], result["MIXHGT"] = profiles.mixing_height()
+    result["TROPPRESS"], result["TROPHGT"], result["TROPTEMP"] = profiles.tropopause()
+    return result
+
+
+def freezing_level(data, height=None, source="converted"):
+    """Level where the temperature first reaches the freezing point moving up from the surface
+
+    Not found if the surface temperature is below freezing.
+
+    :param data: SoundingTable or IGRABase child, read and converted
+    :param height: height parameter, see diagnostics()
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (pressure [Pa], height [m above surface]) float arrays(num_soundings)
+    """
+    return _Profiles(SoundingTable.from_object(data, source), height).freezing_level()
+
+
+def inversion(data, height=None, source="converted"):
+    """Level of the warmest temperature, when it is above the surface
+
+    :param data: SoundingTable or IGRABase child, read and converted
+    :param height: height parameter, see diagnostics()
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (pressure [Pa], height [m above surface], warmest - surface temperature [K])
+             float arrays(num_soundings)
+    """
+    return _Profiles(SoundingTable.from_object(data, source), height).inversion()
+
+
+def mixing_height(data, height=None, source="converted"):
+    """Top of the mixed layer with the parcel method
+
+    A parcel with the surface potential temperature is lifted dry adiabatically until the
+    potential temperature of the sounding exceeds it. Not found if already the first level above
+    the surface is warmer (in potential temperature) than the surface.
+
+    :param data: SoundingTable or IGRABase child, read and converted
+    :param height: height parameter, see diagnostics()
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (pressure [Pa], height [m above surface]) float arrays(num_soundings)
+    """
+    return _Profiles(SoundingTable.from_object(data, source), height).mixing_height()
+
+
+def tropopause(data, height=None, source="converted"):
+    """First WMO lapse rate tropopause
+
+    The lowest level, at or above 500 hPa, where the lapse rate decreases to 2 K/km or less and
+    the mean lapse rate from it to every level within 2 km above does not exceed 2 K/km.
+
+    :param data: SoundingTable or IGRABase child, read and converted
+    :param height: height parameter, see diagnostics()
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (pressure [Pa], height [m above surface], temperature [K]) float
+             arrays(num_soundings)
+    """
+    return _Profiles(SoundingTable.from_object(data, source), height).tropopause()
+
+
+class _Profiles:
+    """Levels with pressure, temperature and height of all soundings, surface first"""
+
+    def __init__(self, table, height=None):
+        """Init method
+
+        :param table: SoundingTable, converted
+        :param height: height parameter, None = CALCGPH if available, else hypsometric
+        """
+        self.num_soundings = len(table)
+        if height is None and "CALCGPH" in table.parameters:
+            height = "CALCGPH"
+
+        press = np.asarray(table.parameters["PRESS"], dtype=float)
+        temp = np.asarray(table.parameters["TEMP"], dtype=float)
+        sounding = table.sounding_index()
+
+        valid = np.isfinite(press) & (press > 0) & np.isfinite(temp)
+        if height is not None:
+            z = np.asarray(table.parameters[height], dtype=float)
+            valid &= np.isfinite(z)
+
+        # Sorted by sounding and decreasing pressure
+        rows = np.flatnonzero(valid)
+        order = np.lexsort((-press[rows], sounding[rows]))
+        rows = rows[order]
+        self.sounding = sounding[rows]
+        self.press = press[rows]
+        self.temp = temp[rows]
+        self.log_press = np.log(self.press)
+
+        self.counts = np.bincount(self.sounding, minlength=self.num_soundings)
+        self.starts = np.cumsum(self.counts) - self.counts
+        self.has_levels = self.counts > 0
+        self.surface = np.repeat(self.starts, self.counts)
+
+        # Pairs of adjacent levels (i, i + 1) in the same sounding
+        self.pair = np.zeros(len(rows), dtype=bool)
+        self.pair[:-1] = self.sounding[1:] == self.sounding[:-1]
+
+        if height is not None:
+            z = z[rows]
+        else:
+            z = self._hypsometric()
+        self.height = z - z[self.surface]
+
+    def _hypsometric(self):
+        """Height above the surface from pressure and temperature"""
+        dz = np.zeros(len(self.press))
+        upper = np.flatnonzero(self.pair) + 1
+        dz[upper] = (
+            RD
+            / G
+            * 0.5
+            * (self.temp[upper] + self.temp[upper - 1])
+            * (self.log_press[upper - 1] - self.log_press[upper])
+        )
+        total = np.cumsum(dz)
+        return total - total[self.surface]
+
+    def _first(self, condition):
+        """First level of every sounding where condition holds
+
+        :return: int array(num_soundings), -1 where never
+        """
+        first = np.full(self.num_soundings, -1, dtype=np.int64)
+        rows = np.flatnonzero(condition)
+        soundings, index = np.unique(self.sounding[rows], return_index=True)
+        first[soundings] = rows[index]
+        return first
+
+    def _interpolate(self, lower, fraction):
+        """Pressure (linear in ln p) and height between lower and lower + 1"""
+        found = lower >= 0
+        press = np.full(self.num_soundings, np.nan)
+        height = np.full(self.num_soundings, np.nan)
+
+        i = lower[found]
+        f = fraction[found]
+        press[found] = np.exp(
+            self.log_press[i] + f * (self.log_press[i + 1] - self.log_press[i])
+        )
+        height[found] = self.height[i] + f * (self.height[i + 1] - self.height[i])
+        return press, height
+
+    def freezing_level(self):
+        """Freezing level, see freezing_level()"""
+        above = self.temp > FREEZING_POINT
+        crossing = np.zeros(len(self.temp), dtype=bool)
+        crossing[:-1] = self.pair[:-1] & above[:-1] & ~above[1:]
+        lower = self._first(crossing)
+
+        # Surface below freezing: no freezing level
+        surface_temp = np.full(self.num_soundings, np.nan)
+        surface_temp[self.has_levels] = self.temp[self.starts[self.has_levels]]
+        lower[~(surface_temp > FREEZING_POINT)] = -1
+
+        # Surface exactly at freezing
+        at_surface = surface_temp == FREEZING_POINT
+
+        fraction = np.zeros(self.num_soundings)
+        found = lower >= 0
+        i = lower[found]
+        fraction[found] = (self.temp[i] - FREEZING_POINT) / (
+            self.temp[i] - self.temp[i + 1]
+        )
+        press, height = self._interpolate(lower, fraction)
+        press[at_surface] = self.press[self.starts[at_surface]]
+        height[at_surface] = 0.0
+        return press, height
+
+    def inversion(self):
+        """Warmest level above the surface, see inversion()"""
+        press = np.full(self.num_soundings, np.nan)
+        height = np.full(self.num_soundings, np.nan)
+        difference = np.full(self.num_soundings, np.nan)
+        if not len(self.temp):
+            return press, height, difference
+
+        # Warmest temperature of every sounding, the lowest level where there is a tie
+        warmest = np.maximum.reduceat(self.temp, self.starts[self.has_levels])
+        first = self._first(
+            self.temp == np.repeat(warmest, self.counts[self.has_levels])
+        )
+
+        above = self.has_levels & (first > self.starts)
+        i = first[above]
+        press[above] = self.press[i]
+        height[above] = self.height[i]
+        difference[above] = self.temp[i] - self.temp[self.starts[above]]
+        return press, height, difference
+
+    def mixing_height(self):
+        """Top of the mixed layer, see mixing_height()"""
+        theta = self.temp * (REFERENCE_PRESSURE / self.press) ** KAPPA
+        excess = theta - theta[self.surface]
+
+        # First level warmer than the surface parcel, the pair below it crosses
+        crossing = np.zeros(len(theta), dtype=bool)
+        crossing[:-1] = self.pair[:-1] & (excess[1:] > 0)
+        lower = self._first(crossing)
+
+        # No mixed layer when the first level above the surface is already warmer
+        lower[lower == self.starts] = -1
+
+        fraction = np.zeros(self.num_soundings)
+        found = lower >= 0
+        i = lower[found]
+        fraction[found] = -excess[i] / (excess[i + 1] - excess[i])
+        return self._interpolate(lower, fraction)
+
+    def tropopause(self):
+        """First WMO lapse rate tropopause, see tropopause()"""
+        press = np.full(self.num_soundings, np.nan)
+        height = np.full(self.num_soundings, np.nan)
+        temp = np.full(self.num_soundings, np.nan)
+        num_levels = len(self.temp)
+        if not num_levels:
+            return press, height, temp
+
+        # Lapse rate [K/km] of the layer above every level
+        lapse = np.full(num_levels, np.inf)
+        i = np.flatnonzero(self.pair)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lapse[i] = (
+                -1000.0
+                * (self.temp[i + 1] - self.temp[i])
+                / (self.height[i + 1] - self.height[i])
+            )
+        candidate = (lapse <= TROPOPAUSE_LAPSE_RATE) & (
+            self.press <= TROPOPAUSE_MAX_PRESSURE
+        )
+
+        # Last level within the depth above every level, in the same sounding
+        key = self.sounding * 1e6 + self.height
+        end = np.searchsorted(key, key + TROPOPAUSE_DEPTH, side="right")
+
+        # Mean lapse rate to all levels within the depth, one offset at a time
+        index = np.arange(num_levels)
+        for offset in range(1, int((end - index).max())):
+            j = index + offset
+            inside = candidate & (j < end)
+            rows = index[inside]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean = (
+                    -1000.0
+                    * (self.temp[j[inside]] - self.temp[rows])
+                    / (self.height[j[inside]] - self.height[rows])
+                )
+            candidate[rows[~(mean <= TROPOPAUSE_LAPSE_RATE)]] = False
+
+        first = self._first(candidate)
+        found = first >= 0
+        press[found] = self.press[first[found]]
+        height[found] = self.height[first[found]]
+        temp[found] = self.temp[first[found]]
+        return press, height, temp
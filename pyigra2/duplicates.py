@@ -0,0 +1,217 @@
+# STD-lib
+import zlib
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.bulk import parse_file
+
+# Merge policies of merge_duplicates()
+POLICIES = ("first", "last", "most_levels")
+
+# Header fields identifying a release besides the time. Source fields (P_SRC, NP_SRC) are
+# left out on purpose, the same release is often repeated by several sources.
+DEFAULT_HEADER_FIELDS = ("ID",)
+
+# Constants of the splitmix64 finalizer
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_NAN = np.uint64(0x7FF8000000000000)
+
+
+def sounding_hashes(
+    table, parameters=None, header=DEFAULT_HEADER_FIELDS, decimals=None
+):
+    """64-bit fingerprint of every sounding from its header fields and level content
+
+    Every column is hashed with vectorized integer mixing, so the cost is linear in the
+    number of levels. Level hashes depend on the position of the level in its sounding, i.e.
+    the same levels in another order give another fingerprint. Hashes are stable between
+    calls and tables (strings are hashed character by character, not by dictionary codes).
+
+    :param table: SoundingTable, raw or converted
+    :param parameters: parameter names to include, None = all, [] = no level content
+    :param header: header names to include
+    :param decimals: round float columns to this many decimals first (near duplicates)
+    :return: uint64 array(num_soundings)
+    """
+    if parameters is None:
+        parameters = list(table.parameters)
+    table = table.decode_header()
+
+    unknown = (set(parameters) - set(table.parameters)) | (
+        set(header) - set(table.header)
+    )
+    if unknown:
+        raise KeyError(f"Columns {sorted(unknown)} not in table.")
+
+    # Content: position dependent level hashes summed per sounding (wrapping uint64).
+    # No parameters = compare header fields (and times in find_duplicates()) only.
+    hashes = np.zeros(len(table), dtype=np.uint64)
+    if parameters:
+        levels = np.zeros(int(table.offsets[-1]), dtype=np.uint64)
+        for name in sorted(parameters):
+            levels = _combine(
+                levels, _column_hash(name, table.parameters[name], decimals)
+            )
+
+        position = np.arange(len(levels), dtype=np.uint64) - np.repeat(
+            table.offsets[:-1], table.num_levels
+        ).astype(np.uint64)
+        levels = _mix(levels ^ _mix(position + np.uint64(1)))
+
+        summed = np.concatenate([np.zeros(1, dtype=np.uint64), np.cumsum(levels)])
+        hashes = summed[table.offsets[1:]] - summed[table.offsets[:-1]]
+
+    for name in sorted(header):
+        hashes = _combine(hashes, _column_hash(name, table.header[name], decimals))
+    return hashes
+
+
+def find_duplicates(
+    table,
+    parameters=None,
+    header=DEFAULT_HEADER_FIELDS,
+    decimals=None,
+    time_tolerance=0,
+):
+    """Group soundings with equal fingerprints and (nearly) equal times
+
+    Exact duplicates: default arguments. Near duplicates: round the values (decimals), limit
+    the compared parameters (parameters=[] matches on header fields and time only) and/or
+    allow times to differ by up to time_tolerance. Soundings
+    are sorted by (fingerprint, time) once, so no pairs are compared. Times closer than
+    time_tolerance are chained, i.e. a group may span more than time_tolerance.
+
+    Tables of a reader hold one sounding per (date, hour) key, a repeated header in the file
+    has replaced the earlier sounding. Use file_duplicates() to find those.
+
+    :param table: SoundingTable
+    :param parameters: parameter names to compare, None = all
+    :param header: header names to compare
+    :param decimals: round float columns to this many decimals first
+    :param time_tolerance: max time difference, minutes or np.timedelta64
+    :return: int array(num_soundings), index of the first sounding of the group each
+             sounding belongs to (equal to its own index if it is no duplicate)
+    """
+    hashes = sounding_hashes(table, parameters, header, decimals)
+    times = table.times.astype("datetime64[m]").astype(np.int64)
+    tolerance = np.timedelta64(time_tolerance, "m").astype(np.int64)
+
+    order = np.lexsort((times, hashes))
+    hashes = hashes[order]
+    times = times[order]
+
+    # A new group starts where the fingerprint changes or the time jumps
+    new_group = np.ones(len(order), dtype=bool)
+    new_group[1:] = (hashes[1:] != hashes[:-1]) | (np.diff(times) > tolerance)
+    starts = np.flatnonzero(new_group)
+    if not len(starts):
+        return np.zeros(0, dtype=np.int64)
+
+    first = np.minimum.reduceat(order, starts)
+    labels = np.empty(len(order), dtype=np.int64)
+    labels[order] = first[np.cumsum(new_group) - 1]
+    return labels
+
+
+def file_duplicates(path, convert=True, **kwargs):
+    """Find duplicates in a file, also soundings repeated under the same (date, hour) key
+
+    The file is parsed with bulk.parse_file(unique=False), which keeps every sounding.
+
+    :param path: /path/to/file.txt
+    :param convert: convert the values as convert_to_numpy(), else raw field text
+    :param kwargs: passed to find_duplicates()
+    :return: (SoundingTable of all soundings in file order, labels of find_duplicates())
+    """
+    table = parse_file(path, convert, unique=False)
+    return table, find_duplicates(table, **kwargs)
+
+
+def merge_duplicates(table, policy="first", **kwargs):
+    """Keep one sounding of every duplicate group
+
+    Policies:
+
+    * first - the first sounding in table order
+    * last - the last sounding in table order
+    * most_levels - the sounding with most levels (first one on ties)
+
+    :param table: SoundingTable
+    :param policy: 'first', 'last' or 'most_levels'
+    :param kwargs: passed to find_duplicates()
+    :return: SoundingTable, kept soundings in table order
+    """
+    if policy not in POLICIES:
+        raise ValueError(
+            f"The policy variable should equal to 'first', 'last' or 'most_levels', got {policy}"
+        )
+
+    labels = find_duplicates(table, **kwargs)
+    index = np.arange(len(labels))
+
+    if policy == "first":
+        preference = (index,)
+    elif policy == "last":
+        preference = (-index,)
+    else:
+        preference = (index, -table.num_levels)
+
+    # Most preferred sounding first within each group
+    order = np.lexsort(preference + (labels,))
+    sorted_labels = labels[order]
+    first_in_group = np.ones(len(order), dtype=bool)
+    first_in_group[1:] = sorted_labels[1:] != sorted_labels[:-1]
+
+    return table.take(np.sort(order[first_in_group]))
+
+
+def _mix(values):
+    """splitmix64 finalizer, vectorized"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * _MIX1
+    values = values ^ (values >> np.uint64(27))
+    values = values * _MIX2
+    return values ^ (values >> np.uint64(31))
+
+
+def _combine(hashes, values):
+    """Hash of a running hash and new values"""
+    return _mix(hashes ^ _mix(values + np.uint64(0x9E3779B97F4A7C15)))
+
+
+def _column_hash(name, values, decimals):
+    """uint64 hash of every value of a column, salted with the column name"""
+    values = np.asarray(values)
+    salt = np.uint64(zlib.crc32(name.encode()))
+
+    if values.dtype.kind == "f":
+        values = values.astype(np.float64)
+        if decimals is not None:
+            values = np.round(values, decimals)
+        # + 0.0 turns -0.0 into 0.0, all NaNs hash alike
+        bits = (values + 0.0).view(np.uint64).copy()
+        bits[np.isnan(values)] = _NAN
+    elif values.dtype.kind in "iub":
+        bits = values.astype(np.int64).view(np.uint64)
+    elif values.dtype.kind in "US":
+        bits = _string_hash(values)
+    else:
+        raise ValueError(f"Column {name} of dtype {values.dtype} can not be hashed.")
+
+    return _mix(bits ^ salt)
+
+
+def _string_hash(values):
+    """Hash of fixed-width strings, independent of the array itemsize"""
+    width = np.dtype(values.dtype.char + "1").itemsize
+    chars = np.ascontiguousarray(values).view(f"u{width}")
+    chars = chars.reshape(len(values), values.dtype.itemsize // width).astype(np.uint64)
+
+    hashes = np.zeros(len(values), dtype=np.uint64)
+    for column in chars.T:
+        # Padding (0) does not change the hash
+        hashes = np.where(column != 0, _mix(hashes ^ column), hashes)
+    return hashes
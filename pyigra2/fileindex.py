@@ -0,0 +1,180 @@
+# STD-lib
+import io
+import pathlib
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.reader import READERS, detect_format
+from pyigra2.table import SoundingTable
+from pyigra2.timeindex import TimeIndex, sounding_keys, sounding_times
+
+# Header fields kept in the index
+INDEX_FIELDS = ("ID", "YEAR", "MONTH", "DAY", "HOUR", "RELTIME", "NUMLEV")
+
+# Bump when the layout of the cache file changes
+CACHE_VERSION = 1
+
+
+class FileIndex:
+    """Byte offsets, line numbers and times of the soundings of an IGRA2 file
+
+    Built from the header lines only: the file is scanned for lines starting with '#' as bytes
+    and the header fields are sliced for all headers at once. Any range of soundings can then
+    be parsed by seeking to its first header, without reading the rest of the file.
+
+    Structure:
+
+    * offsets = int64 array(num_soundings + 1), byte offset of every header line and the file
+      size, the bytes of sounding i are offsets[i]:offsets[i + 1]
+    * lines = int64 array(num_soundings), line number of every header line
+    * header = {name: str array(num_soundings)}, raw values of INDEX_FIELDS
+    * keys, times, hour_missing as in SoundingTable, in file order
+    """
+
+    def __init__(self, path, fmt, offsets, lines, header):
+        """Init method
+
+        :param path: /path/to/file.txt
+        :param fmt: 'observations' or 'derived'
+        :param offsets: byte offsets of the header lines and the file size
+        :param lines: line numbers of the header lines
+        :param header: dict of raw header values, INDEX_FIELDS
+        """
+        self.path = pathlib.Path(path)
+        self.format = fmt
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.lines = np.asarray(lines, dtype=np.int64)
+        self.header = header
+
+        self.times, self.hour_missing = sounding_times(
+            header["YEAR"],
+            header["MONTH"],
+            header["DAY"],
+            header["HOUR"],
+            header["RELTIME"],
+        )
+        self.keys = sounding_keys(
+            header["YEAR"], header["MONTH"], header["DAY"], header["HOUR"]
+        )
+
+    @classmethod
+    def from_file(cls, path, cache=False):
+        """Index an IGRA2 observation or derived file
+
+        With cache, the index is cached in path + '.idx.npz' and reused as long as the file
+        is not modified.
+
+        :param path: /path/to/file.txt
+        :param cache: read and write the binary cache next to the file
+        :return: FileIndex
+        """
+        path = pathlib.Path(path)
+        fmt = detect_format(path)
+
+        cache_path = path.with_name(path.name + ".idx.npz")
+        if cache and cache_path.exists():
+            if cache_path.stat().st_mtime >= path.stat().st_mtime:
+                with np.load(cache_path) as npz:
+                    if int(npz["version"]) == CACHE_VERSION:
+                        return cls(
+                            path,
+                            fmt,
+                            npz["offsets"],
+                            npz["lines"],
+                            {name: npz[name] for name in INDEX_FIELDS},
+                        )
+
+        index = cls(path, fmt, *scan_headers(path, READERS[fmt](path)))
+
+        if cache:
+            try:
+                np.savez(
+                    cache_path,
+                    version=CACHE_VERSION,
+                    offsets=index.offsets,
+                    lines=index.lines,
+                    **index.header,
+                )
+            except OSError:
+                # Read-only location, the index works without cache
+                pass
+        return index
+
+    def __len__(self):
+        return len(self.lines)
+
+    @property
+    def num_levels(self):
+        """NUMLEV of every sounding, -1 where blank"""
+        numlev = np.char.strip(self.header["NUMLEV"])
+        return np.where(numlev == "", "-1", numlev).astype(np.int64)
+
+    def time_index(self):
+        """Sorted time index over the soundings, positions are file positions"""
+        return TimeIndex(list(range(len(self))), self.times, self.hour_missing)
+
+    def read(self, first=0, last=None, convert=True):
+        """Parse the soundings first:last (file order) into a new reader
+
+        :param first: position of the first sounding
+        :param last: stop position (exclusive), None = to the end of the file
+        :param convert: call convert_to_numpy() on the reader
+        :return: Observations or Derived holding the soundings
+        """
+        last = len(self) if last is None else min(last, len(self))
+        reader = READERS[self.format](self.path)
+        if first >= last:
+            return reader
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[first])
+            data = f.read(self.offsets[last] - self.offsets[first])
+
+        # Same newline handling as open(path, 'r')
+        lines = io.TextIOWrapper(io.BytesIO(data)).readlines()
+        reader._read_lines(lines, first_line=int(self.lines[first]))
+        if convert:
+            reader.convert_to_numpy()
+        return reader
+
+    def table(self, first=0, last=None, source="converted"):
+        """Parse the soundings first:last (file order) into a SoundingTable
+
+        :param first: position of the first sounding
+        :param last: stop position (exclusive), None = to the end of the file
+        :param source: 'converted' or 'raw'
+        :return: SoundingTable
+        """
+        reader = self.read(first, last, convert=source == "converted")
+        return SoundingTable.from_reader(reader, source)
+
+
+def scan_headers(path, reader):
+    """Byte offsets, line numbers and INDEX_FIELDS of all header lines of a file
+
+    :param path: /path/to/file.txt
+    :param reader: Observations or Derived, for the header layout
+    :return: (offsets, lines, header)
+    """
+    data = np.fromfile(path, dtype=np.uint8)
+
+    line_starts = np.concatenate([[0], np.flatnonzero(data == ord("\n")) + 1])
+    line_starts = line_starts[line_starts < len(data)]
+    is_header = data[line_starts] == ord("#")
+    starts = line_starts[is_header]
+    lines = np.flatnonzero(is_header) + 1
+
+    header = {}
+    for name in INDEX_FIELDS:
+        first, last = reader._header_name_index[name]
+        columns = starts[:, None] + np.arange(first - 1, last)
+        field = data.take(columns, mode="clip")
+        header[name] = np.char.decode(
+            np.ascontiguousarray(field).view(f"S{last - first + 1}").ravel(), "ascii"
+        )
+
+    offsets = np.concatenate([starts, [len(data)]])
+    return offsets, lines, header
+
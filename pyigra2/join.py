@@ -0,0 +1,125 @@
+# STD-lib
+import collections
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.table import SoundingTable
+
+# Suffix of derived columns with the same name as an observation column (e.g. TEMP)
+DERIVED_SUFFIX = "_DRVD"
+
+Join = collections.namedtuple("Join", "table unmatched_observations unmatched_derived")
+
+
+def join_soundings(observations, derived, suffix=DERIVED_SUFFIX, source="converted"):
+    """Pair observation and derived soundings and align their levels by pressure
+
+    Soundings are matched on (ID, date, hour) key. The levels of a matched pair are the union
+    of the pressures of both soundings, sorted from the ground up (decreasing pressure), with
+    the observed and derived parameters side by side and np.nan where one of them lacks the
+    level. Levels without pressure are left out. If a sounding reports a pressure twice the
+    last level is used.
+
+    All pairs are aligned at once: the levels of all pairs are stacked and made unique on
+    (pair, pressure).
+
+    :param observations: SoundingTable or Observations, read and converted
+    :param derived: SoundingTable or Derived, read and converted
+    :param suffix: appended to derived column names that are also observation columns
+    :param source: 'converted' or 'raw', used for readers only
+    :return: Join with the merged SoundingTable (keys of the observations) and the keys of
+             the unmatched observation and derived soundings
+    """
+    obs = SoundingTable.from_object(observations, source)
+    der = SoundingTable.from_object(derived, source)
+
+    obs_keys = _join_keys(obs)
+    der_keys = _join_keys(der)
+    _, obs_idx, der_idx = np.intersect1d(
+        obs_keys, der_keys, assume_unique=True, return_indices=True
+    )
+
+    # Pairs in observation order
+    order = np.argsort(obs_idx)
+    obs_idx = obs_idx[order]
+    der_idx = der_idx[order]
+    num_pairs = len(obs_idx)
+
+    obs_pairs = obs.take(obs_idx)
+    der_pairs = der.take(der_idx)
+
+    # Levels with pressure of all pairs: (pair, pressure) of both tables
+    obs_rows, obs_pair, obs_press = _pressure_levels(obs_pairs)
+    der_rows, der_pair, der_press = _pressure_levels(der_pairs)
+    both = np.column_stack(
+        [
+            np.concatenate([obs_pair, der_pair]).astype(float),
+            -np.concatenate([obs_press, der_press]),
+        ]
+    )
+    common, position = np.unique(both, axis=0, return_inverse=True)
+    position = position.ravel()
+    obs_position = position[: len(obs_rows)]
+    der_position = position[len(obs_rows) :]
+
+    num_levels = np.bincount(common[:, 0].astype(np.int64), minlength=num_pairs)
+    offsets = np.concatenate([[0], np.cumsum(num_levels)])
+
+    parameters = {"PRESS": -common[:, 1]}
+    for name, values in obs_pairs.parameters.items():
+        if name != "PRESS":
+            parameters[name] = _scatter(values, obs_rows, obs_position, len(common))
+    for name, values in der_pairs.parameters.items():
+        if name != "PRESS":
+            column = f"{name}{suffix}" if name in obs.parameters else name
+            parameters[column] = _scatter(values, der_rows, der_position, len(common))
+
+    header = dict(obs_pairs.header)
+    for name, values in der_pairs.header.items():
+        header[f"{name}{suffix}" if name in obs.header else name] = values
+
+    table = SoundingTable(
+        obs_pairs.keys,
+        header,
+        parameters,
+        offsets,
+        obs_pairs.times,
+        obs_pairs.hour_missing,
+    )
+
+    obs_unmatched = np.setdiff1d(np.arange(len(obs)), obs_idx)
+    der_unmatched = np.setdiff1d(np.arange(len(der)), der_idx)
+    return Join(
+        table,
+        [obs.keys[idx] for idx in obs_unmatched.tolist()],
+        [der.keys[idx] for idx in der_unmatched.tolist()],
+    )
+
+
+def _join_keys(table):
+    """'ID date hour' of every sounding"""
+    ids = np.char.strip(np.asarray(table.header["ID"]).astype(str))
+    return np.array(
+        [f"{station} {date} {hour}" for station, (date, hour) in zip(ids, table.keys)],
+        dtype=str,
+    )
+
+
+def _pressure_levels(table):
+    """Rows, sounding number and pressure of the levels with a pressure"""
+    press = np.asarray(table.parameters["PRESS"], dtype=float)
+    rows = np.flatnonzero(np.isfinite(press))
+    return rows, table.sounding_index()[rows], press[rows]
+
+
+def _scatter(values, rows, position, size):
+    """Values of rows placed at their position in the common levels"""
+    values = np.asarray(values)
+    if values.dtype.kind in "US":
+        result = np.full(size, "", dtype=values.dtype)
+    else:
+        result = np.full(size, np.nan)
+    result[position] = values[rows]
+    return result
@@ -0,0 +1,128 @@
+# STD-lib
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.conversions import converted_values
+from pyigra2.table import SoundingTable
+from pyigra2.trajectory import positions
+
+# Mean earth radius [m]
+EARTH_RADIUS = 6371000.0
+
+
+def elapsed_seconds(etime):
+    """ETIME (MMMSS, e.g. 12345 = 123 min 45 s) to seconds since launch
+
+    :param etime: converted (float, np.nan = missing) or raw (str) ETIME values
+    :return: float array, np.nan where missing
+    """
+    etime = converted_values(etime, "ETIME", "observations")
+    minutes, seconds = np.divmod(etime, 100)
+    return minutes * 60 + seconds
+
+
+def ascent_rate(data, source="converted"):
+    """Ascent rate [m/s] between consecutive levels with valid GPH and ETIME
+
+    The rate is given at the upper level of every interval. The first valid level of a
+    sounding, levels without GPH or ETIME and intervals without elapsed time are np.nan.
+
+    :param data: SoundingTable or IGRABase child, read (and converted), raw values are
+        converted as convert_to_numpy()
+    :param source: 'converted' or 'raw', used for readers only
+    :return: float array(num_levels)
+    """
+    table = SoundingTable.from_object(data, source)
+    seconds = elapsed_seconds(table.parameters["ETIME"])
+    height = converted_values(table.parameters["GPH"], "GPH", "observations")
+
+    rate = np.full(len(seconds), np.nan)
+    rows, previous = _intervals(table, np.isfinite(seconds) & np.isfinite(height))
+
+    dt = seconds[rows] - seconds[previous]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate[rows] = np.where(dt > 0, (height[rows] - height[previous]) / dt, np.nan)
+    return rate
+
+
+def drift(data, source="converted"):
+    """Horizontal balloon displacement [m] from the launch site
+
+    The wind (WDIR [rad], direction the wind blows from, WSPD [m/s]) is integrated over
+    ETIME with the trapezoidal rule, level by level of all soundings at once. Levels without
+    wind or ETIME are np.nan and skipped in the integration.
+
+    :param data: SoundingTable or IGRABase child, read (and converted), raw values are
+        converted as convert_to_numpy()
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (east, north) float arrays(num_levels)
+    """
+    table = SoundingTable.from_object(data, source)
+    seconds = elapsed_seconds(table.parameters["ETIME"])
+    direction = converted_values(table.parameters["WDIR"], "WDIR", "observations")
+    speed = converted_values(table.parameters["WSPD"], "WSPD", "observations")
+
+    # Wind components, towards east and north
+    u = -speed * np.sin(direction)
+    v = -speed * np.cos(direction)
+
+    valid = np.isfinite(seconds) & np.isfinite(u) & np.isfinite(v)
+    rows, previous = _intervals(table, valid)
+
+    dt = seconds[rows] - seconds[previous]
+    steps_east = np.zeros(len(seconds))
+    steps_north = np.zeros(len(seconds))
+    steps_east[rows] = 0.5 * (u[rows] + u[previous]) * dt
+    steps_north[rows] = 0.5 * (v[rows] + v[previous]) * dt
+
+    # Cumulative sum within each sounding
+    east = _sounding_cumsum(table, steps_east)
+    north = _sounding_cumsum(table, steps_north)
+    east[~valid] = np.nan
+    north[~valid] = np.nan
+    return east, north
+
+
+def drift_positions(data, source="converted"):
+    """Balloon position (lat, lon) [deg] of every level
+
+    The drift is added to the sounding position (header LAT/LON) on a local tangent plane.
+
+    :param data: SoundingTable or IGRABase child, read (and converted), raw values are
+        converted as convert_to_numpy()
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (lat, lon) float arrays(num_levels)
+    """
+    table = SoundingTable.from_object(data, source)
+    east, north = drift(table)
+
+    lat0, lon0 = positions(table)
+    sounding = table.sounding_index()
+    lat0 = lat0[sounding]
+    lon0 = lon0[sounding]
+
+    lat = lat0 + np.degrees(north / EARTH_RADIUS)
+    lon = lon0 + np.degrees(east / (EARTH_RADIUS * np.cos(np.radians(lat0))))
+    lon = (lon + 180) % 360 - 180
+    return lat, lon
+
+
+def _intervals(table, valid):
+    """Rows of valid levels and of the valid level before them in the same sounding
+
+    :param table: SoundingTable
+    :param valid: bool array(num_levels)
+    :return: (rows, previous) int arrays
+    """
+    rows = np.flatnonzero(valid)
+    sounding = table.sounding_index()[rows]
+    same = sounding[1:] == sounding[:-1]
+    return rows[1:][same], rows[:-1][same]
+
+
+def _sounding_cumsum(table, values):
+    """Cumulative sum restarting at every sounding"""
+    total = np.cumsum(values)
+    before = np.concatenate([[0.0], total])[table.offsets[:-1]]
+    return total - np.repeat(before, table.num_levels)
@@ -0,0 +1,127 @@
+# STD-lib
+import collections
+import collections.abc
+
+# 3rd-party
+
+# Local
+
+# Default number of converted soundings kept in memory
+DEFAULT_CACHE_SIZE = 128
+
+CacheInfo = collections.namedtuple("CacheInfo", "hits misses maxsize currsize")
+
+
+class LazyConvertedData(collections.abc.Mapping):
+    """converted_data that converts soundings from raw_data when they are accessed
+
+    Behaves as the dict created by IGRABase.convert_to_numpy():
+    converted_data[date][hour] = {"header": {...}, "parameters": {...}}. Keys are taken from
+    raw_data, a sounding is converted on first access and kept in a least recently used cache
+    of cache_size soundings (None = no limit).
+    """
+
+    def __init__(self, reader, cache_size=DEFAULT_CACHE_SIZE):
+        """Init method
+
+        :param reader: IGRABase child with raw_data
+        :param cache_size: max number of converted soundings to keep, None = all
+        """
+        if cache_size is not None and cache_size < 1:
+            raise ValueError(f"cache_size must be at least 1 or None, got {cache_size}")
+
+        self.reader = reader
+        self.cache_size = cache_size
+
+        # (date, hour): converted sounding, least recently used first
+        self._cache = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+        # Instance used for the conversion, the _convert methods write to its converted_data
+        self._scratch = type(reader)(reader.filename)
+
+    def __getitem__(self, date):
+        if date not in self.reader.raw_data:
+            raise KeyError(date)
+        return LazyHours(self, date)
+
+    def __iter__(self):
+        return iter(self.reader.raw_data)
+
+    def __len__(self):
+        return len(self.reader.raw_data)
+
+    def __contains__(self, date):
+        return date in self.reader.raw_data
+
+    def sounding(self, date, hour):
+        """Converted sounding, from the cache if possible
+
+        :param date: date key
+        :param hour: hour key
+        :return: dict with header and parameters
+        """
+        key = (date, hour)
+        if key in self._cache:
+            self._hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        self._misses += 1
+        head_param = self.reader.raw_data[date][hour]
+
+        self._scratch.converted_data = {date: {hour: {}}}
+        self._scratch._convert_header(head_param["header"], date, hour)
+        self._scratch._convert_parameters(head_param["parameters"], date, hour)
+        converted = self._scratch.converted_data[date][hour]
+        self._scratch.converted_data = {}
+
+        self._cache[key] = converted
+        if self.cache_size is not None and len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return converted
+
+    def cache_info(self):
+        """Cache statistics, as functools.lru_cache
+
+        :return: CacheInfo(hits, misses, maxsize, currsize)
+        """
+        return CacheInfo(self._hits, self._misses, self.cache_size, len(self._cache))
+
+    def cache_clear(self):
+        """Empty the cache and reset the statistics
+
+        :return: None
+        """
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
+
+
+class LazyHours(collections.abc.Mapping):
+    """Hours of one date in LazyConvertedData"""
+
+    def __init__(self, data, date):
+        """Init method
+
+        :param data: LazyConvertedData
+        :param date: date key
+        """
+        self._data = data
+        self._date = date
+        self._hours = data.reader.raw_data[date]
+
+    def __getitem__(self, hour):
+        if hour not in self._hours:
+            raise KeyError(hour)
+        return self._data.sounding(self._date, hour)
+
+    def __iter__(self):
+        return iter(self._hours)
+
+    def __len__(self):
+        return len(self._hours)
+
+    def __contains__(self, hour):
+        return hour in self._hours
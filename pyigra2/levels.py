@@ -0,0 +1,158 @@
+# STD-lib
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.table import SoundingTable
+
+# Coordinates interpolated linearly in the logarithm of the coordinate
+LOG_COORDINATES = ("PRESS",)
+
+
+class LevelIndex:
+    """Rows of the levels of all soundings, sorted by coordinate (e.g. PRESS or GPH)
+
+    Built once per table with two sorts over all levels:
+
+    * by (coordinate, sounding, row) - the row of a level in every sounding is a searchsorted
+      range, used by rows()
+    * by (sounding, coordinate) - the profile of every sounding, used by interpolate()
+
+    Rows of looked up levels are kept, repeated lookups of a level are free.
+    """
+
+    def __init__(self, table, coordinate="PRESS"):
+        """Init method
+
+        :param table: SoundingTable, converted
+        :param coordinate: parameter to locate levels with
+        """
+        self.coordinate = coordinate
+        self.num_soundings = len(table)
+
+        coord = np.asarray(table.parameters[coordinate], dtype=float)
+        sounding = table.sounding_index()
+        rows = np.flatnonzero(np.isfinite(coord))
+        coord = coord[rows]
+        sounding = sounding[rows]
+
+        by_level = np.lexsort((rows, sounding, coord))
+        self._level_coord = coord[by_level]
+        self._level_sounding = sounding[by_level]
+        self._level_rows = rows[by_level]
+
+        by_sounding = np.lexsort((coord, sounding))
+        self.rows_sorted = rows[by_sounding]
+        self.sounding_sorted = sounding[by_sounding]
+        self.coord_sorted = coord[by_sounding]
+
+        self._rows = {}
+
+    def rows(self, level):
+        """Row of level in every sounding, the last one if a sounding reports it twice
+
+        :param level: level in the unit of the coordinate
+        :return: int array(num_soundings), -1 where the sounding lacks the level
+        """
+        level = float(level)
+        if level not in self._rows:
+            first = np.searchsorted(self._level_coord, level, side="left")
+            last = np.searchsorted(self._level_coord, level, side="right")
+            rows = np.full(self.num_soundings, -1, dtype=np.int64)
+            rows[self._level_sounding[first:last]] = self._level_rows[first:last]
+            self._rows[level] = rows
+        return self._rows[level]
+
+    def values(self, values, level):
+        """Values at level in every sounding
+
+        :param values: float array(num_levels), parameter of the table
+        :param level: level in the unit of the coordinate
+        :return: float array(num_soundings), np.nan where missing
+        """
+        rows = self.rows(level)
+        result = np.full(self.num_soundings, np.nan)
+        found = rows >= 0
+        result[found] = np.asarray(values, dtype=float)[rows[found]]
+        return result
+
+    def interpolate(self, values, level):
+        """Values interpolated to level in every sounding
+
+        Only levels where values is valid are used. PRESS is interpolated linearly in
+        ln(pressure), other coordinates linearly.
+
+        :param values: float array(num_levels), parameter of the table
+        :param level: level in the unit of the coordinate
+        :return: float array(num_soundings), np.nan outside the valid part of a sounding
+        """
+        values = np.asarray(values, dtype=float)[self.rows_sorted]
+        valid = np.isfinite(values)
+        values = values[valid]
+        sounding = self.sounding_sorted[valid]
+        coord = self.coord_sorted[valid]
+        target = float(level)
+        if self.coordinate in LOG_COORDINATES:
+            coord = np.log(coord)
+            target = np.log(target)
+
+        result = np.full(self.num_soundings, np.nan)
+        if not len(values):
+            return result
+
+        counts = np.bincount(sounding, minlength=self.num_soundings)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+        # Number of levels at or below the target in each sounding
+        below = np.bincount(
+            sounding, weights=coord <= target, minlength=self.num_soundings
+        ).astype(np.int64)
+
+        lower = np.clip(starts + below - 1, 0, len(values) - 1)
+        upper = np.clip(starts + below, 0, len(values) - 1)
+        exact = (below > 0) & (coord[lower] == target)
+        inside = ((below > 0) & (below < counts)) | exact
+
+        dx = coord[upper] - coord[lower]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(exact | (dx <= 0), 0.0, (target - coord[lower]) / dx)
+        interpolated = values[lower] + weight * (values[upper] - values[lower])
+        result[inside] = interpolated[inside]
+        return result
+
+
+def level_series(
+    data, name, level, coordinate="PRESS", interpolate=False, source="converted"
+):
+    """Time series of one parameter at one level, e.g. TEMP at 50000 Pa
+
+    :param data: SoundingTable or IGRABase child, read and converted
+    :param name: parameter name
+    :param level: level in the unit of the coordinate, e.g. 50000 [Pa] or 5000 [m]
+    :param coordinate: parameter to locate the level with, e.g. PRESS, GPH or CALCGPH
+    :param interpolate: interpolate between the levels around the level, else exact match
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (times, values) sorted in time, values are np.nan where missing
+    """
+    table = SoundingTable.from_object(data, source)
+    return series(table, LevelIndex(table, coordinate), name, level, interpolate)
+
+
+def series(table, index, name, level, interpolate=False):
+    """Time series of one parameter at one level with an existing LevelIndex
+
+    :param table: SoundingTable, converted
+    :param index: LevelIndex of table
+    :param name: parameter name
+    :param level: level in the unit of the index coordinate
+    :param interpolate: interpolate between the levels around the level, else exact match
+    :return: (times, values) sorted in time
+    """
+    values = table.parameters[name]
+    if interpolate:
+        result = index.interpolate(values, level)
+    else:
+        result = index.values(values, level)
+
+    order = np.argsort(table.times, kind="stable")
+    return table.times[order], result[order]
@@ -0,0 +1,90 @@
+# STD-lib
+import json
+import pathlib
+
+# 3rd-party
+
+# Local
+from pyigra2.reader import open_igra2
+from pyigra2.store import Store
+from pyigra2.table import SoundingTable
+
+# File next to the station manifest describing the por file the station was built from
+POR_SIGNATURE = "por.json"
+
+
+def merge_por_y2d(por, y2d, cache, source="converted", chunk_size=1000):
+    """Merge a data-por file and its data-y2d update into one time ordered table
+
+    The por file holds the full period of record and is large, the y2d file holds the data since
+    the start of the current (or previous) year and is updated daily. The por file is converted
+    once into a Store under cache and reused until its size or modification time changes. On
+    every call only the y2d file is parsed:
+
+    * stored soundings at and after the first y2d sounding are removed (Store.truncate), so y2d
+      wins where the two files overlap
+    * the y2d soundings are appended
+
+    The work per call is thus proportional to the size of the y2d file. Soundings of an earlier
+    y2d file that are older than the current one are kept.
+
+    :param por: /path/to/STATION-data-por.txt (or -drvd-por)
+    :param y2d: /path/to/STATION-data-y2d.txt, same station and layout as por
+    :param cache: /path/to/cache directory, a Store
+    :param source: 'raw' or 'converted' data
+    :param chunk_size: number of soundings per chunk when the por file is streamed to the cache
+    :return: memory mapped SoundingTable, strings are bytes (see Store)
+    """
+    por = pathlib.Path(por)
+    if not por.exists():
+        raise FileNotFoundError(f"File {por.as_posix()} not found.")
+
+    store = Store(cache)
+    station = _station_id(por)
+    signature = _signature(por, source)
+
+    signature_path = store.root / station / POR_SIGNATURE
+    if station not in store.stations() or _read_json(signature_path) != signature:
+        store.write(open_igra2(por), station, source, chunk_size)
+        with open(signature_path, "w") as f:
+            json.dump(signature, f, indent=2)
+
+    reader = open_igra2(y2d, read=True, convert=source == "converted")
+    table = SoundingTable.from_reader(reader, source)
+    if len(table):
+        ids = set(str(value).strip() for value in table.header["ID"])
+        if ids != {station}:
+            raise ValueError(
+                f"Station ids {sorted(ids)} in {reader.filename.as_posix()} "
+                f"do not match {station}."
+            )
+        store.truncate(station, table.times.min())
+        store.append(table, station, source)
+    return store.open(station)
+
+
+def _station_id(path):
+    """Station id of the first header line of an IGRA2 file"""
+    reader = open_igra2(path)
+    first, last = reader._header_name_index["ID"]
+    with open(path, "r") as f:
+        return f.readline()[first - 1 : last].strip()
+
+
+def _signature(path, source):
+    """Size and modification time of a file, to detect changes"""
+    stat = path.stat()
+    return {
+        "path": path.resolve().as_posix(),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "source": source,
+    }
+
+
+def _read_json(path):
+    """Content of a json file, None if missing"""
+    if not path.exists():
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
@@ -0,0 +1,171 @@
+# STD-lib
+import pathlib
+import re
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.base import fixed_width_columns
+
+# Variables of the monthly-mean files: [raw unit, converted unit, scale, offset]
+# converted = raw * scale + offset
+VARIABLES = {
+    "ghgt": ["m", "m", 1.0, 0.0],
+    "temp": ["deg C * 10", "K", 0.1, 273.15],
+    "uwnd": ["m/s * 10", "m/s", 0.1, 0.0],
+    "vwnd": ["m/s * 10", "m/s", 0.1, 0.0],
+    "vapr": ["mb * 1000", "Pa", 0.1, 0.0],
+}
+
+# Special values of VALUE
+MISSING_VALUES = (-9999, -8888)
+
+# File names as in monthly-por and monthly-upd, e.g. temp_00z-mly.txt
+FILENAME_PATTERN = re.compile(r"^(?P<variable>[a-z]+)_(?P<hour>\d\d)z")
+
+
+class MonthlyMeans:
+    """MonthlyMeans is a class for reading IGRA2 monthly-mean files (monthly-por/monthly-upd)
+
+    A monthly-mean file holds one variable at one nominal hour for all stations, one line per
+    station, month and pressure level. The fixed-width layout used is (columns, 1-based):
+
+    * ID 1-11, YEAR 13-16, MONTH 18-19, HOUR 21-22 - the key of a line
+    * PRESS 24-29 [Pa], VALUE 31-36 (unit of the variable), NUMOBS 38-39 - the mean
+
+    read() slices all lines at once into raw_data = {name: bytes array(num_lines)}.
+    convert_to_numpy() places the means in dense arrays with an index per dimension:
+
+    * stations - sorted station ids, index with index()
+    * months - datetime64[M], every month from the first to the last in the file
+    * levels - pressure levels [Pa], sorted from the ground up
+    * values - float array(stations, months, levels), np.nan where missing
+    * counts - int array(stations, months, levels), NUMOBS, 0 where missing
+
+    The file holds no soundings, so unlike Observations and Derived this is not an IGRABase
+    child: there is no converted_data, time_index(), render() or iter_chunks().
+    """
+
+    def __init__(self, filename, variable=None):
+        """Init method
+
+        :param filename: /path/to/extracted file, e.g. temp_00z-mly.txt
+        :type filename: str
+        :param variable: key of VARIABLES, None = from the file name
+        """
+        self.filename = pathlib.Path(filename)
+        self.raw_data = {}
+
+        if variable is None:
+            match = FILENAME_PATTERN.match(self.filename.name)
+            variable = match.group("variable") if match else None
+        if variable not in VARIABLES:
+            raise ValueError(
+                f"Unknown monthly mean variable {variable}, expected one of "
+                f"{sorted(VARIABLES)}."
+            )
+        self.variable = variable
+
+        # Key of every line
+        self._header_name_index = {
+            "ID": [1, 11],
+            "YEAR": [13, 16],
+            "MONTH": [18, 19],
+            "HOUR": [21, 22],
+        }
+
+        # Monthly mean of every line
+        self._parameters_name_index = {
+            "PRESS": [24, 29],
+            "VALUE": [31, 36],
+            "NUMOBS": [38, 39],
+        }
+
+        # Set by convert_to_numpy()
+        self.hour = None
+        self.stations = np.empty(0, dtype=str)
+        self.months = np.empty(0, dtype="datetime64[M]")
+        self.levels = np.empty(0)
+        self.values = np.empty((0, 0, 0))
+        self.counts = np.empty((0, 0, 0), dtype=np.int64)
+
+    def read(self):
+        """Reads the file and stores the fixed-width fields in self.raw_data
+
+        The fields are sliced with the name indexes as IGRABase does, see
+        fixed_width_columns().
+
+        :return: None
+        """
+        if not self.filename.exists():
+            raise FileNotFoundError(f"File {self.filename.as_posix()} not found.")
+
+        with open(self.filename, "rb") as f:
+            lines = [line for line in f.read().splitlines() if line.strip()]
+
+        self.raw_data = fixed_width_columns(
+            lines, {**self._header_name_index, **self._parameters_name_index}
+        )
+
+    def convert_to_numpy(self):
+        """Convert raw_data to the (station, month, level) arrays, see the class docstring
+
+        :return: None
+        """
+        raw = self.raw_data
+        if not raw or not len(raw["ID"]):
+            return
+
+        hours = np.unique(raw["HOUR"].astype(np.int64))
+        if len(hours) > 1:
+            raise ValueError(
+                f"{self.filename.as_posix()} holds several hours: {hours.tolist()}."
+            )
+        self.hour = f"{hours[0]:02d}"
+
+        ids = np.char.strip(np.char.decode(raw["ID"], "ascii"))
+        self.stations, station = np.unique(ids, return_inverse=True)
+
+        months = (raw["YEAR"].astype(np.int64) - 1970) * 12 + (
+            raw["MONTH"].astype(np.int64) - 1
+        )
+        first = months.min()
+        self.months = np.arange(first, months.max() + 1).astype("datetime64[M]")
+        month = months - first
+
+        # Highest pressure (ground) first
+        press = raw["PRESS"].astype(np.int64)
+        levels, level = np.unique(-press, return_inverse=True)
+        self.levels = -levels.astype(float)
+
+        value = raw["VALUE"].astype(np.int64)
+        valid = ~np.isin(value, MISSING_VALUES)
+        scale, offset = VARIABLES[self.variable][2:]
+
+        shape = (len(self.stations), len(self.months), len(self.levels))
+        self.values = np.full(shape, np.nan)
+        self.counts = np.zeros(shape, dtype=np.int64)
+
+        cell = (station[valid], month[valid], level[valid])
+        self.values[cell] = value[valid] * scale + offset
+        self.counts[cell] = np.char.strip(raw["NUMOBS"][valid]).astype(np.int64)
+
+    def index(self, station):
+        """Position of a station in the first dimension of values and counts
+
+        :param station: station id
+        :return: int
+        """
+        position = int(np.searchsorted(self.stations, station))
+        if position == len(self.stations) or self.stations[position] != station:
+            raise KeyError(f"Station {station} not in {self.filename.as_posix()}.")
+        return position
+
+    def station(self, station):
+        """Monthly means of one station
+
+        :param station: station id
+        :return: float array(months, levels)
+        """
+        return self.values[self.index(station)]
@@ -85,6 +85,18 @@ class Observations(IGRABase):
             "WSPD": ["m/s * 10", "m/s"],
         }
 
+        # Fields that are not numbers, and numbers that may be blank (checked by validate())
+        self._text_fields = {
+            "HEADREC",
+            "ID",
+            "P_SRC",
+            "NP_SRC",
+            "PFLAG",
+            "ZFLAG",
+            "TFLAG",
+        }
+        self._blank_fields = {"NUMLEV", "LAT", "LON"}
+
     def _convert_header(self, header, date, hour):
         """Convert header
 
@@ -306,7 +318,7 @@ class Observations(IGRABase):
                 array[array == -9999] = np.nan
                 array[array == -8888] = np.nan
 
-                # @TODO: Convert to seconds instead of MMMSS
+                # Kept as MMMSS, kinematics.elapsed_seconds() converts to seconds
 
             # PRESS 		is the reported pressure (Pa or mb * 100, e.g.,
             # 		100000 = 1000 hPa or 1000 mb). -9999 = missing.
@@ -0,0 +1,104 @@
+# STD-lib
+import pathlib
+
+# 3rd-party
+
+# Local
+from pyigra2.derived import Derived
+from pyigra2.observations import Observations
+
+# Line lengths of the two layouts (see igra2-data-format and igra2-derived-format).
+# Trailing blanks may have been stripped, so data lines are matched on a range.
+OBSERVATION_HEADER_LENGTH = 71
+DERIVED_HEADER_LENGTH = 157
+OBSERVATION_DATA_LENGTHS = range(40, 53)
+DERIVED_DATA_LENGTHS = range(145, 152)
+
+# Number of lines to look at when sniffing a file
+SNIFF_LINES = 5
+
+READERS = {"observations": Observations, "derived": Derived}
+
+
+def detect_format(path):
+    """Detect whether path is an IGRA2 observation or derived file
+
+    The first SNIFF_LINES lines are sniffed, the first one must be a header line. All header
+    and data lines of a known layout must agree on it, lines of unknown layout (e.g. a
+    truncated first sounding) are ignored:
+
+    * observations: header is 71 characters with NUMLEV in 33-36, data lines are <= 52
+      characters with PRESS in 10-15
+    * derived: header is 157 characters with NUMLEV in 32-36, data lines are 151 characters
+      with PRESS in 1-7
+
+    :param path: /path/to/file.txt
+    :return: 'observations' or 'derived'
+    """
+    path = pathlib.Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"File {path.as_posix()} not found.")
+
+    with open(path, "r") as f:
+        lines = [f.readline().rstrip("\r\n") for _ in range(SNIFF_LINES)]
+
+    if lines[0][:1] != "#":
+        raise ValueError(f"{path.as_posix()} does not start with an IGRA2 header line.")
+
+    # Layout of every line, None if unknown (empty lines are beyond the end of the file)
+    formats = set()
+    for line in lines:
+        if line[:1] == "#":
+            formats.add(_header_format(line))
+        elif line:
+            formats.add(_data_format(line))
+    formats.discard(None)
+
+    if not formats:
+        raise ValueError(f"Unknown IGRA2 layout in {path.as_posix()}.")
+    if len(formats) > 1:
+        raise ValueError(
+            f"Inconsistent IGRA2 layout in {path.as_posix()}: "
+            f"lines look like {' and '.join(sorted(formats))}."
+        )
+    return formats.pop()
+
+
+def open_igra2(path, read=False, convert=False):
+    """Create the right reader (Observations or Derived) for path
+
+    :param path: /path/to/file.txt
+    :param read: call read() on the reader
+    :param convert: call read() and convert_to_numpy() on the reader
+    :return: Observations or Derived
+    """
+    reader = READERS[detect_format(path)](path)
+
+    if read or convert:
+        reader.read()
+    if convert:
+        reader.convert_to_numpy()
+    return reader
+
+
+def _header_format(header):
+    """Layout of a header line, None if unknown"""
+    if len(header) == OBSERVATION_HEADER_LENGTH and _is_number(header[32:36]):
+        return "observations"
+    if len(header) == DERIVED_HEADER_LENGTH and _is_number(header[31:36]):
+        return "derived"
+    return None
+
+
+def _data_format(line):
+    """Layout of a data line, None if unknown"""
+    if len(line) in OBSERVATION_DATA_LENGTHS and _is_number(line[9:15]):
+        return "observations"
+    if len(line) in DERIVED_DATA_LENGTHS and _is_number(line[0:7]):
+        return "derived"
+    return None
+
+
+def _is_number(field):
+    """Fixed-width field holds an integer"""
+    return field.strip().lstrip("-").isdigit()
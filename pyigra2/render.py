@@ -0,0 +1,152 @@
+# STD-lib
+import functools
+
+# 3rd-party
+import numpy as np
+
+# Local
+
+# Column layout of the text format, same as IGRABase.print has always used
+TEXT_WIDTH_ADD = 7
+TEXT_WIDTH_VERTICAL = 20
+
+
+def format_column(values, float_format="%.2f"):
+    """Format a whole column to strings in one vectorized call
+
+    :param values: array like
+    :param float_format: %-format used for float columns
+    :return: str array
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == "f":
+        return np.char.mod(float_format, values)
+    if values.dtype.kind == "S":
+        return np.char.decode(values, "ascii")
+    return values.astype(str)
+
+
+def join_rows(cells):
+    """Join columns of formatted cells to one string per row
+
+    :param cells: list of str arrays with equal length
+    :return: str array, one entry per row
+    """
+    if not cells:
+        return np.array([], dtype=str)
+    return functools.reduce(np.char.add, cells)
+
+
+def text(table, headers, header_units, parameter_units, source, unit_index):
+    """Render soundings in the layout of IGRABase.print
+
+    :param table: SoundingTable with the soundings to render
+    :param headers: header dict of every sounding in table
+    :param header_units: IGRABase._header_units
+    :param parameter_units: IGRABase._parameter_units
+    :param source: 'converted' or 'raw', printed as data type
+    :param unit_index: 0 = raw units, 1 = converted units
+    :return: str
+    """
+    # Parameter rows of all soundings at once
+    widths = {name: len(name) + TEXT_WIDTH_ADD for name in table.parameters}
+    rows = join_rows(
+        [
+            np.char.rjust(format_column(values), widths[name])
+            for name, values in table.parameters.items()
+        ]
+    )
+    width_all = sum(widths.values())
+
+    # Parts shared by all soundings
+    units = "".join(
+        f"{name.rjust(TEXT_WIDTH_VERTICAL)}: [{value[unit_index]}]\n"
+        for name, value in parameter_units.items()
+    )
+    names = "".join(name.rjust(width) for name, width in widths.items())
+
+    out = []
+    for idx, header in enumerate(headers):
+        out.append(
+            f"{150 * '-'}\n"
+            f"Station: {header['ID']}\n"
+            f"Date: {header['YEAR']}-{header['MONTH']}-{header['DAY']}\n"
+            f"Hour: {header['HOUR']}\n"
+            f"Data type: {source}\n\n"
+            f"Header information:\n"
+        )
+        for name, value in header.items():
+            if name == "HEADREC":
+                continue
+            name_unit = f"{name} [{header_units[name][unit_index]}]"
+            out.append(f"{name_unit.rjust(TEXT_WIDTH_VERTICAL)}: {value}\n")
+
+        out.append(f"\nParameters and units:\n{units}\n")
+        out.append(f"{names}\n{(width_all + TEXT_WIDTH_ADD) * '-'}\n")
+
+        body = rows[table.offsets[idx] : table.offsets[idx + 1]]
+        if len(body):
+            out.append("\n".join(body.tolist()))
+            out.append("\n")
+        out.append(f"{(width_all + TEXT_WIDTH_ADD) * '_'}\n")
+
+    return "".join(out)
+
+
+def csv(table, float_format="%.10g", delimiter=","):
+    """Render soundings as CSV, one row per level with DATE and HOUR key columns
+
+    :param table: SoundingTable
+    :param float_format: %-format used for float columns
+    :param delimiter: field delimiter
+    :return: str
+    """
+    names = ["DATE", "HOUR"] + list(table.parameters)
+    columns = _key_columns(table) + [
+        format_column(values, float_format) for values in table.parameters.values()
+    ]
+
+    separator = np.array(delimiter)
+    cells = []
+    for column in columns:
+        if cells:
+            cells.append(separator)
+        cells.append(column)
+    return _lines([delimiter.join(names)], join_rows(cells))
+
+
+def fixed_width(table, float_format="%.2f"):
+    """Render soundings as right aligned fixed-width columns with DATE and HOUR key columns
+
+    :param table: SoundingTable
+    :param float_format: %-format used for float columns
+    :return: str
+    """
+    names = ["DATE", "HOUR"] + list(table.parameters)
+    columns = _key_columns(table) + [
+        format_column(values, float_format) for values in table.parameters.values()
+    ]
+
+    # Width = widest cell or name + one blank
+    widths = [
+        max(len(name), int(np.char.str_len(column).max()) if len(column) else 0) + 1
+        for name, column in zip(names, columns)
+    ]
+    title = "".join(name.rjust(width) for name, width in zip(names, widths))
+    rows = join_rows(
+        [np.char.rjust(column, width) for column, width in zip(columns, widths)]
+    )
+    return _lines([title], rows)
+
+
+def _key_columns(table):
+    """DATE and HOUR of every level"""
+    sounding_index = table.sounding_index()
+    dates = np.array([key[0] for key in table.keys], dtype=str)
+    hours = np.array([key[1] for key in table.keys], dtype=str)
+    return [dates[sounding_index], hours[sounding_index]]
+
+
+def _lines(titles, rows):
+    """Title lines and rows as one newline terminated str"""
+    return "\n".join(titles + rows.tolist()) + "\n"
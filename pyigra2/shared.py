@@ -0,0 +1,196 @@
+# STD-lib
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    raise ImportError(
+        "pyigra2.shared needs multiprocessing.shared_memory, which is new in Python 3.8."
+    )
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.table import SoundingTable
+
+# Start of every column in the block is aligned to this many bytes
+ALIGNMENT = 64
+
+
+class SharedTable:
+    """SoundingTable whose columns live in one multiprocessing.shared_memory block
+
+    Layout of the block: the columns of the table (keys, times, hour_missing, offsets,
+    header and parameters) one after the other, each aligned to ALIGNMENT bytes. The
+    descriptor is a small dict (block name, dtypes, byte offsets and lengths of the
+    columns) that can be pickled or json dumped to other processes, which attach to the
+    block without copying the data.
+
+    The process owning the block must unlink() it when no longer needed, all others just
+    close() it. Used as a context manager the table is closed (owner: unlinked) on exit.
+    """
+
+    def __init__(self, shm, descriptor, owner):
+        """Init method
+
+        :param shm: SharedMemory
+        :param descriptor: dict describing the columns in shm
+        :param owner: True if this process is responsible for unlinking the block
+        """
+        self.shm = shm
+        self.descriptor = descriptor
+        self.owner = owner
+        self.table = _table_from_buffer(shm.buf, descriptor)
+
+    @property
+    def name(self):
+        """Name of the shared memory block"""
+        return self.descriptor["name"]
+
+    def close(self):
+        """Release the table and close this process' view of the block
+
+        Arrays taken from the table must be deleted first (BufferError otherwise).
+
+        :return: None
+        """
+        # Views into shm.buf must be dropped before the buffer can be released
+        self.table = None
+        self.shm.close()
+
+    def unlink(self):
+        """Close and destroy the block (owner only)
+
+        :return: None
+        """
+        self.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        if self.owner:
+            self.unlink()
+        else:
+            self.close()
+
+
+def share(data, source="converted"):
+    """Copy a table (or the data of an Observations/Derived object) to shared memory
+
+    :param data: SoundingTable or IGRABase child, read (and converted)
+    :param source: 'converted' or 'raw', used for readers only
+    :return: SharedTable owned by this process
+    """
+    if not isinstance(data, SoundingTable):
+        data = SoundingTable.from_reader(data, source)
+
+    columns = _columns(data)
+
+    # Byte layout of the block
+    layout = []
+    size = 0
+    for (group, name), values in columns.items():
+        if values.dtype.kind == "O":
+            raise ValueError(f"Column {name} has dtype object and can not be shared.")
+        size = -(-size // ALIGNMENT) * ALIGNMENT
+        layout.append([group, name, values.dtype.str, size, len(values)])
+        size += values.nbytes
+
+    # Zero sized blocks are not allowed
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for (group, name, dtype, offset, count), values in zip(layout, columns.values()):
+        np.ndarray(count, dtype=dtype, buffer=shm.buf, offset=offset)[:] = values
+
+    descriptor = {
+        "name": shm.name,
+        "size": size,
+        "columns": layout,
+        "categories": {name: list(values) for name, values in data.categories.items()},
+    }
+    return SharedTable(shm, descriptor, owner=True)
+
+
+def attach(descriptor, owner=False):
+    """Attach to a table shared by share()
+
+    :param descriptor: SharedTable.descriptor of the shared table
+    :param owner: take over the responsibility of unlinking the block
+    :return: SharedTable
+    """
+    shm = shared_memory.SharedMemory(name=descriptor["name"])
+    if not owner:
+        # Attaching registers the block in the resource tracker, which would destroy it
+        # when this process exits
+        _untrack(shm)
+    return SharedTable(shm, descriptor, owner)
+
+
+def read_shared(path, source="converted"):
+    """Read a file into shared memory, made to run in worker processes
+
+    The block outlives the worker, the caller takes it over with
+    attach(descriptor, owner=True) and unlinks it when done::
+
+        with ProcessPoolExecutor() as executor:
+            for descriptor in executor.map(read_shared, paths):
+                with attach(descriptor, owner=True) as shared:
+                    process(shared.table)
+
+    :param path: /path/to/file.txt
+    :param source: 'converted' or 'raw'
+    :return: descriptor of the shared table
+    """
+    # Local import, reader imports all readers
+    from pyigra2.reader import open_igra2
+
+    reader = open_igra2(path, read=True, convert=source == "converted")
+    shared = share(reader, source)
+    descriptor = shared.descriptor
+
+    # Hand the block over to the caller
+    _untrack(shared.shm)
+    shared.close()
+    return descriptor
+
+
+def _columns(table):
+    """All arrays of a table keyed by (group, name)"""
+    columns = {
+        ("keys", "DATE"): np.array([key[0] for key in table.keys], dtype=str),
+        ("keys", "HOUR"): np.array([key[1] for key in table.keys], dtype=str),
+        ("table", "times"): table.times,
+        ("table", "hour_missing"): table.hour_missing,
+        ("table", "offsets"): table.offsets,
+    }
+    columns.update({("header", name): v for name, v in table.header.items()})
+    columns.update({("parameters", name): v for name, v in table.parameters.items()})
+    return {key: np.ascontiguousarray(values) for key, values in columns.items()}
+
+
+def _table_from_buffer(buffer, descriptor):
+    """SoundingTable of views into buffer"""
+    columns = {"keys": {}, "table": {}, "header": {}, "parameters": {}}
+    for group, name, dtype, offset, count in descriptor["columns"]:
+        columns[group][name] = np.ndarray(
+            count, dtype=dtype, buffer=buffer, offset=offset
+        )
+
+    keys = list(zip(columns["keys"]["DATE"].tolist(), columns["keys"]["HOUR"].tolist()))
+    return SoundingTable(
+        keys,
+        columns["header"],
+        columns["parameters"],
+        columns["table"]["offsets"],
+        columns["table"]["times"],
+        columns["table"]["hour_missing"],
+        {
+            name: tuple(values)
+            for name, values in descriptor.get("categories", {}).items()
+        },
+    )
+
+
+def _untrack(shm):
+    """Remove a block from the resource tracker of this process"""
+    resource_tracker.unregister(shm._name, "shared_memory")
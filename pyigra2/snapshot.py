@@ -0,0 +1,116 @@
+# STD-lib
+import collections
+import concurrent.futures
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.fileindex import FileIndex
+from pyigra2.table import STANDARD_PRESSURE_LEVELS
+from pyigra2.trajectory import positions
+
+# Parameters of the snapshot, default for observation files
+OBSERVATION_PARAMETERS = ("GPH", "TEMP", "RH", "DPDP", "WDIR", "WSPD")
+
+Snapshot = collections.namedtuple(
+    "Snapshot", "stations lat lon times levels parameters values"
+)
+
+
+def snapshot(
+    paths,
+    time,
+    tolerance=0,
+    parameters=OBSERVATION_PARAMETERS,
+    levels=STANDARD_PRESSURE_LEVELS,
+    registry=None,
+    max_workers=None,
+    cache_index=False,
+):
+    """The sounding nearest to time of every station file, stacked on pressure levels
+
+    Every file is indexed with a FileIndex (with cache_index cached next to the file, so only
+    the first snapshot scans the headers). Only the selected sounding is read from each file,
+    by seeking to its byte offset. The files are handled in parallel worker processes.
+
+    :param paths: /path/to/files, observation or derived files, one per station
+    :param time: target time, e.g. '2020-05-26T00:00'
+    :param tolerance: max distance to time [minutes] or np.timedelta64, 0 = exact time
+    :param parameters: parameter names to stack
+    :param levels: pressure levels [Pa], default standard pressure levels
+    :param registry: StationRegistry, positions of stations without LAT/LON in the header
+    :param max_workers: number of worker processes, None = number of CPUs, 1 = no workers
+    :param cache_index: read and write the FileIndex cache next to the files
+    :return: Snapshot, stations sorted by id, values is a float
+             array(stations, levels, parameters), np.nan where missing
+    """
+    paths = list(paths)
+    parameters = tuple(parameters)
+    levels = np.asarray(levels, dtype=float)
+    arguments = (
+        np.datetime64(time, "m"),
+        np.timedelta64(tolerance, "m"),
+        parameters,
+        levels,
+        cache_index,
+    )
+
+    if max_workers == 1:
+        results = [_station_sounding(path, *arguments) for path in paths]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+            futures = [
+                executor.submit(_station_sounding, path, *arguments) for path in paths
+            ]
+            results = [future.result() for future in futures]
+
+    results = sorted(
+        (result for result in results if result is not None),
+        key=lambda result: result[0],
+    )
+    num_stations = len(results)
+    values = np.full((num_stations, len(levels), len(parameters)), np.nan)
+    for row, result in enumerate(results):
+        values[row] = result[4]
+
+    stations = np.array([result[0] for result in results], dtype=str)
+    lat = np.array([result[1] for result in results], dtype=float)
+    lon = np.array([result[2] for result in results], dtype=float)
+    times = np.array([result[3] for result in results], dtype="datetime64[m]")
+
+    if registry is not None and num_stations:
+        rows = registry.index(stations)
+        fill = np.isnan(lat) & (rows >= 0)
+        lat[fill] = registry["LAT"][rows[fill]]
+        lon[fill] = registry["LON"][rows[fill]]
+
+    return Snapshot(stations, lat, lon, times, levels, parameters, values)
+
+
+def _station_sounding(path, time, tolerance, parameters, levels, cache_index):
+    """Sounding of one file nearest to time, made to run in worker processes
+
+    :return: (station, lat, lon, time, float array(levels, parameters)), None if the file has
+             no sounding within tolerance
+    """
+    index = FileIndex.from_file(path, cache=cache_index)
+    try:
+        position = index.time_index().nearest(time, tolerance)
+    except KeyError:
+        return None
+
+    table = index.table(position, position + 1)
+    station = str(table.header["ID"][0]).strip()
+
+    lat, lon = np.nan, np.nan
+    if "LAT" in table.header and "LON" in table.header:
+        lat, lon = (float(value[0]) for value in positions(table))
+
+    missing = set(parameters) - set(table.parameters)
+    if missing:
+        raise KeyError(f"Parameters {sorted(missing)} not in {index.path.as_posix()}.")
+    matrix = np.column_stack(
+        [table.level_matrix(name, levels)[0] for name in parameters]
+    )
+    return station, lat, lon, table.times[0], matrix
@@ -0,0 +1,264 @@
+# STD-lib
+import pathlib
+import re
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.base import fixed_width_columns
+
+# Columns of igra2-station-list.txt, [first, last] (1-based, inclusive), see
+# igra2-list-format
+STATION_LIST_INDEX = {
+    "ID": [1, 11],
+    "LAT": [13, 20],
+    "LON": [22, 30],
+    "ELEV": [32, 37],
+    "STATE": [39, 40],
+    "NAME": [42, 71],
+    "FSTYEAR": [73, 76],
+    "LSTYEAR": [78, 81],
+    "NOBS": [83, 88],
+}
+
+# Missing and mobile station values, set to np.nan
+MISSING_VALUES = {
+    "LAT": (-98.8888,),
+    "LON": (-998.8888,),
+    "ELEV": (-999.9, -998.8),
+}
+
+# Column types of the registry
+STRING_COLUMNS = ("ID", "STATE", "NAME")
+FLOAT_COLUMNS = ("LAT", "LON", "ELEV")
+INT_COLUMNS = ("FSTYEAR", "LSTYEAR", "NOBS")
+
+# Network codes (third character of the ID)
+NETWORK_CODES = "IMVWX"
+
+# Lines of igra2-country-list.txt and igra2-us-states.txt
+CODE_LINE = re.compile(r"([A-Z]{2}) (\S.*)$")
+
+# Bump when the layout of the cache file changes
+CACHE_VERSION = 1
+
+
+class StationRegistry:
+    """Stations of igra2-station-list.txt as sorted column arrays
+
+    Columns: ID, LAT [deg], LON [deg], ELEV [m], STATE, NAME, FSTYEAR, LSTYEAR and NOBS.
+    Missing and mobile coordinates and elevations are np.nan. Stations are sorted by ID so
+    look ups are binary searches. Selections (with_prefix(), in_bbox(), active()) return
+    new registries and can be chained.
+    """
+
+    def __init__(self, columns):
+        """Init method
+
+        :param columns: dict of column arrays, see STATION_LIST_INDEX
+        """
+        order = np.argsort(columns["ID"], kind="stable")
+        self.columns = {name: np.asarray(columns[name])[order] for name in columns}
+
+    @classmethod
+    def from_file(cls, path, cache=False):
+        """Parse igra2-station-list.txt
+
+        With cache, the parsed registry is cached in path + '.npz' and reused as long as
+        the list is not modified.
+
+        :param path: /path/to/igra2-station-list.txt
+        :param cache: read and write the binary cache next to the list
+        :return: StationRegistry
+        """
+        path = pathlib.Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"File {path.as_posix()} not found.")
+
+        cache_path = path.with_name(path.name + ".npz")
+        if cache and cache_path.exists():
+            if cache_path.stat().st_mtime >= path.stat().st_mtime:
+                with np.load(cache_path) as npz:
+                    if int(npz["version"]) == CACHE_VERSION:
+                        return cls({name: npz[name] for name in STATION_LIST_INDEX})
+
+        registry = cls(parse_station_list(path))
+
+        if cache:
+            try:
+                np.savez(cache_path, version=CACHE_VERSION, **registry.columns)
+            except OSError:
+                # Read-only location, the registry works without cache
+                pass
+        return registry
+
+    def __len__(self):
+        return len(self.columns["ID"])
+
+    def __contains__(self, station):
+        return bool(self.index([station])[0] >= 0)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def index(self, ids):
+        """Row of every station id, -1 for unknown ids
+
+        :param ids: array like of station ids
+        :return: int array
+        """
+        ids = np.asarray(ids, dtype=str)
+        known = self.columns["ID"]
+        if not len(known):
+            return np.full(ids.shape, -1, dtype=np.int64)
+
+        rows = np.searchsorted(known, ids)
+        rows[rows == len(known)] = 0
+        return np.where(known[rows] == ids, rows, -1).astype(np.int64)
+
+    def station(self, station):
+        """Metadata of one station
+
+        :param station: station id, e.g. 'SWM00002527'
+        :return: dict with one value per column
+        """
+        row = self.index([station])[0]
+        if row < 0:
+            raise KeyError(f"Station {station} not in registry.")
+        return {name: values[row].item() for name, values in self.columns.items()}
+
+    def is_valid_id(self, ids):
+        """Check ID header values, e.g. Observations header['ID'] of all soundings
+
+        :param ids: array like of station ids
+        :return: bool array, True for ids in the registry
+        """
+        return self.index(ids) >= 0
+
+    def expected_soundings(self, ids):
+        """Number of soundings in the period of record (NOBS) according to the station list
+
+        The count is taken from the list and may lag behind the data files.
+
+        :param ids: array like of station ids
+        :return: int array, 0 for unknown ids
+        """
+        rows = self.index(ids)
+        return np.where(rows >= 0, self.columns["NOBS"][rows], 0)
+
+    def take(self, rows):
+        """New registry with the given rows
+
+        :param rows: row numbers or bool mask
+        :return: StationRegistry
+        """
+        return StationRegistry({name: v[rows] for name, v in self.columns.items()})
+
+    def with_prefix(self, prefix):
+        """Stations whose ID starts with prefix, e.g. a FIPS country code ('SW')
+
+        :param prefix: start of the ID
+        :return: StationRegistry
+        """
+        # IDs are sorted, stations with a prefix are one contiguous block
+        ids = self.columns["ID"]
+        start = np.searchsorted(ids, prefix, side="left")
+        stop = start + np.count_nonzero(np.char.startswith(ids[start:], prefix))
+        return self.take(slice(start, stop))
+
+    def in_bbox(self, lat_min, lat_max, lon_min, lon_max):
+        """Stations inside a bounding box, mobile stations are never inside
+
+        :param lat_min: southern edge [deg]
+        :param lat_max: northern edge [deg]
+        :param lon_min: western edge [deg], larger than lon_max for boxes across 180 deg
+        :param lon_max: eastern edge [deg]
+        :return: StationRegistry
+        """
+        lat = self.columns["LAT"]
+        lon = self.columns["LON"]
+        mask = (lat >= lat_min) & (lat <= lat_max)
+        if lon_min <= lon_max:
+            mask &= (lon >= lon_min) & (lon <= lon_max)
+        else:
+            mask &= (lon >= lon_min) | (lon <= lon_max)
+        return self.take(mask)
+
+    def active(self, first_year, last_year=None):
+        """Stations with data in [first_year, last_year]
+
+        :param first_year: first year of the period
+        :param last_year: last year of the period, None = first_year
+        :return: StationRegistry
+        """
+        if last_year is None:
+            last_year = first_year
+        mask = (self.columns["FSTYEAR"] <= last_year) & (
+            self.columns["LSTYEAR"] >= first_year
+        )
+        return self.take(mask)
+
+
+def parse_station_list(path):
+    """Parse igra2-station-list.txt into column arrays
+
+    All lines are sliced as one byte matrix, see fixed_width_columns(). Lines that do
+    not start with a station ID (e.g. the title of igra2-station-list.rst) are skipped.
+
+    :param path: /path/to/igra2-station-list.txt
+    :return: dict of column arrays
+    """
+    with open(path, "rb") as f:
+        lines = [line.rstrip(b"\r\n") for line in f if line.strip()]
+
+    fields = fixed_width_columns(lines, STATION_LIST_INDEX)
+    is_record = valid_id_format(np.char.decode(fields["ID"], "ascii", "replace"))
+
+    columns = {}
+    for name, field in fields.items():
+        field = np.char.strip(np.char.decode(field[is_record], "ascii"))
+
+        if name in FLOAT_COLUMNS:
+            values = field.astype(float)
+            for missing in MISSING_VALUES[name]:
+                values[np.isclose(values, missing)] = np.nan
+            columns[name] = values
+        elif name in INT_COLUMNS:
+            columns[name] = field.astype(np.int64)
+        else:
+            columns[name] = field
+    return columns
+
+
+def read_code_list(path):
+    """Parse igra2-country-list.txt or igra2-us-states.txt
+
+    Lines that do not start with a 2 letter code and a space (e.g. the title of
+    igra2-us-states.rst) are skipped.
+
+    :param path: /path/to/list.txt
+    :return: dict code: name
+    """
+    codes = {}
+    with open(path, "r") as f:
+        for line in f:
+            match = CODE_LINE.match(line)
+            if match:
+                codes[match.group(1)] = match.group(2).strip()
+    return codes
+
+
+def valid_id_format(ids):
+    """IDs made of a 2 letter country code, a network code and 8 characters
+
+    :param ids: array like of station ids
+    :return: bool array
+    """
+    ids = np.asarray(ids, dtype=str)
+    chars = ids.astype("U11").ravel().view("U1").reshape(ids.size, 11)
+    valid = np.char.str_len(ids).ravel() == 11
+    valid &= np.char.isalpha(chars[:, 0]) & np.char.isalpha(chars[:, 1])
+    valid &= np.isin(chars[:, 2], list(NETWORK_CODES))
+    valid &= np.char.isalnum(chars[:, 3:11]).all(axis=1)
+    return valid.reshape(ids.shape)
@@ -0,0 +1,497 @@
+# STD-lib
+import json
+import os
+import pathlib
+import shutil
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.table import SoundingTable
+
+# Version of the on-disk layout, stored in every manifest
+STORE_VERSION = 1
+
+
+class Store:
+    """Local columnar IGRA2 store with one directory per station.
+
+    Store layout:
+
+    * root/STATION_ID/manifest.json - counts, dtypes and origin of the columns
+    * root/STATION_ID/times.bin, hour_missing.bin, offsets.bin - time index and sounding offsets
+    * root/STATION_ID/keys/DATE.bin, HOUR.bin - (date, hour) keys as in IGRABase.raw_data
+    * root/STATION_ID/header/NAME.bin - one value per sounding
+    * root/STATION_ID/parameters/NAME.bin - one value per level, all soundings concatenated
+
+    Columns are flat binary files that are memory mapped on open(), so reading a slice does not
+    copy any level data. Soundings are stored sorted in time. String columns are stored as bytes
+    (numpy dtype 'S') and are returned as such. Tables with an encoded header (see
+    SoundingTable.encode_header()) are decoded before they are written.
+    """
+
+    def __init__(self, root):
+        """Init method
+
+        :param root: /path/to/store directory, created on first write
+        :type root: str
+        """
+        self.root = pathlib.Path(root)
+
+    def stations(self):
+        """Station ids available in the store
+
+        :return: sorted list of station ids
+        """
+        if not self.root.exists():
+            return []
+        return sorted(
+            path.name
+            for path in self.root.iterdir()
+            if (path / "manifest.json").exists()
+        )
+
+    def manifest(self, station):
+        """Manifest of a station
+
+        :param station: station id
+        :return: dict
+        """
+        path = self.root / station / "manifest.json"
+        if not path.exists():
+            raise KeyError(f"Station {station} not in store {self.root.as_posix()}.")
+
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def write(self, data, station=None, source="converted", chunk_size=1000):
+        """Write (or overwrite) a station in the store
+
+        :param data: Observations/Derived object, SoundingTable or iterable of SoundingTables. A
+            reader that has not been read is streamed from file in chunks.
+        :param station: station id, default is the ID header of the first sounding
+        :param source: 'raw' or 'converted' data of a reader
+        :param chunk_size: number of soundings per chunk when streaming
+        :return: number of soundings written
+        """
+        return self._write_tables(
+            self._tables(data, source, chunk_size), station, source, overwrite=True
+        )
+
+    def append(self, data, station=None, source="converted", chunk_size=1000):
+        """Append new soundings, e.g. from an updated text file, to a station
+
+        Soundings up to the last stored time are assumed to be stored already and are skipped,
+        except soundings with exactly the last stored time and a new key.
+
+        :param data: Observations/Derived object, SoundingTable or iterable of SoundingTables
+        :param station: station id, default is the ID header of the first sounding
+        :param source: 'raw' or 'converted' data of a reader
+        :param chunk_size: number of soundings per chunk when streaming
+        :return: number of soundings appended
+        """
+        return self._write_tables(
+            self._tables(data, source, chunk_size), station, source, overwrite=False
+        )
+
+    def remove(self, station):
+        """Remove a station from the store, nothing happens if it is not stored
+
+        :param station: station id
+        :return: None
+        """
+        station_dir = self.root / station
+        if station_dir.exists():
+            shutil.rmtree(station_dir)
+
+    def truncate(self, station, start):
+        """Remove the soundings at and after start from a station
+
+        Only the counts in the manifest are changed and the column files are cut, no data is
+        rewritten.
+
+        :param station: station id
+        :param start: first time to remove
+        :return: number of soundings removed
+        """
+        manifest = self.manifest(station)
+        station_dir = self.root / station
+        num_soundings = manifest["num_soundings"]
+
+        times = self._map(station_dir, "times", manifest["index"], num_soundings)
+        first = int(np.searchsorted(times, np.datetime64(start, "m"), side="left"))
+        if first == num_soundings:
+            return 0
+        offsets = self._map(
+            station_dir, "offsets", manifest["index"], num_soundings + 1
+        )
+        num_levels = int(offsets[first])
+        del times, offsets
+
+        # Counts in manifest first: columns longer than the counts are cut on the next append
+        manifest["num_soundings"] = first
+        manifest["num_levels"] = num_levels
+        self._write_manifest(station_dir, manifest)
+
+        columns = [
+            (station_dir, "times", manifest["index"], first),
+            (station_dir, "hour_missing", manifest["index"], first),
+            (station_dir, "offsets", manifest["index"], first + 1),
+        ]
+        columns += [
+            (station_dir / "keys", name, manifest["keys"], first)
+            for name in manifest["keys"]
+        ]
+        columns += [
+            (station_dir / "header", name, manifest["header"], first)
+            for name in manifest["header"]
+        ]
+        columns += [
+            (station_dir / "parameters", name, manifest["parameters"], num_levels)
+            for name in manifest["parameters"]
+        ]
+        for directory, name, dtypes, count in columns:
+            os.truncate(
+                directory / f"{name}.bin", count * np.dtype(dtypes[name]).itemsize
+            )
+        return num_soundings - first
+
+    def open(self, station, columns=None, start=None, stop=None):
+        """Open a station as a memory mapped SoundingTable
+
+        :param station: station id
+        :param columns: header and/or parameter names to load, None = all
+        :param start: first time to include, None = from first sounding
+        :param stop: stop time (exclusive), None = to last sounding
+        :return: SoundingTable
+        """
+        manifest = self.manifest(station)
+        station_dir = self.root / station
+        num_soundings = manifest["num_soundings"]
+
+        if columns is None:
+            header_names = list(manifest["header"])
+            parameter_names = list(manifest["parameters"])
+        else:
+            unknown = (
+                set(columns) - set(manifest["header"]) - set(manifest["parameters"])
+            )
+            if unknown:
+                raise KeyError(f"Columns {sorted(unknown)} not in store for {station}.")
+            header_names = [name for name in columns if name in manifest["header"]]
+            parameter_names = [
+                name for name in columns if name in manifest["parameters"]
+            ]
+
+        # Time range -> sounding positions -> level positions
+        times = self._map(station_dir, "times", manifest["index"], num_soundings)
+        first, last = 0, num_soundings
+        if start is not None:
+            first = int(np.searchsorted(times, np.datetime64(start, "m"), side="left"))
+        if stop is not None:
+            last = int(np.searchsorted(times, np.datetime64(stop, "m"), side="left"))
+        last = max(first, last)
+
+        offsets = self._map(
+            station_dir, "offsets", manifest["index"], num_soundings + 1
+        )
+        level_first, level_last = int(offsets[first]), int(offsets[last])
+
+        header = {
+            name: self._map(
+                station_dir / "header", name, manifest["header"], num_soundings
+            )[first:last]
+            for name in header_names
+        }
+        parameters = {
+            name: self._map(
+                station_dir / "parameters",
+                name,
+                manifest["parameters"],
+                manifest["num_levels"],
+            )[level_first:level_last]
+            for name in parameter_names
+        }
+
+        dates = self._map(station_dir / "keys", "DATE", manifest["keys"], num_soundings)
+        hours = self._map(station_dir / "keys", "HOUR", manifest["keys"], num_soundings)
+        keys = list(
+            zip(
+                np.char.decode(dates[first:last], "ascii").tolist(),
+                np.char.decode(hours[first:last], "ascii").tolist(),
+            )
+        )
+
+        hour_missing = self._map(
+            station_dir, "hour_missing", manifest["index"], num_soundings
+        )
+        return SoundingTable(
+            keys,
+            header,
+            parameters,
+            offsets[first : last + 1] - level_first,
+            times[first:last],
+            hour_missing[first:last],
+        )
+
+    @staticmethod
+    def _tables(data, source, chunk_size):
+        """SoundingTables from a reader or table
+
+        :return: generator of SoundingTable
+        """
+        if isinstance(data, SoundingTable):
+            yield data.decode_header()
+            return
+
+        # Iterable of SoundingTables
+        if not hasattr(data, "iter_chunks"):
+            for table in data:
+                yield table.decode_header()
+            return
+
+        in_memory = data.converted_data if source == "converted" else data.raw_data
+        if in_memory:
+            yield SoundingTable.from_reader(data, source=source)
+            return
+
+        for chunk in data.iter_chunks(
+            chunk_size=chunk_size, convert=source == "converted"
+        ):
+            yield SoundingTable.from_reader(chunk, source=source)
+
+    def _write_tables(self, tables, station, source, overwrite):
+        """Write or append tables to a station
+
+        :return: number of soundings written
+        """
+        num_written = 0
+        manifest = None
+        station_dir = None
+
+        for table in tables:
+            if not len(table):
+                continue
+
+            if manifest is None:
+                if station is None:
+                    station = self._decode(table.header["ID"][0])
+                station_dir = self.root / station
+
+                if overwrite or not (station_dir / "manifest.json").exists():
+                    if station_dir.exists():
+                        shutil.rmtree(station_dir)
+                    manifest = self._new_manifest(station_dir, table, source)
+                else:
+                    manifest = self.manifest(station)
+
+            num_written += self._append_table(
+                station_dir, manifest, table, strict=overwrite
+            )
+            self._write_manifest(station_dir, manifest)
+
+        return num_written
+
+    def _new_manifest(self, station_dir, table, source):
+        """Create the station directory and an empty manifest
+
+        :return: manifest dict
+        """
+        for sub_dir in ("keys", "header", "parameters"):
+            (station_dir / sub_dir).mkdir(parents=True, exist_ok=True)
+
+        manifest = {
+            "version": STORE_VERSION,
+            "station": station_dir.name,
+            "source": source,
+            "num_soundings": 0,
+            "num_levels": 0,
+            "index": {
+                "times": np.dtype("datetime64[m]").str,
+                "hour_missing": np.dtype(bool).str,
+                "offsets": np.dtype(np.int64).str,
+            },
+            "keys": {"DATE": "|S10", "HOUR": "|S8"},
+            "header": {
+                name: self._disk_dtype(values).str
+                for name, values in table.header.items()
+            },
+            "parameters": {
+                name: self._disk_dtype(values).str
+                for name, values in table.parameters.items()
+            },
+        }
+
+        # Offsets always start with zero
+        np.zeros(1, dtype=np.int64).tofile(str(station_dir / "offsets.bin"))
+        for name in ("times", "hour_missing"):
+            open(station_dir / f"{name}.bin", "wb").close()
+        return manifest
+
+    def _append_table(self, station_dir, manifest, table, strict):
+        """Append the soundings of table that are newer than the stored ones
+
+        :param strict: raise if table contains soundings older than the stored ones
+        :return: number of soundings appended
+        """
+        if set(table.header) != set(manifest["header"]) or set(table.parameters) != set(
+            manifest["parameters"]
+        ):
+            raise ValueError(f"Columns do not match the store for {station_dir.name}.")
+
+        # Sort in time
+        order = np.argsort(table.times, kind="stable")
+        if np.any(np.diff(order) < 0):
+            table = table.take(order)
+
+        num_soundings = manifest["num_soundings"]
+        if num_soundings:
+            times = self._map(station_dir, "times", manifest["index"], num_soundings)
+            last_time = times[-1]
+
+            older = table.times < last_time
+            if strict and older.any():
+                raise ValueError(
+                    f"Soundings for {station_dir.name} are not sorted in time."
+                )
+
+            # Keys already stored at the last time
+            same_time = int(np.searchsorted(times, last_time, side="left"))
+            dates = self._map(
+                station_dir / "keys", "DATE", manifest["keys"], num_soundings
+            )
+            hours = self._map(
+                station_dir / "keys", "HOUR", manifest["keys"], num_soundings
+            )
+            stored = set(
+                zip(
+                    np.char.decode(dates[same_time:], "ascii").tolist(),
+                    np.char.decode(hours[same_time:], "ascii").tolist(),
+                )
+            )
+            new_key = np.array([key not in stored for key in table.keys], dtype=bool)
+            keep = (table.times > last_time) | ((table.times == last_time) & new_key)
+            if not keep.all():
+                table = table.take(keep)
+
+        if not len(table):
+            return 0
+
+        num_levels = manifest["num_levels"]
+        dates, hours = zip(*table.keys)
+
+        # Columns first, counts in manifest last: a failed append leaves the store readable.
+        self._append(
+            station_dir, "times", manifest["index"], table.times, num_soundings
+        )
+        self._append(
+            station_dir,
+            "hour_missing",
+            manifest["index"],
+            table.hour_missing,
+            num_soundings,
+        )
+        self._append(
+            station_dir,
+            "offsets",
+            manifest["index"],
+            table.offsets[1:] + num_levels,
+            num_soundings + 1,
+        )
+        self._append(
+            station_dir / "keys",
+            "DATE",
+            manifest["keys"],
+            np.array(dates),
+            num_soundings,
+        )
+        self._append(
+            station_dir / "keys",
+            "HOUR",
+            manifest["keys"],
+            np.array(hours),
+            num_soundings,
+        )
+        for name, values in table.header.items():
+            self._append(
+                station_dir / "header", name, manifest["header"], values, num_soundings
+            )
+        for name, values in table.parameters.items():
+            self._append(
+                station_dir / "parameters",
+                name,
+                manifest["parameters"],
+                values,
+                num_levels,
+            )
+
+        manifest["num_soundings"] = num_soundings + len(table)
+        manifest["num_levels"] = num_levels + int(table.offsets[-1])
+        return len(table)
+
+    def _append(self, directory, name, dtypes, values, num_stored):
+        """Append values to a column file
+
+        :param directory: directory of the column file
+        :param name: column name
+        :param dtypes: dict of column dtypes from the manifest, updated if strings grow
+        :param values: values to append
+        :param num_stored: number of values already stored according to the manifest
+        :return: None
+        """
+        path = directory / f"{name}.bin"
+        dtype = np.dtype(dtypes[name])
+        values = np.asarray(values)
+        if values.dtype.kind == "U":
+            values = values.astype("S")
+
+        # Strings wider than the stored ones -> rewrite the column with the wider dtype
+        if dtype.kind == "S" and values.dtype.itemsize > dtype.itemsize:
+            stored = np.array(self._map(directory, name, dtypes, num_stored))
+            dtype = values.dtype
+            stored.astype(dtype).tofile(str(path))
+            dtypes[name] = dtype.str
+
+        # Remove data beyond the manifest count from a failed append
+        if path.exists() and path.stat().st_size > num_stored * dtype.itemsize:
+            os.truncate(path, num_stored * dtype.itemsize)
+
+        with open(path, "ab") as f:
+            np.ascontiguousarray(values, dtype=dtype).tofile(f)
+
+    @staticmethod
+    def _map(directory, name, dtypes, count):
+        """Memory map a column file
+
+        :return: read only np.memmap (or empty array)
+        """
+        dtype = np.dtype(dtypes[name])
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(
+            directory / f"{name}.bin", dtype=dtype, mode="r", shape=(count,)
+        )
+
+    @staticmethod
+    def _write_manifest(station_dir, manifest):
+        """Write the manifest atomically"""
+        tmp_path = station_dir / "manifest.json.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, station_dir / "manifest.json")
+
+    @staticmethod
+    def _disk_dtype(values):
+        """On-disk dtype of a column, unicode is stored as bytes"""
+        values = np.asarray(values)
+        if values.dtype.kind == "U":
+            return np.dtype(f"S{max(values.dtype.itemsize // 4, 1)}")
+        return values.dtype
+
+    @staticmethod
+    def _decode(value):
+        """Decode bytes to str"""
+        if isinstance(value, bytes):
+            return value.decode("ascii")
+        return str(value)
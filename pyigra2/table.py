@@ -0,0 +1,373 @@
+# STD-lib
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.categories import code, decode_header, encode_header
+from pyigra2.timeindex import TimeIndex, sounding_times
+
+# Standard pressure levels [Pa] (1000, 925, 850, ..., 1 hPa), see LVLTYP1 in igra2-data-format.
+STANDARD_PRESSURE_LEVELS = np.array(
+    [
+        100000,
+        92500,
+        85000,
+        70000,
+        50000,
+        40000,
+        30000,
+        25000,
+        20000,
+        15000,
+        10000,
+        7000,
+        5000,
+        3000,
+        2000,
+        1000,
+        700,
+        500,
+        300,
+        200,
+        100,
+    ],
+    dtype=float,
+)
+
+
+class SoundingTable:
+    """Columnar representation of soundings.
+
+    Structure:
+
+    * keys = [(date, hour), ...], one per sounding
+    * header = {header1: array(num_soundings), ...}
+    * parameters = {parameter1: array(num_levels), ...}, all soundings concatenated
+    * offsets = array(num_soundings + 1), levels of sounding i are offsets[i]:offsets[i + 1]
+    * times = datetime64[m] array(num_soundings), see timeindex.sounding_times()
+    * categories = {header1: (category0, category1, ...), ...}, categories of the dictionary
+      encoded header fields, see encode_header()
+    """
+
+    def __init__(
+        self,
+        keys,
+        header,
+        parameters,
+        offsets,
+        times=None,
+        hour_missing=None,
+        categories=None,
+    ):
+        """Init method
+
+        :param keys: list of (date, hour) keys
+        :param header: dict of header arrays, one value per sounding
+        :param parameters: dict of parameter arrays, one value per level
+        :param offsets: sounding offsets into the parameter arrays
+        :param times: datetime64 sounding times, created from the header if None
+        :param hour_missing: bool array, True where the sounding time lacks an hour
+        :param categories: dict of categories of the dictionary encoded header fields
+        """
+        self.keys = list(keys)
+        self.header = header
+        self.parameters = parameters
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+        if times is None:
+            times, hour_missing = sounding_times(
+                self.header["YEAR"],
+                self.header["MONTH"],
+                self.header["DAY"],
+                self.header["HOUR"],
+                self.header["RELTIME"],
+            )
+        if hour_missing is None:
+            hour_missing = np.zeros(len(self.keys), dtype=bool)
+
+        self.times = np.asarray(times, dtype="datetime64[m]")
+        self.hour_missing = np.asarray(hour_missing, dtype=bool)
+        self.categories = dict(categories or {})
+
+    @classmethod
+    def from_data(cls, data):
+        """Create a SoundingTable from raw_data or converted_data
+
+        :param data: dict structured as IGRABase.raw_data
+        :return: SoundingTable
+        """
+        keys = []
+        header_lists = {}
+        parameter_lists = {}
+        num_levels = [0]
+
+        for date, hours in data.items():
+            for hour, head_param in hours.items():
+                keys.append((date, hour))
+
+                for name, value in head_param["header"].items():
+                    header_lists.setdefault(name, []).append(value)
+
+                length = 0
+                for name, values in head_param["parameters"].items():
+                    parameter_lists.setdefault(name, []).append(values)
+                    length = len(values)
+                num_levels.append(length)
+
+        # Time fields are needed also for empty tables
+        for name in ("YEAR", "MONTH", "DAY", "HOUR", "RELTIME"):
+            header_lists.setdefault(name, [])
+
+        header = {name: np.asarray(values) for name, values in header_lists.items()}
+        parameters = {
+            name: np.concatenate([np.asarray(value) for value in values])
+            for name, values in parameter_lists.items()
+        }
+        offsets = np.cumsum(num_levels)
+
+        return cls(keys, header, parameters, offsets)
+
+    @classmethod
+    def from_reader(cls, reader, source="converted"):
+        """Create a SoundingTable from an Observations or Derived object
+
+        :param reader: IGRABase child, read (and converted)
+        :param source: 'raw' or 'converted'
+        :return: SoundingTable
+        """
+        if source == "converted":
+            data = reader.converted_data
+        elif source == "raw":
+            data = reader.raw_data
+        else:
+            raise ValueError(
+                f"The source variable should equal to 'converted or 'raw', got {source}' "
+            )
+        return cls.from_data(data)
+
+    @classmethod
+    def from_object(cls, data, source="converted"):
+        """SoundingTable of a SoundingTable or an Observations or Derived object
+
+        Tables with an encoded header (see encode_header()) are decoded.
+
+        :param data: SoundingTable or IGRABase child, read (and converted)
+        :param source: 'raw' or 'converted', used for readers
+        :return: SoundingTable
+        """
+        if isinstance(data, SoundingTable):
+            return data.decode_header()
+        return cls.from_reader(data, source)
+
+    @classmethod
+    def concatenate(cls, tables):
+        """Concatenate tables with the same header and parameter names
+
+        Tables with encoded headers are decoded and the result is encoded again if the
+        categories of the tables differ.
+
+        :param tables: sequence of SoundingTable
+        :return: SoundingTable
+        """
+        tables = [table for table in tables if len(table)]
+        if not tables:
+            raise ValueError("No non-empty tables to concatenate.")
+
+        categories = tables[0].categories
+        if any(table.categories != categories for table in tables[1:]):
+            tables = [table.decode_header() for table in tables]
+            return cls.concatenate(tables).encode_header()
+
+        keys = [key for table in tables for key in table.keys]
+        header = {
+            name: np.concatenate([table.header[name] for table in tables])
+            for name in tables[0].header
+        }
+        parameters = {
+            name: np.concatenate([table.parameters[name] for table in tables])
+            for name in tables[0].parameters
+        }
+        offsets = np.concatenate(
+            [[0]] + [np.diff(table.offsets) for table in tables]
+        ).cumsum()
+        times = np.concatenate([table.times for table in tables])
+        hour_missing = np.concatenate([table.hour_missing for table in tables])
+
+        return cls(keys, header, parameters, offsets, times, hour_missing, categories)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def num_levels(self):
+        """Number of levels per sounding"""
+        return np.diff(self.offsets)
+
+    def sounding_index(self):
+        """Sounding number of every level
+
+        :return: int array(num_levels)
+        """
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.num_levels)
+
+    def sounding(self, idx):
+        """Sounding number idx structured as in IGRABase.converted_data[date][hour]
+
+        :param idx: sounding number
+        :return: dict with header and parameters
+        """
+        start, stop = self.offsets[idx], self.offsets[idx + 1]
+        return {
+            "header": {name: values[idx] for name, values in self.header.items()},
+            "parameters": {
+                name: values[start:stop] for name, values in self.parameters.items()
+            },
+        }
+
+    def take(self, indices):
+        """New table with the soundings in indices (in the given order)
+
+        :param indices: sounding numbers or bool mask
+        :return: SoundingTable
+        """
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        indices = indices.astype(np.int64)
+
+        num_levels = self.num_levels[indices]
+        offsets = np.concatenate([[0], np.cumsum(num_levels)])
+
+        # Level rows of the selected soundings
+        starts = self.offsets[indices]
+        rows = np.repeat(starts - offsets[:-1], num_levels) + np.arange(offsets[-1])
+
+        return SoundingTable(
+            [self.keys[idx] for idx in indices.tolist()],
+            {name: values[indices] for name, values in self.header.items()},
+            {name: values[rows] for name, values in self.parameters.items()},
+            offsets,
+            self.times[indices],
+            self.hour_missing[indices],
+            self.categories,
+        )
+
+    def select(self, columns):
+        """New table with only the given header and parameter columns (no copy)
+
+        :param columns: header and/or parameter names
+        :return: SoundingTable
+        """
+        unknown = set(columns) - set(self.header) - set(self.parameters)
+        if unknown:
+            raise KeyError(f"Columns {sorted(unknown)} not in table.")
+
+        return SoundingTable(
+            self.keys,
+            {name: self.header[name] for name in columns if name in self.header},
+            {
+                name: self.parameters[name]
+                for name in columns
+                if name in self.parameters
+            },
+            self.offsets,
+            self.times,
+            self.hour_missing,
+            {
+                name: values
+                for name, values in self.categories.items()
+                if name in columns
+            },
+        )
+
+    def encode_header(self, categories=None):
+        """New table with a compact header, see categories.encode_header()
+
+        P_SRC and NP_SRC get the codes of categories.P_SRC_CODES and NP_SRC_CODES, ID the
+        codes of its sorted unique values and the time fields are stored as integers. Store,
+        database, writer, join, trajectory and duplicate functions decode the header
+        themselves, shared memory tables keep the categories.
+
+        :param categories: dict name: categories to encode with, default categories.CATEGORIES
+        :return: SoundingTable
+        """
+        header, used = encode_header(self.decode_header().header, categories)
+        return SoundingTable(
+            self.keys,
+            header,
+            self.parameters,
+            self.offsets,
+            self.times,
+            self.hour_missing,
+            used,
+        )
+
+    def decode_header(self):
+        """New table with the header of encode_header() as str arrays
+
+        :return: SoundingTable
+        """
+        if not self.categories:
+            return self
+        return SoundingTable(
+            self.keys,
+            decode_header(self.header, self.categories),
+            self.parameters,
+            self.offsets,
+            self.times,
+            self.hour_missing,
+        )
+
+    def header_mask(self, name, value):
+        """Soundings where a header field equals value, e.g. ('P_SRC', 'ncdc-gts')
+
+        Encoded fields are compared by their integer code.
+
+        :param name: header name
+        :param value: header value, str
+        :return: bool array(num_soundings)
+        """
+        values = self.header[name]
+        if name not in self.categories:
+            return np.char.strip(np.asarray(values).astype(str)) == str(value).strip()
+        try:
+            return values == code(self.categories[name], value)
+        except KeyError:
+            return np.zeros(len(self), dtype=bool)
+
+    def time_index(self):
+        """Sorted time index of the table
+
+        :return: TimeIndex
+        """
+        return TimeIndex(self.keys, self.times, self.hour_missing)
+
+    def level_matrix(self, name, levels=STANDARD_PRESSURE_LEVELS, coordinate="PRESS"):
+        """Values of a parameter at given levels as a (num_soundings, num_levels) matrix
+
+        Levels are matched exactly against the coordinate parameter. Missing levels are np.nan.
+        If a sounding reports a level twice the last one is used.
+
+        :param name: parameter name, must be numeric
+        :param levels: levels in the unit of coordinate, default standard pressure levels [Pa]
+        :param coordinate: parameter to match levels against
+        :return: float array(num_soundings, len(levels))
+        """
+        levels = np.asarray(levels, dtype=float)
+        matrix = np.full((len(self), len(levels)), np.nan)
+        if not len(levels) or not len(self):
+            return matrix
+
+        coord = np.asarray(self.parameters[coordinate], dtype=float)
+        values = np.asarray(self.parameters[name], dtype=float)
+
+        # Find matching level column for every row
+        order = np.argsort(levels)
+        sorted_levels = levels[order]
+        position = np.clip(np.searchsorted(sorted_levels, coord), 0, len(levels) - 1)
+        match = sorted_levels[position] == coord
+
+        row = self.sounding_index()[match]
+        column = order[position[match]]
+        matrix[row, column] = values[match]
+        return matrix
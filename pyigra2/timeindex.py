@@ -0,0 +1,230 @@
+# STD-lib
+# 3rd-party
+import numpy as np
+
+# Local
+
+
+def sounding_times(year, month, day, hour, reltime):
+    """Build sounding times from the YEAR, MONTH, DAY, HOUR and RELTIME header fields.
+
+    All arguments are array like (str or int) with one entry per sounding. The nominal time is
+    YEAR-MONTH-DAY HOUR:00. HOUR == 99 (hour missing) is handled explicitly:
+
+    * If RELTIME holds a valid release hour (00-23) the release time is used instead. Missing
+      release minutes (HH99) are set to zero.
+    * If also RELTIME is missing (9999) the time is set to 00:00 on the date and the sounding is
+      flagged in the returned hour_missing mask.
+
+    :param year: YEAR header values
+    :param month: MONTH header values
+    :param day: DAY header values
+    :param hour: HOUR header values
+    :param reltime: RELTIME header values
+    :return: tuple (times, hour_missing) where times is datetime64[m] and hour_missing is bool
+    """
+    year = np.asarray(year).astype(np.int64)
+    month = np.asarray(month).astype(np.int64)
+    day = np.asarray(day).astype(np.int64)
+    hour = np.asarray(hour).astype(np.int64)
+    reltime = np.asarray(reltime).astype(np.int64)
+
+    # Date part: months since epoch -> days -> minutes
+    months = ((year - 1970) * 12 + (month - 1)).astype("datetime64[M]")
+    days = months.astype("datetime64[D]") + (day - 1).astype("timedelta64[D]")
+
+    # Release hour and minute (RELTIME = HHMM, HH99 = minute missing, 9999 = missing)
+    rel_hour = reltime // 100
+    rel_minute = reltime % 100
+    rel_minute[rel_minute > 59] = 0
+
+    # HOUR == 99 => use the release time when it is available
+    hour_99 = hour == 99
+    use_reltime = hour_99 & (rel_hour < 24)
+    hour_missing = hour_99 & ~use_reltime
+
+    minutes = hour * 60
+    minutes[use_reltime] = rel_hour[use_reltime] * 60 + rel_minute[use_reltime]
+    minutes[hour_missing] = 0
+
+    times = days.astype("datetime64[m]") + minutes.astype("timedelta64[m]")
+    return times, hour_missing
+
+
+def sounding_keys(year, month, day, hour):
+    """Build the (date, hour) keys of raw_data from the YEAR, MONTH, DAY and HOUR header fields.
+
+    Keys are the same as created by IGRABase.read(): ('YYYY-MM-DD', 'HH'), where missing hours
+    (99) get a counter per date, '99_0', '99_1', ...
+
+    :param year: YEAR header values, str
+    :param month: MONTH header values, str
+    :param day: DAY header values, str
+    :param hour: HOUR header values, str
+    :return: list of (date, hour) tuples
+    """
+    keys = []
+    counters = {}
+    for yyyy, mm, dd, hh in zip(
+        np.asarray(year).tolist(),
+        np.asarray(month).tolist(),
+        np.asarray(day).tolist(),
+        np.asarray(hour).tolist(),
+    ):
+        date = f"{yyyy}-{mm}-{dd}"
+        if hh == "99":
+            counter = counters.get(date, 0)
+            counters[date] = counter + 1
+            hh = f"{hh}_{counter}"
+        keys.append((date, hh))
+    return keys
+
+
+class TimeIndex:
+    """Sorted datetime64 index over the soundings of an IGRA2 file.
+
+    Maps sounding times to the (date, hour) keys used in raw_data and converted_data. All lookups
+    are done with np.searchsorted on the sorted time array.
+    """
+
+    def __init__(self, keys, times, hour_missing=None):
+        """Init method
+
+        :param keys: sequence of (date, hour) keys, one per sounding
+        :param times: datetime64 array with one time per sounding
+        :param hour_missing: bool array, True where the sounding time lacks an hour
+        """
+        times = np.asarray(times, dtype="datetime64[m]")
+        if hour_missing is None:
+            hour_missing = np.zeros(times.shape, dtype=bool)
+
+        if len(keys) != len(times):
+            raise ValueError(
+                f"Number of keys ({len(keys)}) and times ({len(times)}) differ."
+            )
+
+        # Stable sort keeps the file order for soundings with equal time
+        self.order = np.argsort(times, kind="stable")
+        self.times = times[self.order]
+        self.hour_missing = np.asarray(hour_missing, dtype=bool)[self.order]
+        self.keys = [keys[idx] for idx in self.order]
+
+    @classmethod
+    def from_data(cls, data):
+        """Create a TimeIndex from raw_data or converted_data
+
+        :param data: dict structured as IGRABase.raw_data
+        :return: TimeIndex
+        """
+        keys = []
+        fields = {name: [] for name in ("YEAR", "MONTH", "DAY", "HOUR", "RELTIME")}
+        for date, hours in data.items():
+            for hour, head_param in hours.items():
+                keys.append((date, hour))
+                header = head_param["header"]
+                for name, values in fields.items():
+                    values.append(header[name])
+
+        times, hour_missing = sounding_times(
+            fields["YEAR"],
+            fields["MONTH"],
+            fields["DAY"],
+            fields["HOUR"],
+            fields["RELTIME"],
+        )
+        return cls(keys, times, hour_missing)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def positions(self, start=None, stop=None):
+        """Positions (in sorted order) of soundings with start <= time < stop
+
+        :param start: start time, None = from first sounding
+        :param stop: stop time (exclusive), None = to last sounding
+        :return: slice into the sorted index
+        """
+        first = 0
+        last = len(self.times)
+        if start is not None:
+            first = np.searchsorted(self.times, self._to_time(start), side="left")
+        if stop is not None:
+            last = np.searchsorted(self.times, self._to_time(stop), side="left")
+        return slice(int(first), int(max(first, last)))
+
+    def slice(self, start=None, stop=None):
+        """Keys of soundings with start <= time < stop, sorted in time
+
+        :param start: start time, e.g. "2018-01-01" or np.datetime64
+        :param stop: stop time (exclusive)
+        :return: list of (date, hour) keys
+        """
+        return self.keys[self.positions(start, stop)]
+
+    def nearest(self, time, tolerance=None):
+        """Key of the sounding closest in time
+
+        :param time: target time
+        :param tolerance: max allowed distance, e.g. np.timedelta64(3, "h"). None = no limit
+        :return: (date, hour) key
+        """
+        position, distance = self._nearest_positions(np.atleast_1d(self._to_time(time)))
+        if position[0] < 0 or (
+            tolerance is not None and distance[0] > np.timedelta64(tolerance, "m")
+        ):
+            raise KeyError(f"No sounding found near {time}.")
+        return self.keys[position[0]]
+
+    def resample(self, start, stop, step, tolerance=None):
+        """Pick the nearest sounding for every time in a regular grid
+
+        :param start: first grid time
+        :param stop: end of grid (exclusive)
+        :param step: grid spacing, e.g. np.timedelta64(12, "h")
+        :param tolerance: max distance to a sounding, default is half the step
+        :return: tuple (grid, keys) where keys[i] is None when no sounding is within tolerance
+        """
+        step = np.timedelta64(step, "m")
+        if tolerance is None:
+            tolerance = step // 2
+        tolerance = np.timedelta64(tolerance, "m")
+
+        grid = np.arange(self._to_time(start), self._to_time(stop), step)
+        position, distance = self._nearest_positions(grid)
+
+        keys = [
+            self.keys[pos] if pos >= 0 and dist <= tolerance else None
+            for pos, dist in zip(position.tolist(), distance)
+        ]
+        return grid, keys
+
+    def _nearest_positions(self, targets):
+        """Vectorized nearest lookup
+
+        :param targets: sorted or unsorted datetime64[m] array
+        :return: tuple (position, distance), position is -1 if the index is empty
+        """
+        if len(self.times) == 0:
+            return (
+                np.full(targets.shape, -1, dtype=np.int64),
+                np.full(targets.shape, np.timedelta64("NaT"), dtype="timedelta64[m]"),
+            )
+
+        right = np.searchsorted(self.times, targets, side="left")
+        right = np.clip(right, 0, len(self.times) - 1)
+        left = np.clip(right - 1, 0, len(self.times) - 1)
+
+        dist_right = np.abs(self.times[right] - targets)
+        dist_left = np.abs(targets - self.times[left])
+
+        position = np.where(dist_left <= dist_right, left, right)
+        distance = np.minimum(dist_left, dist_right)
+        return position, distance
+
+    @staticmethod
+    def _to_time(time):
+        """Convert input to datetime64[m]"""
+        return np.datetime64(time, "m")
@@ -0,0 +1,113 @@
+# STD-lib
+import collections
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.table import SoundingTable
+
+# LAT and LON header fields are given in degrees * 10000
+LATLON_SCALE = 1e-4
+
+Trajectory = collections.namedtuple("Trajectory", "keys times lat lon")
+Bins = collections.namedtuple("Bins", "time lat lon count labels")
+
+
+def positions(data, source="converted"):
+    """Position of every sounding in degrees
+
+    :param data: SoundingTable or IGRABase child, read (and converted)
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (lat, lon) float arrays(num_soundings), np.nan where missing
+    """
+    table = SoundingTable.from_object(data, source)
+    lat = _degrees(table.header["LAT"])
+    lon = _degrees(table.header["LON"])
+    return lat, lon
+
+
+def trajectories(data, source="converted"):
+    """Time sorted track (keys, times, lat, lon) of every station
+
+    All stations are sorted at once and split where the ID changes. For fixed stations
+    the track is constant, LAT/LON are only updated per sounding for mobile stations.
+
+    :param data: SoundingTable or IGRABase child, read (and converted)
+    :param source: 'converted' or 'raw', used for readers only
+    :return: dict station ID: Trajectory
+    """
+    table = SoundingTable.from_object(data, source)
+    lat, lon = positions(table)
+    ids = np.char.strip(np.asarray(table.header["ID"], dtype=str))
+
+    order = np.lexsort((table.times, ids))
+    ids = ids[order]
+    starts = np.flatnonzero(np.concatenate([[True], ids[1:] != ids[:-1]]))
+    stops = np.append(starts[1:], len(ids))
+
+    tracks = {}
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        rows = order[start:stop]
+        tracks[ids[start]] = Trajectory(
+            [table.keys[row] for row in rows.tolist()],
+            table.times[rows],
+            lat[rows],
+            lon[rows],
+        )
+    return tracks
+
+
+def bin_soundings(data, resolution=1.0, period="D", source="converted"):
+    """Count soundings in cells of a lat/lon grid and time periods
+
+    Every sounding gets one integer key (period, row, col), the occupied bins are found with
+    a single np.unique() call.
+
+    :param data: SoundingTable or IGRABase child, read (and converted)
+    :param resolution: grid cell size in degrees
+    :param period: numpy datetime unit of the time bins, e.g. 'h', 'D', 'M' or 'Y'
+    :param source: 'converted' or 'raw', used for readers only
+    :return: Bins(time, lat, lon, count, labels), time/lat/lon are the start and
+             south-west corner of every occupied bin, labels the bin of every sounding
+             (-1 without position)
+    """
+    table = SoundingTable.from_object(data, source)
+    lat, lon = positions(table)
+
+    num_rows = int(np.ceil(180 / resolution))
+    num_cols = int(np.ceil(360 / resolution))
+
+    valid = np.isfinite(lat) & np.isfinite(lon)
+    row = np.clip(np.floor((lat[valid] + 90) / resolution), 0, num_rows - 1)
+    col = np.floor((_wrap(lon[valid]) + 180) / resolution) % num_cols
+    time = table.times[valid].astype(f"datetime64[{period}]").astype(np.int64)
+
+    keys = (time * num_rows + row.astype(np.int64)) * num_cols + col.astype(np.int64)
+    unique, inverse, count = np.unique(keys, return_inverse=True, return_counts=True)
+
+    labels = np.full(len(table), -1, dtype=np.int64)
+    labels[valid] = inverse
+
+    cells = unique % (num_rows * num_cols)
+    return Bins(
+        (unique // (num_rows * num_cols)).astype(f"datetime64[{period}]"),
+        (cells // num_cols) * resolution - 90,
+        (cells % num_cols) * resolution - 180,
+        count,
+        labels,
+    )
+
+
+def _degrees(values):
+    """Raw (str) or converted LAT/LON values to degrees"""
+    values = np.asarray(values)
+    if values.dtype.kind in "US":
+        values = np.char.strip(values.astype(str))
+        values = np.where(values == "", "nan", values)
+    return values.astype(float) * LATLON_SCALE
+
+
+def _wrap(lon):
+    """Longitudes to [-180, 180)"""
+    return (lon + 180) % 360 - 180
@@ -0,0 +1,137 @@
+# STD-lib
+# 3rd-party
+import numpy as np
+
+# Local
+
+
+def validate_data(
+    data,
+    header_name_index,
+    parameters_name_index,
+    text_fields=(),
+    blank_fields=(),
+    header_lines=None,
+):
+    """Find malformed soundings in raw_data
+
+    All header and data fields of all soundings are checked at once, column by column:
+
+    * short lines - fields cut off by the end of the line
+    * non-numeric fields - numeric fields that are not integers (the conversion would fail)
+    * NUMLEV mismatch - NUMLEV differs from the number of data lines
+
+    Only the soundings with problems are visited one by one to format the messages.
+
+    :param data: dict structured as IGRABase.raw_data
+    :param header_name_index: IGRABase._header_name_index
+    :param parameters_name_index: IGRABase._parameters_name_index
+    :param text_fields: fields that are not numeric
+    :param blank_fields: numeric fields that may be blank (missing)
+    :param header_lines: dict (date, hour): line number of the header, for the messages
+    :return: dict (date, hour): list of error messages, only soundings with errors
+    """
+    keys = []
+    header_lists = {name: [] for name in header_name_index}
+    parameter_lists = {name: [] for name in parameters_name_index}
+    num_levels = []
+
+    for date, hours in data.items():
+        for hour, head_param in hours.items():
+            keys.append((date, hour))
+            for name in header_name_index:
+                header_lists[name].append(head_param["header"][name])
+            length = 0
+            for name in parameters_name_index:
+                values = head_param["parameters"][name]
+                parameter_lists[name].extend(values)
+                length = len(values)
+            num_levels.append(length)
+
+    num_levels = np.asarray(num_levels, dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(num_levels)])
+
+    header_errors = _field_errors(
+        header_lists, header_name_index, text_fields, blank_fields
+    )
+    level_errors = _field_errors(
+        parameter_lists, parameters_name_index, text_fields, blank_fields
+    )
+
+    # NUMLEV against the number of data lines
+    numlev = np.char.strip(np.asarray(header_lists["NUMLEV"], dtype=str))
+    has_numlev = np.char.isdigit(numlev)
+    mismatch = np.zeros(len(keys), dtype=bool)
+    mismatch[has_numlev] = numlev[has_numlev].astype(np.int64) != num_levels[has_numlev]
+
+    # Soundings with any problem
+    bad = header_errors["any"] | mismatch
+    level_rows = np.flatnonzero(level_errors["any"])
+    bad[np.searchsorted(offsets, level_rows, side="right") - 1] = True
+
+    problems = {}
+    for idx in np.flatnonzero(bad).tolist():
+        key = keys[idx]
+        line = header_lines.get(key) if header_lines else None
+        messages = []
+
+        messages.extend(_messages(header_errors, idx, line, "header"))
+        if mismatch[idx]:
+            messages.append(
+                f"NUMLEV is {int(numlev[idx])} but the sounding has {num_levels[idx]} levels"
+            )
+        for row in range(offsets[idx], offsets[idx + 1]):
+            if level_errors["any"][row]:
+                level_line = line + 1 + row - offsets[idx] if line else None
+                messages.extend(_messages(level_errors, row, level_line, "data"))
+        problems[key] = messages
+    return problems
+
+
+def _field_errors(columns, name_index, text_fields, blank_fields):
+    """Short and non-numeric fields of all rows
+
+    :return: dict with 'short' and 'number' (name: bool array) and 'any' (bool array)
+    """
+    num_rows = len(next(iter(columns.values()))) if columns else 0
+    errors = {"short": {}, "number": {}, "any": np.zeros(num_rows, dtype=bool)}
+
+    for name, (first, last) in name_index.items():
+        values = np.asarray(columns[name], dtype=str)
+        if not len(values):
+            continue
+
+        # A field running past the end of a line is shorter or holds the newline
+        stripped = np.char.rstrip(values, "\r\n")
+        short = np.char.str_len(stripped) < last - first + 1
+        errors["short"][name] = short
+
+        if name not in text_fields:
+            number = np.char.strip(stripped)
+            valid = np.char.isdigit(np.char.lstrip(number, "-"))
+            if name in blank_fields:
+                valid |= number == ""
+            errors["number"][name] = ~valid
+            errors["any"] |= ~valid
+        errors["any"] |= short
+    return errors
+
+
+def _messages(errors, row, line, kind):
+    """Error messages of one line"""
+    where = f"Line {line}" if line else f"The {kind} line"
+    messages = []
+
+    short = [name for name, mask in errors["short"].items() if mask[row]]
+    if short:
+        messages.append(f"{where} is too short ({', '.join(short)} incomplete)")
+
+    # Incomplete fields are only reported as such
+    numbers = [
+        name
+        for name, mask in errors["number"].items()
+        if mask[row] and name not in short
+    ]
+    if numbers:
+        messages.append(f"{where} has non-numeric {', '.join(numbers)}")
+    return messages
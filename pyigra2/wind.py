@@ -0,0 +1,302 @@
+# STD-lib
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.conversions import converted_values
+from pyigra2.table import SoundingTable
+
+# Height parameters, in order of preference (Derived: CALCGPH, REPGPH, Observations: GPH)
+HEIGHT_PARAMETERS = ("CALCGPH", "REPGPH", "GPH")
+
+# File format of the parameters, to convert raw values (see conversions.converted_values())
+FORMATS = {
+    "CALCGPH": "derived",
+    "REPGPH": "derived",
+    "UWND": "derived",
+    "VWND": "derived",
+    "GPH": "observations",
+    "WDIR": "observations",
+    "WSPD": "observations",
+}
+
+# Bunkers right mover: deviation from the 0-6 km mean wind [m/s] and layer depth [m]
+BUNKERS_DEVIATION = 7.5
+BUNKERS_DEPTH = 6000.0
+
+
+def to_components(direction, speed):
+    """Wind direction (rad, blowing from, 0 = north) and speed to u (east) and v (north)
+
+    :param direction: array like [rad]
+    :param speed: array like [m/s]
+    :return: (u, v) float arrays [m/s]
+    """
+    direction = np.asarray(direction, dtype=float)
+    speed = np.asarray(speed, dtype=float)
+    return -speed * np.sin(direction), -speed * np.cos(direction)
+
+
+def to_direction_speed(u, v):
+    """u and v to wind direction (rad in [0, 2 pi), blowing from) and speed
+
+    :param u: array like [m/s]
+    :param v: array like [m/s]
+    :return: (direction, speed) float arrays
+    """
+    u = np.asarray(u, dtype=float)
+    v = np.asarray(v, dtype=float)
+    direction = np.mod(np.arctan2(-u, -v), 2 * np.pi)
+    return direction, np.hypot(u, v)
+
+
+def components(data, source="converted"):
+    """u and v of every level, from UWND/VWND (Derived) or WDIR/WSPD (Observations)
+
+    :param data: SoundingTable or IGRABase child, read (and converted), raw values are
+        converted as convert_to_numpy()
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (u, v) float arrays(num_levels) [m/s]
+    """
+    table = SoundingTable.from_object(data, source)
+    if "UWND" in table.parameters and "VWND" in table.parameters:
+        return _parameter(table, "UWND"), _parameter(table, "VWND")
+    return to_components(_parameter(table, "WDIR"), _parameter(table, "WSPD"))
+
+
+def wind_at(data, heights, source="converted"):
+    """Wind linearly interpolated to heights above ground, per sounding
+
+    Ground is the lowest level with a height in each sounding.
+
+    :param data: SoundingTable or IGRABase child, read (and converted), raw values are
+        converted as convert_to_numpy()
+    :param heights: height above ground [m], scalar or array(num_soundings)
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (u, v) float arrays(num_soundings), np.nan outside the sounding
+    """
+    profile = _Profiles(SoundingTable.from_object(data, source))
+    return profile.interpolate(heights)
+
+
+def bulk_shear(data, bottom=0.0, top=6000.0, source="converted"):
+    """Vector wind difference between two heights above ground, per sounding
+
+    :param data: SoundingTable or IGRABase child, read (and converted), raw values are
+        converted as convert_to_numpy()
+    :param bottom: bottom of the layer [m above ground]
+    :param top: top of the layer [m above ground]
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (du, dv) float arrays(num_soundings) [m/s], magnitude = np.hypot(du, dv)
+    """
+    profile = _Profiles(SoundingTable.from_object(data, source))
+    u_bottom, v_bottom = profile.interpolate(bottom)
+    u_top, v_top = profile.interpolate(top)
+    return u_top - u_bottom, v_top - v_bottom
+
+
+def mean_wind(data, bottom=0.0, top=6000.0, source="converted"):
+    """Height weighted mean wind of a layer above ground, per sounding
+
+    :param data: SoundingTable or IGRABase child, read (and converted), raw values are
+        converted as convert_to_numpy()
+    :param bottom: bottom of the layer [m above ground]
+    :param top: top of the layer [m above ground]
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (u, v) float arrays(num_soundings) [m/s]
+    """
+    profile = _Profiles(SoundingTable.from_object(data, source))
+    return profile.layer_mean(bottom, top)
+
+
+def storm_motion(data, source="converted"):
+    """Bunkers right mover storm motion, per sounding
+
+    Mean wind of the 0-6 km layer plus 7.5 m/s perpendicular (to the right) of the 0-6 km
+    bulk shear.
+
+    :param data: SoundingTable or IGRABase child, read (and converted), raw values are
+        converted as convert_to_numpy()
+    :param source: 'converted' or 'raw', used for readers only
+    :return: (u, v) float arrays(num_soundings) [m/s]
+    """
+    profile = _Profiles(SoundingTable.from_object(data, source))
+    return profile.bunkers()
+
+
+def storm_relative_helicity(data, top=3000.0, motion=None, source="converted"):
+    """Storm relative helicity of the layer from ground to top, per sounding
+
+    SRH = sum over all layers of (u[i+1] - cu) * (v[i] - cv) - (u[i] - cu) * (v[i+1] - cv)
+
+    :param data: SoundingTable or IGRABase child, read (and converted), raw values are
+        converted as convert_to_numpy()
+    :param top: top of the layer [m above ground]
+    :param motion: storm motion (cu, cv) [m/s], scalars or arrays(num_soundings),
+                   None = Bunkers right mover (storm_motion())
+    :param source: 'converted' or 'raw', used for readers only
+    :return: float array(num_soundings) [m2/s2]
+    """
+    profile = _Profiles(SoundingTable.from_object(data, source))
+    if motion is None:
+        motion = profile.bunkers()
+
+    cu = np.broadcast_to(np.asarray(motion[0], dtype=float), (profile.num_soundings,))
+    cv = np.broadcast_to(np.asarray(motion[1], dtype=float), (profile.num_soundings,))
+
+    sounding, height, u, v, complete = profile.layer(0.0, top)
+    u = u - cu[sounding]
+    v = v - cv[sounding]
+
+    pair = sounding[1:] == sounding[:-1]
+    terms = (u[1:] * v[:-1] - u[:-1] * v[1:])[pair]
+    srh = np.bincount(
+        sounding[1:][pair], weights=terms, minlength=profile.num_soundings
+    )
+    srh[~complete] = np.nan
+    return srh
+
+
+class _Profiles:
+    """Levels with height and wind of all soundings, sorted by (sounding, height)"""
+
+    def __init__(self, table):
+        """Init method
+
+        :param table: SoundingTable, raw or converted
+        """
+        self.num_soundings = len(table)
+
+        for name in HEIGHT_PARAMETERS:
+            if name in table.parameters:
+                height = _parameter(table, name)
+                break
+        else:
+            raise KeyError(f"None of {HEIGHT_PARAMETERS} in table.")
+
+        u, v = components(table)
+        sounding = table.sounding_index()
+
+        # Ground = lowest height of each sounding
+        ground = np.full(self.num_soundings, np.inf)
+        has_height = np.isfinite(height)
+        np.minimum.at(ground, sounding[has_height], height[has_height])
+
+        valid = has_height & np.isfinite(u) & np.isfinite(v)
+        sounding = sounding[valid]
+        height = height[valid] - ground[sounding]
+
+        order = np.lexsort((height, sounding))
+        self.sounding = sounding[order]
+        self.height = height[order]
+        self.u = u[valid][order]
+        self.v = v[valid][order]
+
+        # Levels per sounding and start of every sounding in the sorted arrays
+        self.counts = np.bincount(self.sounding, minlength=self.num_soundings)
+        self.starts = np.concatenate([[0], np.cumsum(self.counts)[:-1]])
+
+    def interpolate(self, heights):
+        """Linear interpolation of u and v to one height per sounding"""
+        heights = np.broadcast_to(
+            np.asarray(heights, dtype=float), (self.num_soundings,)
+        )
+        u = np.full(self.num_soundings, np.nan)
+        v = np.full(self.num_soundings, np.nan)
+        if not len(self.height):
+            return u, v
+
+        # Number of levels at or below the target height in each sounding
+        below = np.bincount(
+            self.sounding,
+            weights=self.height <= heights[self.sounding],
+            minlength=self.num_soundings,
+        ).astype(np.int64)
+
+        lower = self.starts + below - 1
+        upper = np.minimum(lower + 1, self.starts + self.counts - 1)
+        inside = (below > 0) & (
+            (below < self.counts) | (self.height[np.maximum(lower, 0)] == heights)
+        )
+        lower = np.clip(lower, 0, len(self.height) - 1)
+        upper = np.clip(upper, 0, len(self.height) - 1)
+
+        dz = self.height[upper] - self.height[lower]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(dz > 0, (heights - self.height[lower]) / dz, 0.0)
+
+        u[inside] = (self.u[lower] + weight * (self.u[upper] - self.u[lower]))[inside]
+        v[inside] = (self.v[lower] + weight * (self.v[upper] - self.v[lower]))[inside]
+        return u, v
+
+    def layer(self, bottom, top):
+        """Levels of a layer including interpolated bottom and top levels
+
+        :return: (sounding, height, u, v, complete), sorted by (sounding, height),
+                 complete = layer covered by the sounding
+        """
+        u_bottom, v_bottom = self.interpolate(bottom)
+        u_top, v_top = self.interpolate(top)
+        complete = np.isfinite(u_bottom) & np.isfinite(u_top)
+
+        inner = (self.height > bottom) & (self.height < top)
+        soundings = np.arange(self.num_soundings)
+        sounding = np.concatenate([soundings, self.sounding[inner], soundings])
+        height = np.concatenate(
+            [
+                np.full(self.num_soundings, float(bottom)),
+                self.height[inner],
+                np.full(self.num_soundings, float(top)),
+            ]
+        )
+        u = np.concatenate([u_bottom, self.u[inner], u_top])
+        v = np.concatenate([v_bottom, self.v[inner], v_top])
+
+        # Bottom first and top last on equal heights
+        rank = np.concatenate(
+            [
+                np.zeros(self.num_soundings),
+                np.ones(inner.sum()),
+                np.full(self.num_soundings, 2),
+            ]
+        )
+        order = np.lexsort((rank, height, sounding))
+        return sounding[order], height[order], u[order], v[order], complete
+
+    def layer_mean(self, bottom, top):
+        """Trapezoidal height weighted mean wind of a layer"""
+        sounding, height, u, v, complete = self.layer(bottom, top)
+        pair = sounding[1:] == sounding[:-1]
+        dz = np.diff(height)[pair]
+        index = sounding[1:][pair]
+
+        mean_u = np.bincount(
+            index,
+            weights=0.5 * (u[1:] + u[:-1])[pair] * dz,
+            minlength=self.num_soundings,
+        ) / (top - bottom)
+        mean_v = np.bincount(
+            index,
+            weights=0.5 * (v[1:] + v[:-1])[pair] * dz,
+            minlength=self.num_soundings,
+        ) / (top - bottom)
+        mean_u[~complete] = np.nan
+        mean_v[~complete] = np.nan
+        return mean_u, mean_v
+
+    def bunkers(self):
+        """Bunkers right mover storm motion"""
+        mean_u, mean_v = self.layer_mean(0.0, BUNKERS_DEPTH)
+        u_bottom, v_bottom = self.interpolate(0.0)
+        u_top, v_top = self.interpolate(BUNKERS_DEPTH)
+        shear_u = u_top - u_bottom
+        shear_v = v_top - v_bottom
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = BUNKERS_DEVIATION / np.hypot(shear_u, shear_v)
+        return mean_u + scale * shear_v, mean_v - scale * shear_u
+
+
+def _parameter(table, name):
+    """Converted float values of a parameter, also of raw tables"""
+    return converted_values(table.parameters[name], name, FORMATS[name])
@@ -0,0 +1,172 @@
+# STD-lib
+import pathlib
+
+# 3rd-party
+import numpy as np
+
+# Local
+from pyigra2.conversions import CONVERSIONS
+from pyigra2.derived import Derived
+from pyigra2.observations import Observations
+from pyigra2.reader import READERS
+from pyigra2.table import SoundingTable
+
+# Line widths (header, data) in files written by NCEI
+LINE_WIDTHS = {"observations": (71, 52), "derived": (157, 151)}
+
+def write_igra2(data, path, source="raw", layout=None):
+    """Write soundings as an IGRA2 fixed-width file
+
+    NUMLEV is always set to the number of levels actually written, so filtered soundings give
+    valid files.
+
+    :param data: Observations/Derived object or SoundingTable
+    :param path: /path/to/output.txt
+    :param source: 'raw' (text values) or 'converted' (SI-units, converted back)
+    :param layout: 'observations' or 'derived', required for a SoundingTable
+    :return: None
+    """
+    table, layout = _table_layout(data, source, layout)
+    with open(pathlib.Path(path), "wb") as f:
+        f.write(to_bytes(table, layout, source))
+
+
+def to_bytes(table, layout, source="raw"):
+    """Encode a SoundingTable as IGRA2 fixed-width text
+
+    All lines are built in two uint8 matrices (headers and levels) with one assignment per
+    field and scattered into the output buffer with fancy indexing.
+
+    :param table: SoundingTable
+    :param layout: 'observations' or 'derived'
+    :param source: 'raw' or 'converted', the kind of values in table
+    :return: bytes
+    """
+    if source not in ("raw", "converted"):
+        raise ValueError(
+            f"The source variable should equal to 'converted or 'raw', got {source}' "
+        )
+
+    reader = READERS[layout]("")
+    header_width, data_width = LINE_WIDTHS[layout]
+    conversions = CONVERSIONS[layout] if source == "converted" else {}
+    num_soundings = len(table)
+    num_levels = int(table.offsets[-1]) if num_soundings else 0
+
+    # NUMLEV from the actual levels
+    header = dict(table.header)
+    header["NUMLEV"] = table.num_levels
+    header["HEADREC"] = np.full(num_soundings, "#")
+
+    header_matrix = _encode_lines(
+        header,
+        reader._header_name_index,
+        conversions,
+        header_width,
+        num_soundings,
+    )
+    data_matrix = _encode_lines(
+        table.parameters,
+        reader._parameters_name_index,
+        conversions,
+        data_width,
+        num_levels,
+    )
+
+    # Byte position of every header and data line
+    sounding = np.arange(num_soundings, dtype=np.int64)
+    header_starts = sounding * (header_width + 1) + table.offsets[:-1] * (
+        data_width + 1
+    )
+    level = np.arange(num_levels, dtype=np.int64)
+    data_starts = (table.sounding_index() + 1) * (header_width + 1) + level * (
+        data_width + 1
+    )
+
+    out = np.empty(
+        num_soundings * (header_width + 1) + num_levels * (data_width + 1),
+        dtype=np.uint8,
+    )
+    out[header_starts[:, None] + np.arange(header_width)] = header_matrix
+    out[header_starts + header_width] = ord("\n")
+    out[data_starts[:, None] + np.arange(data_width)] = data_matrix
+    out[data_starts + data_width] = ord("\n")
+    return out.tobytes()
+
+
+def _table_layout(data, source, layout):
+    """SoundingTable and layout of data"""
+    if isinstance(data, SoundingTable):
+        if layout not in LINE_WIDTHS:
+            raise ValueError(
+                f"The layout variable should be 'observations' or 'derived', got {layout}"
+            )
+        return data.decode_header(), layout
+
+    if isinstance(data, Observations):
+        layout = "observations"
+    elif isinstance(data, Derived):
+        layout = "derived"
+    else:
+        raise TypeError(f"Can not write data of type {type(data).__name__}.")
+    return SoundingTable.from_reader(data, source), layout
+
+
+def _encode_lines(columns, name_index, conversions, width, num_lines):
+    """Fixed-width lines as a uint8 matrix
+
+    :param columns: dict of column arrays
+    :param name_index: column name: [first, last] (1-based, inclusive)
+    :param conversions: CONVERSIONS entries of converted columns, written back to raw values
+    :param width: line width
+    :param num_lines: number of lines
+    :return: uint8 array(num_lines, width)
+    """
+    matrix = np.full((num_lines, width), ord(" "), dtype=np.uint8)
+    if not num_lines:
+        return matrix
+
+    for name, (first, last) in name_index.items():
+        if name not in columns:
+            continue
+        field_width = last - first + 1
+        matrix[:, first - 1 : last] = _encode_field(
+            name, columns[name], conversions.get(name), field_width
+        )
+    return matrix
+
+
+def _encode_field(name, values, conversion, width):
+    """Encode one field of all lines
+
+    Numbers are right aligned, text is left aligned (raw slices of truncated lines keep their
+    position).
+
+    :return: uint8 array(num_lines, width)
+    """
+    values = np.asarray(values)
+    align = np.char.rjust
+
+    if conversion is not None:
+        missing, divisor, offset = conversion
+        values = values.astype(float)
+        valid = np.isfinite(values)
+        numbers = np.zeros(values.shape, dtype=np.int64)
+        numbers[valid] = np.rint((values[valid] - offset) * divisor)
+        text = numbers.astype(str)
+        text[~valid] = str(missing[0]) if missing else ""
+    elif values.dtype.kind in "iuf":
+        text = values.astype(np.int64).astype(str)
+    else:
+        if values.dtype.kind == "S":
+            values = np.char.decode(values, "ascii")
+        text = values.astype(str)
+        align = np.char.ljust
+
+    # np.char.rjust/ljust truncate to width, check first
+    if len(text) and np.char.str_len(text).max() > width:
+        raise ValueError(f"Values of {name} do not fit in {width} characters.")
+    text = align(text, width)
+
+    encoded = np.ascontiguousarray(text.astype(f"S{width}"))
+    return encoded.view(np.uint8).reshape(len(text), width)
@@ -0,0 +1,311 @@
+# STD-lib
+import collections
+import os
+import threading
+
+# 3rd-party
+import numpy as np
+import xarray as xr
+from xarray.backends import BackendArray, BackendEntrypoint
+from xarray.core import indexing
+
+# Local
+from pyigra2.fileindex import FileIndex
+from pyigra2.reader import READERS, detect_format
+from pyigra2.table import SoundingTable, STANDARD_PRESSURE_LEVELS
+
+# Soundings parsed at a time, also the preferred dask chunk along the sounding dimension
+DEFAULT_CHUNK_SIZE = 1000
+
+# Parsed chunks kept in memory per opened file
+CHUNK_CACHE_SIZE = 4
+
+# Dataset layouts:
+# * levels - numeric parameters at standard pressure levels, dims (time, pressure)
+# * ragged - all levels of all soundings concatenated, dims (sounding,) and (level,), the
+#   levels of a sounding are given by row_size (contiguous ragged array, CF conventions)
+LAYOUTS = ("levels", "ragged")
+
+
+class IGRA2BackendEntrypoint(BackendEntrypoint):
+    """xarray backend for IGRA2 observation and derived files
+
+    xr.open_dataset(path, engine="igra2") only indexes the header lines of the file (see
+    FileIndex). Variables are lazy, a chunk of soundings is parsed and converted the first
+    time one of its values is accessed.
+    """
+
+    description = "Open IGRA2 observation and derived files"
+    url = "https://github.com/patrjon/pyigra2"
+    open_dataset_parameters = (
+        "filename_or_obj",
+        "drop_variables",
+        "layout",
+        "chunk_size",
+        "levels",
+        "cache_index",
+    )
+
+    def open_dataset(
+        self,
+        filename_or_obj,
+        *,
+        drop_variables=None,
+        layout="levels",
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        levels=None,
+        cache_index=False,
+    ):
+        """Open an IGRA2 file as a lazy Dataset
+
+        :param filename_or_obj: /path/to/file.txt
+        :param drop_variables: header or parameter names to leave out
+        :param layout: 'levels' or 'ragged', see LAYOUTS
+        :param chunk_size: number of soundings parsed at a time
+        :param levels: pressure levels [Pa] of the 'levels' layout, None = standard levels
+        :param cache_index: read and write the FileIndex cache next to the file
+        :return: xr.Dataset
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"The layout should be one of {LAYOUTS}, got {layout}.")
+
+        index = FileIndex.from_file(filename_or_obj, cache=cache_index)
+        return open_index(
+            index,
+            layout=layout,
+            chunk_size=chunk_size,
+            levels=levels,
+            drop_variables=drop_variables,
+        )
+
+    def guess_can_open(self, filename_or_obj):
+        """IGRA2 files are recognized from the layout of their first lines"""
+        if not isinstance(filename_or_obj, (str, os.PathLike)):
+            return False
+        try:
+            detect_format(filename_or_obj)
+        except (OSError, ValueError, UnicodeDecodeError):
+            return False
+        return True
+
+
+def open_index(
+    index,
+    layout="levels",
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    levels=None,
+    drop_variables=None,
+):
+    """Lazy Dataset of an indexed IGRA2 file
+
+    :param index: FileIndex
+    :param layout: 'levels' or 'ragged', see LAYOUTS
+    :param chunk_size: number of soundings parsed at a time
+    :param levels: pressure levels [Pa] of the 'levels' layout, None = standard levels
+    :param drop_variables: header or parameter names to leave out
+    :return: xr.Dataset
+    """
+    drop = set(
+        [drop_variables] if isinstance(drop_variables, str) else drop_variables or ()
+    )
+    chunks = _ChunkCache(index, chunk_size, check_levels=layout == "ragged")
+    units = READERS[index.format](index.path)
+
+    # Names and dtypes from the first sounding
+    sample = index.table(0, 1)
+    sounding_dim = "time" if layout == "levels" else "sounding"
+    encoding = {"preferred_chunks": {sounding_dim: chunk_size}}
+
+    variables = {}
+    for name, values in sample.header.items():
+        if name in drop:
+            continue
+        array = _HeaderArray(chunks, name, values.dtype)
+        variables[name] = xr.Variable(
+            (sounding_dim,),
+            indexing.LazilyIndexedArray(array),
+            {"units": units._header_units[name][1]},
+            encoding,
+        )
+
+    coords = {"time": (sounding_dim, index.times.astype("datetime64[ns]"))}
+
+    if layout == "levels":
+        levels = STANDARD_PRESSURE_LEVELS if levels is None else np.asarray(levels)
+        coords["pressure"] = (
+            "pressure",
+            np.asarray(levels, dtype=float),
+            {"units": "Pa"},
+        )
+        for name, values in sample.parameters.items():
+            if name in drop or name == "PRESS" or values.dtype.kind != "f":
+                continue
+            array = _GriddedArray(chunks, name, levels)
+            variables[name] = xr.Variable(
+                ("time", "pressure"),
+                indexing.LazilyIndexedArray(array),
+                {"units": units._parameter_units[name][1]},
+                encoding,
+            )
+    else:
+        variables["row_size"] = xr.Variable(
+            ("sounding",), index.num_levels, {"sample_dimension": "level"}
+        )
+        for name, values in sample.parameters.items():
+            if name in drop:
+                continue
+            array = _RaggedArray(chunks, name, values.dtype)
+            variables[name] = xr.Variable(
+                ("level",),
+                indexing.LazilyIndexedArray(array),
+                {"units": units._parameter_units[name][1]},
+            )
+
+    dataset = xr.Dataset(variables, coords=coords)
+    dataset.attrs["source"] = index.path.as_posix()
+    dataset.attrs["format"] = index.format
+    return dataset
+
+
+class _ChunkCache:
+    """Soundings of an indexed file, parsed chunk by chunk and kept in a small LRU cache"""
+
+    def __init__(self, index, chunk_size, check_levels=False):
+        """Init method
+
+        :param index: FileIndex
+        :param chunk_size: number of soundings per chunk
+        :param check_levels: raise if NUMLEV differs from the parsed levels (ragged layout)
+        """
+        self.index = index
+        self.chunk_size = chunk_size
+        self.check_levels = check_levels
+        self._tables = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        # Level offsets from NUMLEV, for the ragged layout
+        self.level_offsets = np.concatenate(
+            [[0], np.cumsum(np.maximum(index.num_levels, 0))]
+        )
+
+    def get(self, first, last):
+        """Table holding the soundings first:last
+
+        :param first: position of the first sounding
+        :param last: stop position (exclusive)
+        :return: (table, base), sounding i is table sounding i - base
+        """
+        numbers = range(first // self.chunk_size, (last - 1) // self.chunk_size + 1)
+        tables = [self._chunk(number) for number in numbers]
+        table = tables[0] if len(tables) == 1 else SoundingTable.concatenate(tables)
+        return table, numbers[0] * self.chunk_size
+
+    def _chunk(self, number):
+        """Parsed and converted chunk number"""
+        with self._lock:
+            if number in self._tables:
+                self._tables.move_to_end(number)
+                return self._tables[number]
+
+        first = number * self.chunk_size
+        table = self.index.table(first, first + self.chunk_size)
+
+        # Soundings with equal (date, hour) keys replace each other in the reader
+        expected = min(self.chunk_size, len(self.index) - first)
+        if len(table) != expected:
+            raise ValueError(
+                f"Soundings with equal date and hour in {self.index.path.as_posix()}, "
+                f"soundings {first}-{first + expected - 1}."
+            )
+
+        # The ragged layout relies on NUMLEV
+        expected = np.diff(self.level_offsets[first : first + len(table) + 1])
+        if self.check_levels and not np.array_equal(table.num_levels, expected):
+            raise ValueError(
+                f"NUMLEV does not match the data lines in {self.index.path.as_posix()}, "
+                f"soundings {first}-{first + len(table) - 1}."
+            )
+
+        with self._lock:
+            self._tables[number] = table
+            while len(self._tables) > CHUNK_CACHE_SIZE:
+                self._tables.popitem(last=False)
+        return table
+
+
+class _SoundingArray(BackendArray):
+    """Lazy array with the sounding dimension first"""
+
+    def __init__(self, chunks, name, dtype, shape):
+        """Init method
+
+        :param chunks: _ChunkCache
+        :param name: header or parameter name
+        :param dtype: dtype of the converted values, strings are returned as objects
+        :param shape: shape of the array
+        """
+        self.chunks = chunks
+        self.name = name
+        self.dtype = np.dtype(object) if dtype.kind in "US" else np.dtype(dtype)
+        self.shape = shape
+
+    def __getitem__(self, key):
+        return indexing.explicit_indexing_adapter(
+            key, self.shape, indexing.IndexingSupport.BASIC, self._raw_indexing_method
+        )
+
+    def _raw_indexing_method(self, key):
+        """Values of the positions in key along the first dimension, then the rest of key"""
+        positions = np.arange(self.shape[0])[key[0]]
+        flat = np.atleast_1d(positions)
+        if len(flat):
+            values = self._values(flat)
+        else:
+            values = np.empty((0,) + self.shape[1:], dtype=self.dtype)
+        values = values.astype(self.dtype, copy=False)
+
+        if np.ndim(positions) == 0:
+            return values[0][key[1:]]
+        return values[(slice(None),) + tuple(key[1:])]
+
+    def _values(self, positions):
+        """Values at positions (int array) along the first dimension"""
+        raise NotImplementedError
+
+
+class _HeaderArray(_SoundingArray):
+    """Header field, one value per sounding"""
+
+    def __init__(self, chunks, name, dtype):
+        super().__init__(chunks, name, dtype, (len(chunks.index),))
+
+    def _values(self, positions):
+        table, base = self.chunks.get(int(positions.min()), int(positions.max()) + 1)
+        return table.header[self.name][positions - base]
+
+
+class _GriddedArray(_SoundingArray):
+    """Parameter at fixed pressure levels, (sounding, level)"""
+
+    def __init__(self, chunks, name, levels):
+        super().__init__(
+            chunks, name, np.dtype(float), (len(chunks.index), len(levels))
+        )
+        self.levels = np.asarray(levels, dtype=float)
+
+    def _values(self, positions):
+        table, base = self.chunks.get(int(positions.min()), int(positions.max()) + 1)
+        return table.level_matrix(self.name, self.levels)[positions - base]
+
+
+class _RaggedArray(_SoundingArray):
+    """Parameter of all levels of all soundings concatenated"""
+
+    def __init__(self, chunks, name, dtype):
+        super().__init__(chunks, name, dtype, (int(chunks.level_offsets[-1]),))
+
+    def _values(self, positions):
+        offsets = self.chunks.level_offsets
+        soundings = np.searchsorted(offsets, positions, side="right") - 1
+        table, base = self.chunks.get(int(soundings.min()), int(soundings.max()) + 1)
+        return table.parameters[self.name][positions - offsets[base]]
@@ -32,6 +32,17 @@ setup(
         'Programming Language :: Python :: 3.8',
     ],
     description="Pyigra2 reads Igra2 observation and derived data files",
+    entry_points={
+        'console_scripts': [
+            'pyigra2=pyigra2.cli:main',
+        ],
+        'xarray.backends': [
+            'igra2=pyigra2.xarray_backend:IGRA2BackendEntrypoint',
+        ],
+    },
+    extras_require={
+        'xarray': ['xarray>=0.18', 'dask'],
+    },
     install_requires=requirements,
     license="MIT license",
     long_description=readme + '\n\n' + history,
@@ -1,7 +1,7 @@
 import pathlib
 import numpy as np
 import pytest
-from pyigra2.base import IGRABase
+from pyigra2.base import IGRABase, fixed_width_columns
 
 
 @pytest.fixture(scope="function")
@@ -98,3 +98,18 @@ def test_missing_value():
     out = IGRABase._missing_test("-99", "10")
     assert isinstance(out, float)
     assert int(out) == 10
+
+
+def test_iter_chunks(base):
+    """Test that iter_chunks should not yield anything when called from IGRABAse"""
+    assert list(base.iter_chunks()) == []
+    assert all(helper_initial_state(base))
+
+
+def test_fixed_width_columns():
+    """Fields of all lines as bytes columns, short lines are padded"""
+    columns = fixed_width_columns(
+        [b"SWM00002527 2018", b"USM00070026"], {"ID": [1, 11], "YEAR": [13, 16]}
+    )
+    np.testing.assert_array_equal(columns["ID"], [b"SWM00002527", b"USM00070026"])
+    np.testing.assert_array_equal(columns["YEAR"], [b"2018", b""])
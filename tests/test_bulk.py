@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from pyigra2.bulk import parse_file, read_files
+from pyigra2.reader import READERS, detect_format
+from pyigra2.table import SoundingTable
+
+
+def reader_table(path, source="converted"):
+    """SoundingTable of the reader of path"""
+    reader = READERS[detect_format(path)](path)
+    reader.read()
+    if source == "converted":
+        reader.convert_to_numpy()
+    return SoundingTable.from_reader(reader, source)
+
+
+def assert_tables_equal(table, expected):
+    """Same keys, offsets and columns (float columns to rounding)"""
+    assert table.keys == expected.keys
+    np.testing.assert_array_equal(table.offsets, expected.offsets)
+    np.testing.assert_array_equal(table.times, expected.times)
+    for part in ("header", "parameters"):
+        columns = getattr(table, part)
+        assert list(columns) == list(getattr(expected, part))
+        for name, values in getattr(expected, part).items():
+            assert columns[name].dtype == values.dtype, name
+            if values.dtype.kind == "f":
+                np.testing.assert_allclose(columns[name], values, rtol=1e-12)
+            else:
+                np.testing.assert_array_equal(columns[name], values)
+
+
+@pytest.mark.parametrize("case", ["obs_singel", "obs_multi", "der_singel", "der_multi"])
+def test_parse_file(info, case):
+    """Same table as the reader"""
+    path = getattr(info, case).path
+    assert_tables_equal(parse_file(path), reader_table(path))
+
+
+def test_parse_file_raw(info):
+    """Raw parameters are the field text"""
+    path = info.obs_multi.path
+    table = parse_file(path, convert=False)
+    expected = reader_table(path, source="raw")
+
+    assert table.keys == expected.keys
+    for name, values in expected.parameters.items():
+        np.testing.assert_array_equal(table.parameters[name], values)
+
+
+def test_line_endings(tmp_path, info):
+    """CRLF line endings and stripped trailing blanks"""
+    lines = info.der_multi.path.read_text().splitlines()
+    path = tmp_path / "der.txt"
+    path.write_bytes("\r\n".join(line.rstrip() for line in lines).encode("ascii"))
+
+    assert_tables_equal(parse_file(path), reader_table(info.der_multi.path))
+
+
+def test_not_a_number(tmp_path, info):
+    """Letters in a numeric field"""
+    lines = info.obs_singel.path.read_text().splitlines(keepends=True)
+    lines[2] = lines[2][:9] + "1x0000" + lines[2][15:]
+    path = tmp_path / "obs.txt"
+    path.write_text("".join(lines))
+
+    with pytest.raises(ValueError):
+        parse_file(path)
+
+
+def test_read_files(info):
+    """Tables in the order of the paths, threads or not"""
+    paths = [info.der_multi.path, info.obs_multi.path, info.obs_singel.path]
+    threaded = read_files(paths, max_workers=3)
+    serial = read_files(paths, max_workers=1)
+
+    assert [len(table) for table in threaded] == [4, 5, 1]
+    for table, expected in zip(threaded, serial):
+        assert_tables_equal(table, expected)
+
+
+def test_duplicate_keys(tmp_path, info):
+    """The last sounding of a (date, hour) key is kept, as by the reader"""
+    text = info.obs_multi.path.read_text()
+    path = tmp_path / "obs.txt"
+    # The first sounding again, with two levels
+    path.write_text(text + "".join(text.splitlines(keepends=True)[:3]))
+
+    table = parse_file(path)
+    assert len(table) == 5
+    assert table.num_levels[0] == 2
+    assert_tables_equal(table, reader_table(path))
+
+
+def test_blank_lines(tmp_path, info):
+    """Blank lines are not levels"""
+    lines = info.obs_multi.path.read_text().splitlines(keepends=True)
+    path = tmp_path / "obs.txt"
+    path.write_text("".join(lines[:3] + ["\n", "   \r\n"] + lines[3:] + ["\n", "\n"]))
+
+    assert_tables_equal(parse_file(path), reader_table(info.obs_multi.path))
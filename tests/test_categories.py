@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from pyigra2 import categories
+from pyigra2.join import join_soundings
+from pyigra2.observations import Observations
+from pyigra2.reader import open_igra2
+from pyigra2.store import Store
+from pyigra2.table import SoundingTable
+
+
+@pytest.fixture(scope="module")
+def table(info):
+    """obs_multi as SoundingTable"""
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield SoundingTable.from_reader(obs)
+
+
+def test_encode():
+    """Known categories keep their codes, new values are added sorted"""
+    codes, used = categories.encode(
+        np.array([b"ncdc-gts", b"zzz     ", b"        ", b"aaa"]),
+        categories.P_SRC_CODES,
+    )
+    assert codes.dtype == np.uint8
+    assert used[: len(categories.P_SRC_CODES)] == categories.P_SRC_CODES
+    assert used[len(categories.P_SRC_CODES) :] == ("aaa", "zzz")
+    np.testing.assert_array_equal(
+        categories.decode(codes, used), ["ncdc-gts", "zzz", "", "aaa"]
+    )
+    assert codes[0] == categories.code(used, "ncdc-gts") == 25
+    with pytest.raises(KeyError):
+        categories.code(used, "unknown")
+
+
+def test_encode_header(table):
+    """Integer time fields, encoded sources and ID, round trip to the original header"""
+    encoded = table.encode_header()
+    assert encoded.header["YEAR"].dtype == np.int16
+    assert encoded.header["HOUR"].tolist() == [0, 99, 0, 99, 99]
+    assert encoded.header["P_SRC"].dtype == np.uint8
+    assert encoded.categories["ID"] == ("SWM00002527",)
+    assert set(encoded.categories) == {"ID", "P_SRC", "NP_SRC"}
+    np.testing.assert_array_equal(encoded.times, table.times)
+
+    decoded = encoded.decode_header()
+    assert decoded.categories == {}
+    for name, values in table.header.items():
+        np.testing.assert_array_equal(decoded.header[name], values)
+
+    # Times are the same when created from the integer header
+    rebuilt = SoundingTable(
+        encoded.keys, encoded.header, encoded.parameters, encoded.offsets
+    )
+    np.testing.assert_array_equal(rebuilt.times, table.times)
+
+
+def test_header_mask(table):
+    """Same selection on encoded and str headers"""
+    encoded = table.encode_header()
+    for data in (table, encoded):
+        assert data.header_mask("P_SRC", "ncdc-gts").all()
+        assert not data.header_mask("P_SRC", "ncdc6301").any()
+        assert not data.header_mask("P_SRC", "unknown").any()
+        assert data.header_mask("NP_SRC", "").all()
+
+
+def test_take_concatenate(table):
+    """Categories follow the soundings, differing categories are merged"""
+    encoded = table.encode_header()
+    part = encoded.take([0, 2])
+    assert part.categories == encoded.categories
+    assert encoded.select(["P_SRC", "PRESS"]).categories == {
+        "P_SRC": categories.P_SRC_CODES
+    }
+
+    other = table.take([1]).encode_header({"ID": ("A",)})
+    assert other.header["ID"].tolist() == [1]
+
+    merged = SoundingTable.concatenate([part, other])
+    assert merged.categories["ID"] == ("SWM00002527",)
+    assert merged.header["ID"].tolist() == [0, 0, 0]
+    assert merged.header_mask("P_SRC", "ncdc-gts").all()
+
+
+def test_store_round_trip(tmp_path, table):
+    """Encoded tables are stored with their values, not their codes"""
+    store = Store(tmp_path / "store")
+    store.write(table.encode_header())
+    assert store.stations() == ["SWM00002527"]
+
+    stored = store.open("SWM00002527")
+    assert np.char.decode(stored.header["P_SRC"], "ascii").tolist() == (
+        ["ncdc-gts"] * len(table)
+    )
+    np.testing.assert_array_equal(
+        np.char.decode(stored.header["MONTH"], "ascii"), table.header["MONTH"]
+    )
+
+
+def test_join_encoded(tmp_path, info):
+    """Joining encoded tables matches the same soundings as the str tables"""
+    text = info.obs_multi.path.read_text()
+    text = text.replace("2018 01 01", "2020 05 26").replace("2018 01 02", "2020 05 27")
+    path = tmp_path / "obs.txt"
+    path.write_text(text)
+
+    obs = SoundingTable.from_reader(open_igra2(path, convert=True))
+    der = SoundingTable.from_reader(open_igra2(info.der_multi.path, convert=True))
+
+    expected = join_soundings(obs, der).table
+    joined = join_soundings(obs.encode_header(), der).table
+    assert len(expected) > 0
+    assert joined.keys == expected.keys
+    np.testing.assert_array_equal(joined.parameters["PRESS"], expected.parameters["PRESS"])
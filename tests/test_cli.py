@@ -0,0 +1,139 @@
+import shutil
+import numpy as np
+import pytest
+from pyigra2 import cli
+from pyigra2.store import Store
+
+
+@pytest.fixture(scope="function")
+def data_dir(tmp_path, info):
+    """Directory with one observation and one derived file"""
+    # Setup
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    shutil.copy(info.obs_multi.path, data_dir)
+    shutil.copy(info.der_multi.path, data_dir)
+    yield data_dir
+    # Teardown
+
+
+def test_convert_store(data_dir, tmp_path, capsys):
+    """Convert a directory to stores, observation and derived detected from the header"""
+    output = tmp_path / "out"
+    assert cli.main(["convert", str(data_dir), "-o", str(output)]) == cli.EXIT_OK
+
+    obs = Store(output / "observations").open("SWM00002527")
+    der = Store(output / "derived").open("SWM00002527")
+    assert len(obs) == 5
+    assert len(der) == 4
+    assert "CAPE" in der.header
+
+    # Throughput reported on stderr
+    captured = capsys.readouterr()
+    assert "levels/s" in captured.err
+
+
+def test_convert_npz_filters(data_dir, tmp_path):
+    """Date and column filters with npz output"""
+    output = tmp_path / "out"
+    code = cli.main(
+        [
+            "convert",
+            str(data_dir / "*observation*"),
+            "-o",
+            str(output),
+            "--format",
+            "npz",
+            "--start",
+            "2018-01-02",
+            "--columns",
+            "ID,PRESS,TEMP",
+            "--quiet",
+        ]
+    )
+    assert code == cli.EXIT_OK
+
+    with np.load(output / "observations" / "SWM00002527.npz") as npz:
+        assert len(npz["times"]) == 3
+        assert {"header_ID", "parameters_PRESS", "parameters_TEMP"} < set(npz.files)
+        assert "parameters_GPH" not in npz.files
+
+
+def test_convert_npz_without_id(data_dir, tmp_path):
+    """Stations get their own npz file when --columns drops ID"""
+    other = data_dir / "USM00070026_observation_multi.txt"
+    text = (data_dir / "SWM00002527_observation_multi.txt").read_text()
+    other.write_text(text.replace("SWM00002527", "USM00070026"))
+
+    output = tmp_path / "out"
+    args = ["convert", str(data_dir / "*observation*"), "-o", str(output)]
+    args += ["--format", "npz", "--columns", "PRESS,TEMP", "--quiet"]
+    assert cli.main(args) == cli.EXIT_OK
+
+    files = sorted(path.name for path in (output / "observations").iterdir())
+    assert files == ["SWM00002527.npz", "USM00070026.npz"]
+    for name in files:
+        with np.load(output / "observations" / name) as npz:
+            assert len(npz["times"]) == 5
+            assert "header_ID" not in npz.files
+
+
+def test_convert_workers_resume(data_dir, tmp_path, capsys):
+    """Parallel conversion and resume"""
+    output = tmp_path / "out"
+    args = ["convert", str(data_dir), "-o", str(output), "--workers", "2"]
+    assert cli.main(args) == cli.EXIT_OK
+    capsys.readouterr()
+
+    assert cli.main(args + ["--resume"]) == cli.EXIT_OK
+    assert capsys.readouterr().err.count("(done)") == 2
+
+
+def test_exit_codes(tmp_path):
+    """Exit codes for batch schedulers"""
+    output = tmp_path / "out"
+    assert cli.main(["convert", str(tmp_path / "none*.txt"), "-o", str(output)]) == (
+        cli.EXIT_NO_INPUT
+    )
+
+    bad = tmp_path / "bad.txt"
+    bad.write_text("not an igra2 file\n")
+    assert cli.main(["convert", str(bad), "-o", str(output), "-q"]) == cli.EXIT_FAILED
+
+    assert cli.main([]) == cli.EXIT_USAGE
+    with pytest.raises(SystemExit) as error:
+        cli.main(["convert"])
+    assert error.value.code == cli.EXIT_USAGE
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_convert_same_station(tmp_path, info, workers):
+    """Files of one station are merged into one station, also with parallel workers"""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for path in (info.obs_multi.path, info.obs_singel.path):
+        shutil.copy(path, data_dir)
+
+    output = tmp_path / "out"
+    args = ["convert", str(data_dir), "-o", str(output), "-w", workers, "-q"]
+    assert cli.main(args) == cli.EXIT_OK
+
+    store = Store(output / "observations")
+    assert store.manifest("SWM00002527")["num_soundings"] == 5
+    assert len(store.open("SWM00002527")) == 5
+
+
+def test_resume_same_name(tmp_path, info, capsys):
+    """Inputs with the same file name in different directories are tracked separately"""
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        shutil.copy(info.obs_multi.path, tmp_path / name)
+    output = tmp_path / "out"
+
+    args = ["convert", str(tmp_path / "a"), "-o", str(output)]
+    assert cli.main(args) == cli.EXIT_OK
+    capsys.readouterr()
+
+    args = ["convert", str(tmp_path / "a"), str(tmp_path / "b"), "-o", str(output)]
+    assert cli.main(args + ["--resume"]) == cli.EXIT_OK
+    assert capsys.readouterr().err.count("(done)") == 0
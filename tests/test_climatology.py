@@ -0,0 +1,97 @@
+import warnings
+import numpy as np
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.climatology import Climatology, group_labels
+from pyigra2.table import SoundingTable
+
+
+@pytest.fixture(scope="module")
+def table(info):
+    """Table of the multi observation file"""
+    # Setup
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield SoundingTable.from_reader(obs)
+    # Teardown
+
+
+def test_group_labels():
+    """Group labels for all groups"""
+    times = np.array(["2018-01-01T00:00", "2018-07-15T12:30"], dtype="datetime64[m]")
+    assert group_labels(times, "month").tolist() == [1, 7]
+    assert group_labels(times, "season").tolist() == [0, 2]
+    assert group_labels(times, "year").tolist() == [2018, 2018]
+    assert group_labels(times, "hour").tolist() == [0, 12]
+    assert group_labels(times, "hour", np.array([True, False])).tolist() == [-1, 12]
+
+    with pytest.raises(ValueError):
+        group_labels(times, "fail")
+
+
+def test_streaming_equals_full(info, table):
+    """Chunked statistics should equal statistics over the full table"""
+    full = Climatology(("TEMP", "GPH"), group="hour")
+    full.update(table)
+
+    streamed = Climatology.from_reader(
+        Observations(info.obs_multi.path), ("TEMP", "GPH"), chunk_size=1, group="hour"
+    )
+
+    np.testing.assert_array_equal(streamed.labels, full.labels)
+    for name in ("TEMP", "GPH"):
+        np.testing.assert_array_equal(streamed.count(name), full.count(name))
+        np.testing.assert_allclose(streamed.mean(name), full.mean(name))
+        np.testing.assert_allclose(streamed.std(name), full.std(name), atol=1e-9)
+
+
+def test_statistics(table):
+    """Compare with numpy nan-functions"""
+    climatology = Climatology(("TEMP",), group="hour", quantiles=True)
+    climatology.update(table)
+
+    matrix = table.level_matrix("TEMP")
+    hours = group_labels(table.times, "hour")
+    for row, label in enumerate(climatology.labels):
+        group = matrix[hours == label]
+        with warnings.catch_warnings():
+            # All-NaN levels
+            warnings.simplefilter("ignore", RuntimeWarning)
+            np.testing.assert_allclose(
+                climatology.mean("TEMP")[row], np.nanmean(group, axis=0)
+            )
+            np.testing.assert_allclose(
+                climatology.quantile("TEMP", 0.5)[row], np.nanmedian(group, axis=0)
+            )
+        np.testing.assert_array_equal(
+            climatology.count("TEMP")[row], np.isfinite(group).sum(axis=0)
+        )
+
+    assert climatology.quantile("TEMP", [0.1, 0.9]).shape == (
+        2,
+        len(climatology.labels),
+        len(climatology.levels),
+    )
+
+
+def test_quantile_requires_values(table):
+    """Quantiles are only available when values are kept"""
+    climatology = Climatology(("TEMP",))
+    climatology.update(table)
+    with pytest.raises(ValueError):
+        climatology.quantile("TEMP", 0.5)
+
+
+def test_anomalies(table):
+    """Anomalies against its own baseline average to zero"""
+    climatology = Climatology(("TEMP",), group="month")
+    climatology.update(table)
+    anomalies = climatology.anomalies(table, "TEMP")
+    assert anomalies.shape == (len(table), len(climatology.levels))
+
+    # 500 hPa
+    column = np.flatnonzero(climatology.levels == 50000)[0]
+    finite = np.isfinite(anomalies[:, column])
+    assert finite.any()
+    np.testing.assert_allclose(anomalies[finite, column].mean(), 0.0, atol=1e-9)
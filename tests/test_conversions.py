@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from pyigra2.conversions import CONVERSIONS, converted_values
+
+
+def test_converted_values():
+    """Raw text is converted, missing and blank values are np.nan"""
+    values = converted_values([" -152", "-9999", "-8888", "     "], "TEMP", "observations")
+    assert values[0] == pytest.approx(-15.2 + 273.15)
+    assert np.isnan(values[1:]).all()
+
+    values = converted_values(["   -52", "-99999"], "TEMP", "derived")
+    assert values[0] == pytest.approx(-5.2)
+    assert np.isnan(values[1])
+
+    # Converted values are kept
+    np.testing.assert_array_equal(
+        converted_values(np.array([258.35, np.nan]), "TEMP", "observations"),
+        [258.35, np.nan],
+    )
+
+
+def test_tables():
+    """Every field has missing values, a divisor and an offset"""
+    for fields in CONVERSIONS.values():
+        for missing, divisor, offset in fields.values():
+            assert isinstance(missing, tuple)
+            assert divisor > 0
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from pyigra2.database import connect, insert, query
+from pyigra2.derived import Derived
+from pyigra2.observations import Observations
+from pyigra2.table import SoundingTable
+
+
+@pytest.fixture
+def connection(info):
+    """In-memory database with the multi observation and derived files"""
+    connection = connect(":memory:")
+    insert(connection, Observations(info.obs_multi.path), chunk_size=2)
+    insert(connection, Derived(info.der_multi.path))
+    yield connection
+    connection.close()
+
+
+@pytest.fixture(scope="module")
+def der(info):
+    """Table of the multi derived file"""
+    der = Derived(info.der_multi.path)
+    der.read()
+    der.convert_to_numpy()
+    yield SoundingTable.from_reader(der)
+
+
+def test_insert(connection, der):
+    """Soundings and levels of both formats"""
+    counts = query(
+        connection, "SELECT format, COUNT(*) AS n FROM soundings GROUP BY format"
+    )
+    assert dict(zip(counts["format"], counts["n"])) == {
+        "derived": len(der),
+        "observations": 5,
+    }
+
+    levels = query(
+        connection,
+        "SELECT level, CALCGPH FROM levels JOIN soundings USING (sounding_id) "
+        "WHERE format = 'derived' AND key_date = ? AND key_hour = ? ORDER BY level",
+        der.keys[1],
+    )
+    start, stop = der.offsets[1], der.offsets[2]
+    np.testing.assert_array_equal(levels["level"], np.arange(stop - start))
+    np.testing.assert_array_equal(
+        levels["CALCGPH"], der.parameters["CALCGPH"][start:stop]
+    )
+
+    times = query(connection, "SELECT time FROM soundings WHERE format = 'derived'")
+    assert times["time"][0] == "2020-05-26 00:00"
+
+
+def test_missing_values(connection):
+    """np.nan is stored as NULL"""
+    obs = query(
+        connection,
+        "SELECT COUNT(*) AS n FROM levels JOIN soundings USING (sounding_id) "
+        "WHERE format = 'observations' AND RH IS NULL",
+    )
+    assert obs["n"][0] > 0
+
+    values = query(connection, "SELECT RH FROM levels WHERE RH IS NULL OR RH > 0")
+    assert values["RH"].dtype == float
+    assert np.isnan(values["RH"]).any()
+
+    # Only NULL values, type from the declared column type
+    values = query(connection, "SELECT RH FROM levels WHERE RH IS NULL")
+    assert values["RH"].dtype == float
+    assert np.isnan(values["RH"]).all()
+
+    values = query(
+        connection, "SELECT P_SRC, CAPE FROM soundings WHERE format = 'derived'"
+    )
+    assert values["P_SRC"].dtype == object
+    assert all(value is None for value in values["P_SRC"])
+    assert values["CAPE"].dtype == float
+
+
+def test_skip_stored(connection, info, der):
+    """Inserting the same soundings again does nothing"""
+    assert insert(connection, Derived(info.der_multi.path)) == 0
+    assert insert(connection, der.take([0])) == 0
+    total = query(connection, "SELECT COUNT(*) AS n FROM soundings")
+    assert total["n"][0] == len(der) + 5
+
+
+def test_indexes(connection):
+    """Station, time and pressure are indexed"""
+    plan = query(
+        connection,
+        "EXPLAIN QUERY PLAN SELECT * FROM levels WHERE PRESS = 50000",
+    )
+    assert any("levels_press" in detail for detail in plan["detail"])
+
+    indexes = query(connection, "SELECT name FROM sqlite_master WHERE type = 'index'")
+    assert {"soundings_station_time", "soundings_time"} <= set(indexes["name"])
+
+
+def test_cape_and_temperature(connection):
+    """Header and level conditions in one query"""
+    result = query(
+        connection,
+        "SELECT DISTINCT station, time FROM soundings JOIN levels USING (sounding_id) "
+        "WHERE format = 'derived' AND CAPE IS NULL AND PRESS = 50000 AND TEMP < 255",
+    )
+    np.testing.assert_array_equal(result["time"], ["2020-05-26 00:00"])
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from pyigra2 import diagnostics
+from pyigra2.derived import Derived
+from pyigra2.observations import Observations
+from pyigra2.table import SoundingTable
+
+
+@pytest.fixture(scope="module")
+def der(info):
+    """der_multi as SoundingTable"""
+    der = Derived(info.der_multi.path)
+    der.read()
+    der.convert_to_numpy()
+    yield SoundingTable.from_reader(der)
+
+
+@pytest.fixture(scope="module")
+def obs(info):
+    """Converted obs_multi"""
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield obs
+
+
+def test_derived_headers(der):
+    """Freezing level, inversion and mixed layer as computed by NCEI"""
+    result = diagnostics.diagnostics(der)
+
+    np.testing.assert_allclose(result["FRZPRESS"], der.header["FRZPRESS"], rtol=1e-3)
+    np.testing.assert_allclose(result["FRZHGT"], der.header["FRZHGT"], atol=10)
+    np.testing.assert_array_equal(result["INVPRESS"], der.header["INVPRESS"])
+    np.testing.assert_array_equal(result["INVHGT"], der.header["INVHGT"])
+    np.testing.assert_allclose(result["INVTEMPDIF"], der.header["INVTEMPDIF"])
+
+    # No mixed layer in the test data
+    assert np.isnan(der.header["MIXHGT"]).all()
+    assert np.isnan(result["MIXPRESS"]).all()
+    assert np.isnan(result["MIXHGT"]).all()
+
+
+def test_hypsometric(der):
+    """Heights integrated from pressure and temperature are close to CALCGPH"""
+    parameters = {
+        name: values for name, values in der.parameters.items() if "GPH" not in name
+    }
+    table = SoundingTable(
+        der.keys, der.header, parameters, der.offsets, der.times, der.hour_missing
+    )
+
+    press, height = diagnostics.freezing_level(table)
+    np.testing.assert_allclose(press, der.header["FRZPRESS"], rtol=1e-3)
+    np.testing.assert_allclose(height, der.header["FRZHGT"], atol=20)
+
+
+def test_tropopause(obs):
+    """The first level flagged as tropopause (LVLTYP2 == 2)"""
+    table = SoundingTable.from_reader(obs)
+    sounding = table.sounding_index()
+    flagged = table.parameters["LVLTYP2"] == 2
+    _, first = np.unique(sounding[flagged], return_index=True)
+
+    press, height, temp = diagnostics.tropopause(obs)
+    np.testing.assert_array_equal(press, table.parameters["PRESS"][flagged][first])
+    np.testing.assert_array_equal(temp, table.parameters["TEMP"][flagged][first])
+    assert (height > 7000).all() and (height < 9000).all()
+
+
+def test_surface_below_freezing(der):
+    """No freezing level, the inversion is relative to the surface"""
+    parameters = dict(der.parameters)
+    parameters["TEMP"] = parameters["TEMP"] - 30
+
+    table = SoundingTable(
+        der.keys, der.header, parameters, der.offsets, der.times, der.hour_missing
+    )
+    press, height = diagnostics.freezing_level(table)
+    assert np.isnan(press).all() and np.isnan(height).all()
+
+    _, _, difference = diagnostics.inversion(table)
+    np.testing.assert_allclose(difference, der.header["INVTEMPDIF"])
+
+
+def test_mixing_height(der):
+    """Parcel method on a well-mixed layer of constant potential temperature"""
+    press = np.array([100000.0, 95000.0, 90000.0, 85000.0, 80000.0])
+    theta = np.array([300.0, 299.9, 299.9, 302.0, 304.0])
+    temp = theta * (press / 100000.0) ** diagnostics.KAPPA
+
+    # Second sounding warmer in potential temperature at the first level above the surface
+    pair = der.take([0, 1])
+    table = SoundingTable(
+        pair.keys,
+        pair.header,
+        {
+            "PRESS": np.concatenate([press, press]),
+            "TEMP": np.concatenate([temp, temp + [0, 5, 5, 5, 5]]),
+        },
+        np.array([0, 5, 10]),
+        pair.times,
+        pair.hour_missing,
+    )
+    top, height = diagnostics.mixing_height(table)
+    assert 85000 < top[0] < 90000
+    assert 0 < height[0] < diagnostics.RD / diagnostics.G * 290 * np.log(100000 / 85000)
+    assert np.isnan(top[1]) and np.isnan(height[1])
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.table import SoundingTable
+from pyigra2.duplicates import (
+    file_duplicates,
+    find_duplicates,
+    merge_duplicates,
+    sounding_hashes,
+)
+
+
+@pytest.fixture(scope="module")
+def table(info):
+    """Converted obs_multi, 2018-01-02 99_0 and 99_1 are the same release"""
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield SoundingTable.from_reader(obs)
+
+
+def test_exact_duplicates(info, table):
+    """Repeated release in the test file is found"""
+    labels = find_duplicates(table)
+    idx = {key: i for i, key in enumerate(table.keys)}
+    first = idx[("2018-01-02", "99_0")]
+
+    assert labels[idx[("2018-01-02", "99_1")]] == first
+    assert (labels == np.arange(len(table))).sum() == len(table) - 1
+
+    # Raw tables (str columns) give the same groups
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    raw_labels = find_duplicates(SoundingTable.from_reader(obs, "raw"))
+    np.testing.assert_array_equal(raw_labels, labels)
+
+    merged = merge_duplicates(table)
+    assert len(merged) == len(table) - 1
+    assert ("2018-01-02", "99_1") not in merged.keys
+
+
+def test_hashes(table):
+    """Hashes are equal for equal soundings only"""
+    doubled = SoundingTable.concatenate([table, table])
+    hashes = sounding_hashes(doubled)
+    np.testing.assert_array_equal(hashes[: len(table)], hashes[len(table) :])
+
+    # 99 soundings are copies of the 00 soundings of the same date, times differ
+    idx = {key: i for i, key in enumerate(table.keys)}
+    assert hashes[idx[("2018-01-01", "00")]] == hashes[idx[("2018-01-01", "99_0")]]
+    assert hashes[idx[("2018-01-01", "00")]] != hashes[idx[("2018-01-02", "00")]]
+
+    # Level order matters
+    first = table.take([0])
+    reversed_table = SoundingTable(
+        first.keys,
+        first.header,
+        {name: values[::-1] for name, values in first.parameters.items()},
+        first.offsets,
+        first.times,
+        first.hour_missing,
+    )
+    assert sounding_hashes(first)[0] != sounding_hashes(reversed_table)[0]
+
+    with pytest.raises(KeyError):
+        sounding_hashes(table, parameters=["NOT_A_PARAMETER"])
+
+
+def test_near_duplicates(table):
+    """Rounded values and time tolerance find near duplicates"""
+    copy = table.take(np.arange(len(table)))
+    copy.parameters["TEMP"] = copy.parameters["TEMP"] + 0.01
+    copy.times = copy.times + np.timedelta64(30, "m")
+    both = SoundingTable.concatenate([table, copy])
+    num_unique = len(table) - 1
+
+    # Exact: nothing new
+    labels = find_duplicates(both)
+    assert (labels == np.arange(len(both))).sum() == 2 * num_unique
+
+    labels = find_duplicates(both, decimals=0, time_tolerance=60)
+    assert (labels == np.arange(len(both))).sum() == num_unique
+
+    # Outside the time tolerance
+    labels = find_duplicates(both, decimals=0, time_tolerance=10)
+    assert (labels == np.arange(len(both))).sum() == 2 * num_unique
+
+
+def test_merge_policies(table):
+    """first, last and most_levels keep the expected soundings"""
+    idx = {key: i for i, key in enumerate(table.keys)}
+
+    # Copy of the 2018-01-02 99_1 sounding with one level less
+    short = table.take([idx[("2018-01-02", "99_1")]])
+    short.parameters = {name: values[:-1] for name, values in short.parameters.items()}
+    short.offsets = short.offsets.copy()
+    short.offsets[-1] -= 1
+    both = SoundingTable.concatenate([table, short])
+
+    # Levels differ, only the time matches
+    assert len(merge_duplicates(both)) == len(table)
+    kwargs = dict(parameters=[])
+    assert len(merge_duplicates(both, **kwargs)) == len(table) - 1
+
+    last = merge_duplicates(both, policy="last", **kwargs)
+    assert last.num_levels[-1] == short.num_levels[0]
+
+    most = merge_duplicates(both, policy="most_levels", **kwargs)
+    assert most.keys == merge_duplicates(table).keys
+    np.testing.assert_array_equal(most.num_levels, merge_duplicates(table).num_levels)
+
+    with pytest.raises(ValueError):
+        merge_duplicates(table, policy="random")
+
+
+def test_repeated_header(tmp_path, info):
+    """A sounding repeated under the same (date, hour) header is found in the file"""
+    text = info.obs_multi.path.read_text()
+    first = "#" + text.split("#")[1]
+    path = tmp_path / "repeated.txt"
+    path.write_text(text + first)
+
+    # The reader keeps one sounding per key
+    obs = Observations(path)
+    obs.read()
+    assert len(SoundingTable.from_reader(obs, "raw")) == 5
+
+    table, labels = file_duplicates(path)
+    assert len(table) == 6
+    assert table.keys[0] == table.keys[-1] == ("2018-01-01", "00")
+    assert labels[-1] == 0
+    assert (labels == np.arange(len(table))).sum() == 4
+
+    raw_table, raw_labels = file_duplicates(path, convert=False)
+    np.testing.assert_array_equal(raw_labels, labels)
+    assert len(merge_duplicates(table)) == 4
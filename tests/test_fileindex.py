@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from pyigra2.derived import Derived
+from pyigra2.fileindex import FileIndex
+from pyigra2.observations import Observations
+from pyigra2.table import SoundingTable
+
+
+@pytest.fixture
+def copy(tmp_path, info):
+    """Copy of obs_multi, the index cache is written next to it"""
+    path = tmp_path / info.obs_multi.path.name
+    path.write_bytes(info.obs_multi.path.read_bytes())
+    yield path
+
+
+@pytest.mark.parametrize(
+    "case, reader", [("obs_multi", Observations), ("der_multi", Derived)]
+)
+def test_index(info, case, reader):
+    """Keys, times and offsets agree with a full read"""
+    path = getattr(info, case).path
+    data = reader(path)
+    data.read()
+    data.convert_to_numpy()
+    table = SoundingTable.from_reader(data)
+
+    index = FileIndex.from_file(path, cache=False)
+    assert len(index) == len(table)
+    assert index.keys == table.keys
+    np.testing.assert_array_equal(index.times, table.times)
+    np.testing.assert_array_equal(index.num_levels, table.num_levels)
+
+    with open(path, "rb") as f:
+        content = f.read()
+    assert all(content[offset] == ord("#") for offset in index.offsets[:-1])
+    assert index.offsets[-1] == len(content)
+
+
+def test_read_range(info):
+    """Only the requested soundings are parsed, line numbers are kept"""
+    index = FileIndex.from_file(info.obs_multi.path, cache=False)
+    np.testing.assert_array_equal(index.lines, [1, 56, 111, 168, 225])
+
+    full = Observations(info.obs_multi.path)
+    full.read()
+    full.convert_to_numpy()
+    expected = SoundingTable.from_reader(full).take([2, 3])
+
+    table = index.table(2, 4)
+    assert len(table) == 2
+    np.testing.assert_array_equal(table.times, expected.times)
+    np.testing.assert_array_equal(table.parameters["TEMP"], expected.parameters["TEMP"])
+
+    reader = index.read(2, 3, convert=False)
+    assert reader._header_lines == {("2018-01-02", "00"): 111}
+    assert len(index.table(4, 10)) == 1
+    assert len(index.table(3, 3)) == 0
+
+
+def test_cache(copy):
+    """The index is reused until the file changes"""
+    cache_path = copy.with_name(copy.name + ".idx.npz")
+    FileIndex.from_file(copy)
+    assert not cache_path.exists()
+
+    index = FileIndex.from_file(copy, cache=True)
+    assert cache_path.exists()
+
+    cached = FileIndex.from_file(copy, cache=True)
+    assert cached.keys == index.keys
+    np.testing.assert_array_equal(cached.offsets, index.offsets)
+
+    # Time index over file positions
+    positions = cached.time_index().slice("2018-01-02")
+    assert sorted(positions) == [2, 3, 4]
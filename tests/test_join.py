@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from pyigra2.derived import Derived
+from pyigra2.join import join_soundings
+from pyigra2.observations import Observations
+from pyigra2.table import SoundingTable
+
+
+@pytest.fixture(scope="module")
+def der(info):
+    """Converted der_multi"""
+    der = Derived(info.der_multi.path)
+    der.read()
+    der.convert_to_numpy()
+    yield der
+
+
+@pytest.fixture
+def obs(tmp_path, info):
+    """obs_multi moved to the dates of der_multi"""
+    text = info.obs_multi.path.read_text()
+    text = text.replace("2018 01 01", "2020 05 26").replace("2018 01 02", "2020 05 27")
+    path = tmp_path / "obs.txt"
+    path.write_text(text)
+
+    obs = Observations(path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield obs
+
+
+def test_join(obs, der):
+    """Matched on key, levels on the union of the pressures"""
+    joined = join_soundings(obs, der)
+
+    assert joined.unmatched_observations == [("2020-05-26", "99_0")]
+    assert joined.unmatched_derived == []
+
+    table = joined.table
+    assert table.keys == [
+        ("2020-05-26", "00"),
+        ("2020-05-27", "00"),
+        ("2020-05-27", "99_0"),
+        ("2020-05-27", "99_1"),
+    ]
+    assert "TEMP_DRVD" in table.parameters
+    assert "CALCGPH" in table.parameters
+    assert "CAPE" in table.header
+
+    # Pressure decreases within every sounding
+    for idx in range(len(table)):
+        press = table.sounding(idx)["parameters"]["PRESS"]
+        assert np.all(np.diff(press) < 0)
+
+    # Every observed and derived pressure level of the first pair is there
+    obs_table = SoundingTable.from_reader(obs)
+    der_table = SoundingTable.from_reader(der)
+    first = table.sounding(0)["parameters"]
+    obs_first = obs_table.sounding(0)["parameters"]
+    der_first = der_table.sounding(0)["parameters"]
+    obs_press = obs_first["PRESS"][np.isfinite(obs_first["PRESS"])]
+    expected = np.union1d(obs_press, der_first["PRESS"])[::-1]
+    np.testing.assert_array_equal(first["PRESS"], expected)
+
+    # Values follow their level
+    level = np.flatnonzero(first["PRESS"] == 50000)[0]
+    obs_level = np.flatnonzero(obs_first["PRESS"] == 50000)[-1]
+    der_level = np.flatnonzero(der_first["PRESS"] == 50000)[-1]
+    assert first["TEMP"][level] == obs_first["TEMP"][obs_level]
+    assert first["TEMP_DRVD"][level] == der_first["TEMP"][der_level]
+    assert first["PFLAG"].dtype.kind == "U"
+
+
+def test_no_match(info, der):
+    """Different dates, nothing to join"""
+    obs = Observations(info.obs_singel.path)
+    obs.read()
+    obs.convert_to_numpy()
+    joined = join_soundings(obs, der)
+    assert len(joined.table) == 0
+    assert len(joined.unmatched_observations) == 1
+    assert joined.unmatched_derived == SoundingTable.from_reader(der).keys
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.table import SoundingTable
+from pyigra2.kinematics import (
+    EARTH_RADIUS,
+    ascent_rate,
+    drift,
+    drift_positions,
+    elapsed_seconds,
+)
+
+
+@pytest.fixture
+def table():
+    """Two soundings at 0 N 0 E: 5 m/s ascent in a 10 m/s west wind and one with gaps"""
+    header = {
+        "ID": np.array(["ZZV0000DBLK", "ZZV0000DBLK"]),
+        "YEAR": np.array(["2020", "2020"]),
+        "MONTH": np.array(["01", "01"]),
+        "DAY": np.array(["01", "01"]),
+        "HOUR": np.array(["00", "12"]),
+        "RELTIME": np.array(["0000", "1200"]),
+        "LAT": np.array([0.0, 600000.0]),
+        "LON": np.array([0.0, 0.0]),
+    }
+    parameters = {
+        # 0 s, 100 s, 200 s, 300 s | 0 s, missing, 1 min 40 s
+        "ETIME": np.array([0, 140, 320, 500, 0, np.nan, 140]),
+        "GPH": np.array([0, 500, 1000, 1500, 100, 300, 600]),
+        "WDIR": np.radians([270, 270, 270, 270, 180, 180, 180]),
+        "WSPD": np.array([10, 10, 10, 10, 4, 4, np.nan]),
+    }
+    yield SoundingTable(
+        [("2020-01-01", "00"), ("2020-01-01", "12")], header, parameters, [0, 4, 7]
+    )
+
+
+def test_elapsed_seconds():
+    """MMMSS to seconds, raw and converted"""
+    np.testing.assert_array_equal(
+        elapsed_seconds([0, 59, 100, 12345, np.nan]), [0, 59, 60, 7425, np.nan]
+    )
+    np.testing.assert_array_equal(
+        elapsed_seconds([" 1530", "-9999", "-8888"]), [930, np.nan, np.nan]
+    )
+
+
+def test_ascent_rate(table):
+    """Rate at the upper level of each interval, gaps skipped"""
+    np.testing.assert_allclose(
+        ascent_rate(table), [np.nan, 5, 5, 5, np.nan, np.nan, 5], equal_nan=True
+    )
+
+
+def test_drift(table):
+    """Wind from the west moves the balloon east, a south wind north"""
+    east, north = drift(table)
+    np.testing.assert_allclose(east[:4], [0, 1000, 2000, 3000], atol=1e-9)
+    np.testing.assert_allclose(north[:4], 0, atol=1e-9)
+
+    # Second sounding: only the first level has ETIME and wind
+    np.testing.assert_allclose(east[4:], [0, np.nan, np.nan], atol=1e-9)
+    np.testing.assert_allclose(north[4:], [0, np.nan, np.nan], atol=1e-9)
+
+    lat, lon = drift_positions(table)
+    np.testing.assert_allclose(lat[:4], 0, atol=1e-12)
+    np.testing.assert_allclose(lon[3], np.degrees(3000 / EARTH_RADIUS))
+    assert lat[4] == pytest.approx(60)
+
+
+@pytest.fixture
+def raw_file(tmp_path, info):
+    """Observation file with a 5 m/s ascent in a 10 m/s west wind, GPH of level 3 missing"""
+    with open(info.obs_singel.path) as f:
+        header = f.readline().rstrip("\n")
+    header = header[:32] + f"{4:>4}" + header[36:]
+
+    levels = [(0, 100), (140, 600), (320, -9999), (500, 1600)]
+    # LVLTYP, ETIME, PRESS, GPH, TEMP, RH, DPDP, WDIR, WSPD, blank flags
+    lines = [
+        f"21 {etime:>5} {50000:>6} {gph:>5} {-100:>5} {-9999:>5} {-9999:>5} "
+        f"{270:>5} {100:>5}"
+        for etime, gph in levels
+    ]
+    path = tmp_path / "raw.txt"
+    path.write_text("\n".join([header] + lines) + "\n")
+    yield path
+
+
+def test_raw_source(raw_file):
+    """Raw text is converted as convert_to_numpy(): missing values and units"""
+    raw = Observations(raw_file)
+    raw.read()
+
+    np.testing.assert_allclose(
+        ascent_rate(raw, source="raw"), [np.nan, 5, np.nan, 5], equal_nan=True
+    )
+
+    east, north = drift(raw, source="raw")
+    np.testing.assert_allclose(east, [0, 1000, 2000, 3000], atol=1e-9)
+    np.testing.assert_allclose(north, 0, atol=1e-9)
+
+    raw.convert_to_numpy()
+    lat, lon = drift_positions(raw, source="raw")
+    np.testing.assert_allclose((lat, lon), drift_positions(raw), atol=1e-12)
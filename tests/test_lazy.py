@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.derived import Derived
+from pyigra2.lazy import LazyConvertedData
+
+
+def assert_soundings_equal(sounding, expected):
+    """Equal header and parameters"""
+    assert sounding["header"] == expected["header"]
+    assert list(sounding["parameters"]) == list(expected["parameters"])
+    for name, values in expected["parameters"].items():
+        np.testing.assert_array_equal(sounding["parameters"][name], values)
+
+
+@pytest.mark.parametrize(
+    "cls, case", [(Observations, "obs_multi"), (Derived, "der_multi")]
+)
+def test_lazy_equals_eager(info, cls, case):
+    """Lazy conversion gives the same soundings as convert_to_numpy()"""
+    path = getattr(info, case).path
+    eager = cls(path)
+    eager.read()
+    eager.convert_to_numpy()
+
+    lazy = cls(path)
+    lazy.read()
+    lazy.convert_to_numpy(lazy=True)
+    assert isinstance(lazy.converted_data, LazyConvertedData)
+
+    # Nothing converted before access
+    assert lazy.converted_data.cache_info().currsize == 0
+
+    assert list(lazy.converted_data) == list(eager.converted_data)
+    for date, hours in eager.converted_data.items():
+        assert list(lazy.converted_data[date]) == list(hours)
+        for hour, expected in hours.items():
+            assert_soundings_equal(lazy.converted_data[date][hour], expected)
+
+    # Works where converted_data is used
+    assert lazy.render(fmt="csv") == eager.render(fmt="csv")
+
+
+def test_lru_cache(info):
+    """Least recently used soundings are dropped"""
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy(lazy=True, cache_size=1)
+    data = obs.converted_data
+
+    first = data["2018-01-01"]["00"]
+    assert data["2018-01-01"]["00"] is first
+    assert data.cache_info() == (1, 1, 1, 1)
+
+    data["2018-01-02"]["99_0"]
+    assert data.cache_info() == (1, 2, 1, 1)
+
+    # Converted again after eviction
+    assert data["2018-01-01"]["00"] is not first
+    assert data.cache_info().misses == 3
+
+    data.cache_clear()
+    assert data.cache_info() == (0, 0, 1, 0)
+
+    with pytest.raises(ValueError):
+        LazyConvertedData(obs, cache_size=0)
+
+
+def test_missing_keys(info):
+    """Unknown dates and hours raise KeyError"""
+    obs = Observations(info.obs_singel.path)
+    obs.read()
+    obs.convert_to_numpy(lazy=True)
+
+    assert "2018-01-01" in obs.converted_data
+    assert "2000-01-01" not in obs.converted_data
+    with pytest.raises(KeyError):
+        obs.converted_data["2000-01-01"]
+    with pytest.raises(KeyError):
+        obs.converted_data["2018-01-01"]["12"]
+
+    # Eager conversion replaces the lazy mapping
+    obs.convert_to_numpy()
+    assert isinstance(obs.converted_data, dict)
+    assert obs.converted_data["2018-01-01"]["00"]["parameters"]
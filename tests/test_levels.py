@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from pyigra2.derived import Derived
+from pyigra2.levels import LevelIndex, level_series
+from pyigra2.observations import Observations
+from pyigra2.table import SoundingTable
+
+
+@pytest.fixture(scope="module")
+def obs(info):
+    """Converted obs_multi"""
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield obs
+
+
+def test_exact(obs):
+    """Same values as the standard level matrix"""
+    table = SoundingTable.from_reader(obs)
+    times, values = obs.level_series("TEMP", 50000)
+
+    column = table.level_matrix("TEMP", [50000])[:, 0]
+    order = np.argsort(table.times, kind="stable")
+    np.testing.assert_array_equal(times, table.times[order])
+    np.testing.assert_array_equal(values, column[order])
+    assert np.isfinite(values).all()
+
+    # Not a reported level
+    _, values = obs.level_series("TEMP", 50001)
+    assert np.isnan(values).all()
+
+
+def test_rows_cached(obs):
+    """The level index is kept by the reader"""
+    obs.level_series("TEMP", 50000)
+    index = obs._level_indexes["PRESS"]
+    obs.level_series("GPH", 50000)
+    assert obs._level_indexes["PRESS"] is index
+    assert 50000.0 in index._rows
+
+
+def test_interpolate(obs):
+    """Interpolation in ln(p) between levels, exact levels unchanged"""
+    table = SoundingTable.from_reader(obs)
+    _, exact = obs.level_series("TEMP", 50000, interpolate=True)
+    _, matched = obs.level_series("TEMP", 50000)
+    np.testing.assert_allclose(exact, matched)
+
+    # Between two reported levels of the first sounding
+    sounding = table.sounding(0)["parameters"]
+    press = sounding["PRESS"]
+    valid = np.isfinite(press) & np.isfinite(sounding["TEMP"])
+    p = press[valid]
+    t = sounding["TEMP"][valid]
+    order = np.argsort(p)
+    target = 0.5 * (p[order][3] + p[order][4])
+    expected = np.interp(np.log(target), np.log(p[order]), t[order])
+
+    index = LevelIndex(table)
+    assert index.interpolate(table.parameters["TEMP"], target)[0] == pytest.approx(
+        expected
+    )
+
+    # Above the top of all soundings
+    assert np.isnan(index.interpolate(table.parameters["TEMP"], 1)).all()
+
+
+def test_height(info):
+    """Derived data on a height coordinate"""
+    der = Derived(info.der_multi.path)
+    der.read()
+    der.convert_to_numpy()
+    times, values = level_series(
+        der, "TEMP", 5000.0, coordinate="CALCGPH", interpolate=True
+    )
+    assert len(times) == 4
+    assert np.isfinite(values).all()
+    assert 230 < values[0] < 270
@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pytest
+from pyigra2.merge import merge_por_y2d
+from pyigra2.observations import Observations
+from pyigra2.store import Store
+from pyigra2.table import SoundingTable
+
+
+@pytest.fixture
+def files(tmp_path, info):
+    """obs_multi split in a por file (soundings 1-3) and a y2d file (soundings 3-5)"""
+    with open(info.obs_multi.path, "r") as f:
+        lines = f.readlines()
+
+    por = tmp_path / "SWM00002527-data-por.txt"
+    y2d = tmp_path / "SWM00002527-data-y2d.txt"
+    por.write_text("".join(lines[:167]))
+    y2d.write_text("".join(lines[110:]))
+    yield por, y2d
+
+
+@pytest.fixture(scope="module")
+def table(info):
+    """Table of the complete obs_multi file"""
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield SoundingTable.from_reader(obs)
+
+
+def test_merge(tmp_path, files, table, monkeypatch):
+    """Overlap is taken from y2d, the por file is converted once"""
+    por, y2d = files
+    cache = tmp_path / "cache"
+
+    # y2d with a changed source of the overlapping sounding, and only two soundings
+    lines = y2d.read_text().splitlines(keepends=True)
+    lines[0] = lines[0].replace("ncdc-gts", "ncdc-y2d")
+    y2d.write_text("".join(lines[:114]))
+
+    merged = merge_por_y2d(por, y2d, cache)
+    np.testing.assert_array_equal(merged.times, table.times[:4])
+    np.testing.assert_array_equal(
+        merged.header["P_SRC"], [b"ncdc-gts", b"ncdc-gts", b"ncdc-y2d", b"ncdc-gts"]
+    )
+    np.testing.assert_array_equal(merged.offsets, table.offsets[:5])
+
+    # Updated y2d: only the y2d file is parsed
+    y2d.write_text("".join(lines))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("por file converted again")
+
+    with monkeypatch.context() as m:
+        m.setattr(Store, "write", fail)
+        merged = merge_por_y2d(por, y2d, cache)
+    assert merged.keys == table.keys
+    np.testing.assert_array_equal(merged.times, table.times)
+    np.testing.assert_array_equal(merged.parameters["TEMP"], table.parameters["TEMP"])
+    assert merged.header["P_SRC"][2] == b"ncdc-y2d"
+
+    # Changed por file: rebuilt
+    os.utime(por, ns=(0, 0))
+    merged = merge_por_y2d(por, y2d, cache)
+    assert merged.keys == table.keys
+
+
+def test_merge_station_mismatch(tmp_path, files):
+    """por and y2d of different stations"""
+    por, y2d = files
+    y2d.write_text(y2d.read_text().replace("SWM00002527", "SWM00002528"))
+    with pytest.raises(ValueError):
+        merge_por_y2d(por, y2d, tmp_path / "cache")
+
+
+def test_truncate(tmp_path, table):
+    """Soundings at and after start are removed"""
+    store = Store(tmp_path / "store")
+    store.write(table)
+    assert store.truncate("SWM00002527", "2018-01-02") == 3
+    assert store.truncate("SWM00002527", "2018-01-02") == 0
+
+    stored = store.open("SWM00002527")
+    assert stored.keys == table.keys[:2]
+    size = os.path.getsize(
+        tmp_path / "store" / "SWM00002527" / "parameters" / "TEMP.bin"
+    )
+    assert size == table.offsets[2] * table.parameters["TEMP"].itemsize
+
+    assert store.append(table) == 3
+    assert store.open("SWM00002527").keys == table.keys
@@ -0,0 +1,94 @@
+import pathlib
+
+import numpy as np
+import pytest
+from pyigra2.base import IGRABase
+from pyigra2.monthly import MonthlyMeans
+
+MONTHLY_PATH = pathlib.Path(__file__).parent.resolve() / "data" / "temp_00z-mly.txt"
+
+
+@pytest.fixture(scope="module")
+def means():
+    """Converted monthly mean temperatures of three stations"""
+    means = MonthlyMeans(MONTHLY_PATH)
+    means.read()
+    means.convert_to_numpy()
+    yield means
+
+
+def test_read():
+    """Every line is one value in the raw columns"""
+    means = MonthlyMeans(MONTHLY_PATH)
+    means.read()
+    assert set(means.raw_data) == {
+        "ID",
+        "YEAR",
+        "MONTH",
+        "HOUR",
+        "PRESS",
+        "VALUE",
+        "NUMOBS",
+    }
+    assert len(means.raw_data["ID"]) == 23
+    assert means.raw_data["VALUE"][0] == b"  -152"
+
+    # Not a sounding reader, no inherited sounding methods that fail on raw_data
+    assert not isinstance(means, IGRABase)
+    assert not hasattr(means, "iter_chunks")
+
+
+def test_convert(means):
+    """Dense (station, month, level) arrays with an index per dimension"""
+    assert means.variable == "temp"
+    assert means.hour == "00"
+    np.testing.assert_array_equal(
+        means.stations, ["SWM00002185", "SWM00002527", "USM00072201"]
+    )
+    np.testing.assert_array_equal(
+        means.months, np.array(["2018-01", "2018-02", "2018-03"], dtype="datetime64[M]")
+    )
+    np.testing.assert_array_equal(means.levels, [100000, 92500, 85000, 50000])
+    assert means.values.shape == (3, 3, 4)
+
+    # deg C * 10 -> K
+    station = means.station("SWM00002527")
+    assert station[0, 0] == pytest.approx(274.35)
+    assert station[2, 2] == pytest.approx(268.35)
+
+    # Missing month, missing value (-9999) and level not reported
+    assert np.isnan(station[1]).all()
+    assert np.isnan(station[2, 0])
+    assert np.isnan(station[:, 1]).all()
+    assert means.counts[means.index("SWM00002527"), 2, 0] == 0
+    assert means.counts[means.index("USM00072201"), 1, 1] == 28
+
+    assert np.isfinite(means.values).sum() == 22
+
+    with pytest.raises(KeyError):
+        means.index("SWM00002528")
+
+
+def test_variable(tmp_path):
+    """Variable from the file name or given"""
+    with pytest.raises(ValueError):
+        MonthlyMeans(tmp_path / "unknown.txt")
+
+    means = MonthlyMeans(tmp_path / "unknown.txt", variable="uwnd")
+    assert means.variable == "uwnd"
+
+    with pytest.raises(FileNotFoundError):
+        means.read()
+
+
+def test_several_hours(tmp_path):
+    """A file holds one nominal hour"""
+    lines = MONTHLY_PATH.read_text().splitlines()
+    lines[-1] = lines[-1][:20] + "12" + lines[-1][22:]
+    path = tmp_path / "temp_00z-mly.txt"
+    path.write_text("\n".join(lines))
+
+    means = MonthlyMeans(path)
+    means.read()
+    with pytest.raises(ValueError):
+        means.convert_to_numpy()
@@ -308,3 +308,29 @@ def test_raw_vs_converted_multi(obs_read_multi, obs_read_convert_multi):
                 assert len(values) == len(
                     converted[date][hour]["parameters"][parameter]
                 )
+
+
+def test_iter_chunks_multi(obs_read_convert_multi, info):
+    """Chunked reading gives the same soundings as read() and never splits a date"""
+    chunks = list(Observations(info.obs_multi.path).iter_chunks(chunk_size=1))
+
+    # One chunk per date
+    assert len(chunks) == len(info.obs_multi.dates)
+
+    for chunk in chunks:
+        for date, hours in chunk.converted_data.items():
+            assert list(hours) == list(obs_read_convert_multi.converted_data[date])
+            for hour, head_param in hours.items():
+                expected = obs_read_convert_multi.converted_data[date][hour]
+                assert head_param["header"] == expected["header"]
+                assert len(head_param["parameters"]["PRESS"]) == len(
+                    expected["parameters"]["PRESS"]
+                )
+
+
+def test_iter_chunks_file_not_found():
+    """Test if file is not found"""
+    obs = Observations("FileNotFound.txt")
+
+    with pytest.raises(FileNotFoundError):
+        list(obs.iter_chunks())
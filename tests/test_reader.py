@@ -0,0 +1,67 @@
+import pytest
+import pyigra2
+from pyigra2.derived import Derived
+from pyigra2.observations import Observations
+from pyigra2.reader import detect_format, open_igra2
+
+
+def test_detect_format(info):
+    """All test files are detected"""
+    assert detect_format(info.obs_singel.path) == "observations"
+    assert detect_format(info.obs_multi.path) == "observations"
+    assert detect_format(info.der_singel.path) == "derived"
+    assert detect_format(info.der_multi.path) == "derived"
+
+
+def test_detect_stripped_lines(tmp_path, info):
+    """Trailing blanks stripped from data lines"""
+    path = tmp_path / "stripped.txt"
+    lines = info.obs_singel.path.read_text().splitlines()
+    path.write_text("\n".join(line.rstrip() for line in lines) + "\n")
+    assert detect_format(path) == "observations"
+
+
+def test_detect_only_header(tmp_path, info):
+    """Sounding without levels"""
+    path = tmp_path / "header.txt"
+    header = info.der_singel.path.read_text().splitlines()[0]
+    path.write_text(header + "\n" + header + "\n")
+    assert detect_format(path) == "derived"
+
+
+def test_detect_short_first_sounding(tmp_path, info):
+    """First sounding of unknown layout without levels, the next one is sniffed"""
+    path = tmp_path / "short.txt"
+    text = info.obs_singel.path.read_text()
+    path.write_text(text.splitlines()[0][:40] + "\n" + text)
+    assert detect_format(path) == "observations"
+
+
+def test_detect_errors(tmp_path, info):
+    """Unknown and inconsistent layouts"""
+    with pytest.raises(FileNotFoundError):
+        detect_format(tmp_path / "FileNotFound.txt")
+
+    path = tmp_path / "no_header.txt"
+    path.write_text("not an igra2 file\n")
+    with pytest.raises(ValueError):
+        detect_format(path)
+
+    # Observation header with derived data
+    obs_header = info.obs_singel.path.read_text().splitlines()[0]
+    der_data = info.der_singel.path.read_text().splitlines()[1]
+    path = tmp_path / "mixed.txt"
+    path.write_text(obs_header + "\n" + der_data + "\n")
+    with pytest.raises(ValueError):
+        detect_format(path)
+
+
+def test_open_igra2(info):
+    """The factory returns the right reader"""
+    obs = open_igra2(info.obs_multi.path)
+    assert isinstance(obs, Observations)
+    assert obs.raw_data == {}
+
+    der = pyigra2.open_igra2(info.der_multi.path, convert=True)
+    assert isinstance(der, Derived)
+    assert set(der.converted_data) == set(info.der_multi.dates)
@@ -0,0 +1,86 @@
+import io
+import numpy as np
+import pytest
+from pyigra2 import render
+from pyigra2.observations import Observations
+from pyigra2.derived import Derived
+
+
+@pytest.fixture(scope="module")
+def obs(info):
+    """Read and converted multi observation file"""
+    # Setup
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield obs
+    # Teardown
+
+
+def test_format_column():
+    """Vectorized column formatting"""
+    assert render.format_column(np.array([1.234, np.nan])).tolist() == ["1.23", "nan"]
+    assert render.format_column(np.array([1, 2])).tolist() == ["1", "2"]
+    assert render.format_column(np.array([b"A", b""])).tolist() == ["A", ""]
+
+
+def test_render_text_equals_print(obs, capsys):
+    """Printing one sounding equals rendering it"""
+    key = ("2018-01-02", "99_1")
+    obs.print(*key)
+    printed = capsys.readouterr().out
+    assert printed == obs.render([key])
+    assert "Station: SWM00002527" in printed
+
+
+def test_render_all_text(obs):
+    """All soundings in one call"""
+    out = obs.render(source="raw")
+    assert out.count("Station: SWM00002527") == 5
+    assert "WSPD: [m/s * 10]" in out
+
+
+def test_render_csv(obs):
+    """CSV has one row per level"""
+    out = obs.render(fmt="csv")
+    lines = out.splitlines()
+    assert lines[0].startswith("DATE,HOUR,LVLTYP1,LVLTYP2,ETIME,PRESS")
+    num_levels = sum(
+        len(head_param["parameters"]["PRESS"])
+        for hours in obs.converted_data.values()
+        for head_param in hours.values()
+    )
+    assert len(lines) == num_levels + 1
+    assert lines[1].split(",")[:2] == ["2018-01-01", "00"]
+    assert (
+        float(lines[1].split(",")[5])
+        == obs.converted_data["2018-01-01"]["00"]["parameters"]["PRESS"][0]
+    )
+
+
+def test_render_fixed(obs, tmp_path):
+    """Fixed-width columns written to file"""
+    path = tmp_path / "out.txt"
+    obs.render([("2018-01-01", "00")], fmt="fixed", file=path)
+    lines = path.read_text().splitlines()
+    assert len({len(line) for line in lines}) == 1
+    assert lines[0].split() == ["DATE", "HOUR"] + list(obs._parameters_name_index)
+
+
+def test_render_file_object(info):
+    """Derived file to a file object"""
+    der = Derived(info.der_singel.path)
+    der.read()
+    buffer = io.StringIO()
+    der.render(fmt="csv", source="raw", file=buffer)
+    assert buffer.getvalue().count("\n") == 54
+
+
+def test_render_errors(obs):
+    """Wrong format, source and keys"""
+    with pytest.raises(ValueError):
+        obs.render(fmt="fail")
+    with pytest.raises(ValueError):
+        obs.render(source="fail")
+    with pytest.raises(KeyError):
+        obs.render([("2018-01-01", "42")])
@@ -0,0 +1,93 @@
+import concurrent.futures
+import numpy as np
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.derived import Derived
+from pyigra2.table import SoundingTable
+
+# New in Python 3.8
+shared_memory = pytest.importorskip("multiprocessing.shared_memory")
+from pyigra2.shared import attach, read_shared, share  # noqa: E402
+
+
+def assert_tables_equal(table, expected):
+    """Equal keys, columns, offsets and times"""
+    assert table.keys == expected.keys
+    np.testing.assert_array_equal(table.offsets, expected.offsets)
+    np.testing.assert_array_equal(table.times, expected.times)
+    np.testing.assert_array_equal(table.hour_missing, expected.hour_missing)
+    for group in ("header", "parameters"):
+        columns = getattr(table, group)
+        assert list(columns) == list(getattr(expected, group))
+        for name, values in getattr(expected, group).items():
+            np.testing.assert_array_equal(columns[name], values)
+
+
+@pytest.mark.parametrize("source", ["raw", "converted"])
+def test_share_attach(info, source):
+    """Attached table equals the shared one and uses the same memory"""
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    expected = SoundingTable.from_reader(obs, source)
+
+    with share(obs, source) as shared:
+        assert_tables_equal(shared.table, expected)
+
+        attached = attach(shared.descriptor)
+        assert_tables_equal(attached.table, expected)
+        assert not attached.owner
+
+        # Zero-copy, writes are seen by both
+        attached.table.offsets[-1] = -1
+        assert shared.table.offsets[-1] == -1
+        attached.close()
+
+    # Unlinked by the owner
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=shared.name)
+
+
+def test_read_shared(info):
+    """Blocks created in worker processes are taken over by the parent"""
+    paths = [info.obs_singel.path, info.der_multi.path]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        descriptors = list(executor.map(read_shared, paths))
+
+    for path, descriptor, cls in zip(paths, descriptors, (Observations, Derived)):
+        reader = cls(path)
+        reader.read()
+        reader.convert_to_numpy()
+
+        with attach(descriptor, owner=True) as shared:
+            assert_tables_equal(shared.table, SoundingTable.from_reader(reader))
+
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=descriptor["name"])
+
+
+def test_object_column(info):
+    """Columns of dtype object can not be shared"""
+    obs = Observations(info.obs_singel.path)
+    obs.read()
+    obs.convert_to_numpy()
+    table = SoundingTable.from_reader(obs)
+    table.header["ID"] = table.header["ID"].astype(object)
+
+    with pytest.raises(ValueError):
+        share(table)
+
+
+def test_share_encoded(info):
+    """Categories of an encoded header are shared with the table"""
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    encoded = SoundingTable.from_reader(obs).encode_header()
+
+    with share(encoded) as shared:
+        attached = attach(shared.descriptor)
+        assert attached.table.categories == encoded.categories
+        assert attached.table.header_mask("P_SRC", "ncdc-gts").all()
+        attached.close()
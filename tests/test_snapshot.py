@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.snapshot import snapshot
+from pyigra2.stations import StationRegistry
+from pyigra2.table import STANDARD_PRESSURE_LEVELS, SoundingTable
+
+
+@pytest.fixture
+def paths(tmp_path, info):
+    """obs_multi as two stations, and der_multi without soundings in 2018"""
+    text = info.obs_multi.path.read_text()
+    paths = []
+    for station in ("SWM00002527", "SWM00002185"):
+        path = tmp_path / f"{station}-data.txt"
+        path.write_text(text.replace("SWM00002527", station))
+        paths.append(path)
+
+    derived = tmp_path / "SWM00002527-drvd.txt"
+    derived.write_bytes(info.der_multi.path.read_bytes())
+    paths.append(derived)
+    yield paths
+
+
+@pytest.fixture(scope="module")
+def table(info):
+    """Table of the multi observation file"""
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield SoundingTable.from_reader(obs)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_snapshot(paths, table, max_workers):
+    """One sounding per station at the requested time"""
+    result = snapshot(paths, "2018-01-02T00:00", max_workers=max_workers)
+
+    np.testing.assert_array_equal(result.stations, ["SWM00002185", "SWM00002527"])
+    np.testing.assert_allclose(result.lat, 57.6572)
+    np.testing.assert_allclose(result.lon, 12.2911)
+    np.testing.assert_array_equal(
+        result.times, np.array(["2018-01-02T00:00"] * 2, dtype="datetime64[m]")
+    )
+    assert result.values.shape == (2, len(STANDARD_PRESSURE_LEVELS), 6)
+
+    temp = result.parameters.index("TEMP")
+    np.testing.assert_array_equal(
+        result.values[0, :, temp], table.level_matrix("TEMP")[2]
+    )
+    np.testing.assert_array_equal(result.values[0], result.values[1])
+
+
+def test_tolerance(paths):
+    """Soundings within the tolerance only"""
+    assert len(snapshot(paths, "2018-01-02T01:00", max_workers=1).stations) == 0
+
+    result = snapshot(paths, "2018-01-02T01:00", tolerance=60, max_workers=1)
+    assert len(result.stations) == 2
+
+
+def test_derived_registry(paths, info):
+    """Derived files have no position in the header, taken from the station list"""
+    registry = StationRegistry.from_file(
+        info.obs_multi.path.parent / "igra2-station-list.txt", cache=False
+    )
+    result = snapshot(
+        paths[2:],
+        "2020-05-26T00:00",
+        parameters=("TEMP", "UWND"),
+        levels=[50000],
+        registry=registry,
+        max_workers=1,
+    )
+    np.testing.assert_array_equal(result.stations, ["SWM00002527"])
+    assert result.lat[0] == pytest.approx(57.6572)
+    assert result.values[0, 0, 0] == pytest.approx(253.9)
+
+    with pytest.raises(KeyError):
+        snapshot(paths[2:], "2020-05-26T00:00", max_workers=1)
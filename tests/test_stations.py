@@ -0,0 +1,127 @@
+import pathlib
+import shutil
+import numpy as np
+import pytest
+from pyigra2.stations import StationRegistry, read_code_list, valid_id_format
+
+STATION_LIST = (
+    pathlib.Path(__file__).parent.resolve() / "data" / "igra2-station-list.txt"
+)
+DOCS = pathlib.Path(__file__).parent.resolve().parent / "docs"
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """Registry of a copy of the test station list (the cache is written next to it)"""
+    path = tmp_path / STATION_LIST.name
+    shutil.copy(STATION_LIST, path)
+    yield StationRegistry.from_file(path, cache=True)
+
+
+def test_from_file(registry, tmp_path):
+    """Columns are parsed, missing values are np.nan, cache is used"""
+    assert len(registry) == 28
+    assert "SWM00002527" in registry
+    assert "SWM00000000" not in registry
+
+    station = registry.station("SWM00002527")
+    assert station["NAME"] == "GOTEBORG/LANDVETTER"
+    assert station["LAT"] == pytest.approx(57.6572)
+    assert station["LON"] == pytest.approx(12.2911)
+    assert station["ELEV"] == pytest.approx(164.0)
+    assert station["STATE"] == ""
+    assert (station["FSTYEAR"], station["LSTYEAR"], station["NOBS"]) == (
+        1977,
+        2020,
+        37502,
+    )
+    assert registry.station("USM00070026")["STATE"] == "AK"
+
+    # Mobile stations
+    mobile = registry.station("ZZV0000DBBH")
+    assert (
+        np.isnan(mobile["LAT"]) and np.isnan(mobile["LON"]) and np.isnan(mobile["ELEV"])
+    )
+
+    with pytest.raises(KeyError):
+        registry.station("SWM00000000")
+
+    # From the cache
+    cache = tmp_path / (STATION_LIST.name + ".npz")
+    assert cache.exists()
+    cached = StationRegistry.from_file(tmp_path / STATION_LIST.name, cache=True)
+    for name, values in registry.columns.items():
+        np.testing.assert_array_equal(cached[name], values)
+
+    with pytest.raises(FileNotFoundError):
+        StationRegistry.from_file(tmp_path / "missing.txt")
+
+
+def test_queries(registry):
+    """Prefix, bounding box and period selections"""
+    sweden = registry.with_prefix("SW")
+    assert len(sweden) == 6
+    assert all(station.startswith("SW") for station in sweden["ID"])
+    assert len(registry.with_prefix("AF")) == 5
+    assert len(registry.with_prefix("XX")) == 0
+
+    # Southern Sweden
+    box = registry.in_bbox(55, 60, 10, 20)
+    assert set(box["ID"]) == {
+        "SWM00002084",
+        "SWM00002465",
+        "SWM00002527",
+    }
+
+    # Across the date line
+    assert len(registry.in_bbox(60, 75, 170, -150)) == 3
+
+    assert set(registry.active(1935, 1936)["ID"]) == {"AEXUAE05467", "USM00070026"}
+    assert set(registry.with_prefix("SW").active(2020)["ID"]) == {
+        "SWM00002365",
+        "SWM00002527",
+    }
+
+
+def test_ids(registry):
+    """Vectorized ID validation and sounding counts"""
+    ids = ["SWM00002527", "SWM00000000", "ZZV0000DBBH"]
+    np.testing.assert_array_equal(registry.is_valid_id(ids), [True, False, True])
+    np.testing.assert_array_equal(registry.expected_soundings(ids), [37502, 0, 3788])
+
+    np.testing.assert_array_equal(
+        valid_id_format(["SWM00002527", "SWM0000252", "SWQ00002527", "1WM00002527"]),
+        [True, False, False, False],
+    )
+
+
+def test_read_code_list(tmp_path):
+    """Country and state lists"""
+    path = tmp_path / "igra2-country-list.txt"
+    path.write_text("AC Antigua and Barbuda\nSW Sweden\n")
+    assert read_code_list(path) == {"AC": "Antigua and Barbuda", "SW": "Sweden"}
+
+
+def test_no_cache(tmp_path):
+    """The cache is only written on request"""
+    path = tmp_path / STATION_LIST.name
+    shutil.copy(STATION_LIST, path)
+    assert len(StationRegistry.from_file(path)) == 28
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_bundled_lists():
+    """The lists in docs/ have a title, which is not a record"""
+    registry = StationRegistry.from_file(DOCS / "igra2-station-list.rst")
+    assert len(registry) == 2788
+    assert valid_id_format(registry["ID"]).all()
+    assert registry.station("ACM00078861")["NAME"] == "COOLIDGE FIELD (UA)"
+
+    states = read_code_list(DOCS / "igra2-us-states.rst")
+    assert len(states) == 53
+    assert states["AK"] == "ALASKA"
+    assert all(len(code) == 2 and code.isalpha() for code in states)
+
+    countries = read_code_list(DOCS / "igra2-country-list.rst")
+    assert countries["SW"] == "Sweden"
+    assert all(len(code) == 2 and code.isalpha() for code in countries)
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.derived import Derived
+from pyigra2.store import Store
+from pyigra2.table import SoundingTable
+
+
+@pytest.fixture(scope="module")
+def table(info):
+    """Table of the multi observation file"""
+    # Setup
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield SoundingTable.from_reader(obs)
+    # Teardown
+
+
+@pytest.fixture(scope="function")
+def store(tmp_path, info):
+    """Store with the multi observation file, streamed from file"""
+    # Setup
+    store = Store(tmp_path / "store")
+    store.write(Observations(info.obs_multi.path), chunk_size=1)
+    yield store
+    # Teardown
+
+
+def test_write_open(store, table):
+    """Round trip through the store"""
+    assert store.stations() == ["SWM00002527"]
+
+    stored = store.open("SWM00002527")
+    assert stored.keys == table.keys
+    np.testing.assert_array_equal(stored.offsets, table.offsets)
+    np.testing.assert_array_equal(stored.times, table.times)
+    np.testing.assert_array_equal(stored.header["NUMLEV"], table.header["NUMLEV"])
+    np.testing.assert_array_equal(stored.header["ID"], table.header["ID"].astype("S"))
+    for name, values in table.parameters.items():
+        if values.dtype.kind == "U":
+            values = values.astype("S")
+        np.testing.assert_array_equal(stored.parameters[name], values)
+
+    # Zero-copy
+    assert isinstance(stored.parameters["TEMP"], np.memmap)
+
+
+def test_open_partial(store, table):
+    """Open selected columns and time range"""
+    stored = store.open(
+        "SWM00002527", columns=("ID", "TEMP"), start="2018-01-02", stop="2018-01-03"
+    )
+    assert set(stored.header) == {"ID"}
+    assert set(stored.parameters) == {"TEMP"}
+    assert stored.keys == table.keys[2:]
+    np.testing.assert_array_equal(
+        stored.parameters["TEMP"], table.take([2, 3, 4]).parameters["TEMP"]
+    )
+    assert stored.offsets[0] == 0
+
+    empty = store.open("SWM00002527", start="2019-01-01")
+    assert len(empty) == 0
+
+    with pytest.raises(KeyError):
+        store.open("SWM00002527", columns=("FAIL",))
+
+    with pytest.raises(KeyError):
+        store.open("MISSING")
+
+
+def test_append(tmp_path, table):
+    """Append only adds soundings not already stored"""
+    store = Store(tmp_path / "store")
+    assert store.write(table.take([0, 1])) == 2
+
+    assert store.append(table) == 3
+    assert store.open("SWM00002527").keys == table.keys
+
+    # Appending the same data again does nothing
+    assert store.append(table) == 0
+    assert store.manifest("SWM00002527")["num_soundings"] == len(table)
+
+
+def test_append_columns_mismatch(store, info):
+    """Derived data can not be appended to an observation station"""
+    der = Derived(info.der_multi.path)
+    der.read()
+    der.convert_to_numpy()
+    with pytest.raises(ValueError):
+        store.append(der, station="SWM00002527")
+
+
+def test_raw_source(tmp_path, info):
+    """Raw data is stored as bytes"""
+    store = Store(tmp_path / "store")
+    store.write(Observations(info.obs_singel.path), source="raw")
+    stored = store.open("SWM00002527")
+    assert store.manifest("SWM00002527")["source"] == "raw"
+    assert stored.parameters["PRESS"].dtype.kind == "S"
+    assert len(stored) == 1
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.derived import Derived
+from pyigra2.table import SoundingTable, STANDARD_PRESSURE_LEVELS
+
+
+@pytest.fixture(scope="module")
+def obs_multi(info):
+    """Read and converted multi observation file"""
+    # Setup
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield obs
+    # Teardown
+
+
+@pytest.fixture(scope="module")
+def table(obs_multi):
+    """Table of the multi observation file"""
+    yield SoundingTable.from_reader(obs_multi)
+
+
+def test_from_reader(table, obs_multi):
+    """Table should contain all soundings and levels"""
+    data = obs_multi.converted_data
+    keys = [(date, hour) for date, hours in data.items() for hour in hours]
+    assert table.keys == keys
+    assert len(table) == len(keys)
+    assert table.offsets[-1] == len(table.parameters["PRESS"])
+
+    for idx, (date, hour) in enumerate(keys):
+        sounding = table.sounding(idx)
+        expected = data[date][hour]
+        assert sounding["header"]["ID"] == expected["header"]["ID"]
+        np.testing.assert_array_equal(
+            sounding["parameters"]["TEMP"], expected["parameters"]["TEMP"]
+        )
+        assert table.num_levels[idx] == expected["header"]["NUMLEV"]
+
+
+def test_from_reader_wrong_source(obs_multi):
+    """Test incorrect source"""
+    with pytest.raises(ValueError):
+        SoundingTable.from_reader(obs_multi, source="fail")
+
+
+def test_empty_table(info):
+    """Table of a reader that has not been read"""
+    table = SoundingTable.from_reader(Observations(info.obs_singel.path))
+    assert len(table) == 0
+    assert table.level_matrix("TEMP").shape == (0, len(STANDARD_PRESSURE_LEVELS))
+
+
+def test_take_and_concatenate(table):
+    """Selecting and concatenating soundings keeps levels aligned"""
+    subset = table.take([3, 0])
+    assert subset.keys == [table.keys[3], table.keys[0]]
+    np.testing.assert_array_equal(
+        subset.sounding(0)["parameters"]["PRESS"],
+        table.sounding(3)["parameters"]["PRESS"],
+    )
+
+    mask = np.zeros(len(table), dtype=bool)
+    mask[1:] = True
+    joined = SoundingTable.concatenate([table.take(~mask), table.take(mask)])
+    assert joined.keys == table.keys
+    np.testing.assert_array_equal(joined.offsets, table.offsets)
+    np.testing.assert_array_equal(joined.parameters["GPH"], table.parameters["GPH"])
+
+
+def test_time_index(table):
+    """Time index from the table"""
+    index = table.time_index()
+    assert len(index) == len(table)
+    assert index.keys[0] == ("2018-01-01", "00")
+
+
+def test_level_matrix(table):
+    """Standard level values"""
+    matrix = table.level_matrix("TEMP")
+    assert matrix.shape == (len(table), len(STANDARD_PRESSURE_LEVELS))
+
+    # 500 hPa temperature of first sounding
+    sounding = table.sounding(0)["parameters"]
+    expected = sounding["TEMP"][sounding["PRESS"] == 50000][0]
+    column = np.flatnonzero(STANDARD_PRESSURE_LEVELS == 50000)[0]
+    assert matrix[0, column] == expected
+
+
+def test_level_matrix_derived(info):
+    """Derived files also have standard levels"""
+    der = Derived(info.der_singel.path)
+    der.read()
+    der.convert_to_numpy()
+    matrix = SoundingTable.from_reader(der).level_matrix("TEMP", levels=[85000])
+    assert matrix.shape == (1, 1)
+    assert np.isfinite(matrix[0, 0])
+
+
+def test_select(table):
+    """Column selection keeps the arrays"""
+    selected = table.select(("ID", "TEMP"))
+    assert set(selected.header) == {"ID"}
+    assert set(selected.parameters) == {"TEMP"}
+    assert selected.parameters["TEMP"] is table.parameters["TEMP"]
+
+    with pytest.raises(KeyError):
+        table.select(("FAIL",))
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.derived import Derived
+from pyigra2.timeindex import TimeIndex, sounding_keys, sounding_times
+
+
+@pytest.fixture(scope="module")
+def obs_index(info):
+    """Time index of the multi observation file"""
+    # Setup
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    yield obs.time_index()
+    # Teardown
+
+
+def test_sounding_times():
+    """Test nominal hours and the HOUR == 99 cases"""
+    times, hour_missing = sounding_times(
+        ["2018", "2018", "2018", "2018"],
+        ["01", "01", "12", "12"],
+        ["01", "01", "31", "31"],
+        ["00", "99", "99", "12"],
+        ["2330", "2330", "9999", "1105"],
+    )
+
+    expected = np.array(
+        [
+            "2018-01-01T00:00",
+            "2018-01-01T23:30",
+            "2018-12-31T00:00",
+            "2018-12-31T12:00",
+        ],
+        dtype="datetime64[m]",
+    )
+    assert np.all(times == expected)
+    assert hour_missing.tolist() == [False, False, True, False]
+
+
+def test_sounding_times_missing_minute():
+    """RELTIME HH99 has no minute information"""
+    times, hour_missing = sounding_times(["2020"], ["05"], ["26"], ["99"], ["0599"])
+    assert times[0] == np.datetime64("2020-05-26T05:00")
+    assert not hour_missing[0]
+
+
+def test_sounding_keys():
+    """Keys equal the ones of IGRABase.read(), missing hours are counted per date"""
+    assert sounding_keys(
+        ["2018", "2018", "2018"], ["01", "01", "01"], ["02", "02", "02"], ["99", "00", "99"]
+    ) == [("2018-01-02", "99_0"), ("2018-01-02", "00"), ("2018-01-02", "99_1")]
+
+
+def test_index_sorted(obs_index, info):
+    """All soundings should be indexed and sorted in time"""
+    assert len(obs_index) == 5
+    assert np.all(np.diff(obs_index.times) >= np.timedelta64(0, "m"))
+    assert obs_index.keys[0] == (info.obs_multi.dates[0], "00")
+
+    # Equal times keep file order
+    assert obs_index.keys[-2:] == [("2018-01-02", "99_0"), ("2018-01-02", "99_1")]
+
+
+def test_index_derived(info):
+    """Index from converted data of a derived file"""
+    der = Derived(info.der_multi.path)
+    der.read()
+    der.convert_to_numpy()
+    index = der.time_index(source="converted")
+    assert len(index) == 4
+    assert set(index) == {
+        (date, hour) for date, hours in der.converted_data.items() for hour in hours
+    }
+
+
+def test_index_wrong_source(info):
+    """Test incorrect source"""
+    obs = Observations(info.obs_singel.path)
+    with pytest.raises(ValueError):
+        obs.time_index(source="fail")
+
+
+def test_slice(obs_index):
+    """Time slices"""
+    assert obs_index.slice("2018-01-01", "2018-01-02") == [
+        ("2018-01-01", "00"),
+        ("2018-01-01", "99_0"),
+    ]
+    assert len(obs_index.slice(start="2018-01-02")) == 3
+    assert len(obs_index.slice(stop="2018-01-01T00:00")) == 0
+    assert obs_index.slice("2019-01-01", "2018-01-01") == []
+
+
+def test_nearest(obs_index):
+    """Nearest time lookup"""
+    assert obs_index.nearest("2018-01-01T02:00") == ("2018-01-01", "00")
+    assert obs_index.nearest("2018-01-01T20:00") == ("2018-01-01", "99_0")
+    assert obs_index.nearest("2030-01-01") == ("2018-01-02", "99_0")
+
+    with pytest.raises(KeyError):
+        obs_index.nearest("2030-01-01", tolerance=np.timedelta64(3, "h"))
+
+
+def test_resample(obs_index):
+    """Resample to a regular grid"""
+    grid, keys = obs_index.resample(
+        "2018-01-01T00:00", "2018-01-03T00:00", np.timedelta64(12, "h")
+    )
+    assert len(grid) == 4
+    assert keys == [
+        ("2018-01-01", "00"),
+        None,
+        ("2018-01-02", "00"),
+        None,
+    ]
+
+
+def test_empty_index():
+    """Lookups in an empty index"""
+    index = TimeIndex([], np.array([], dtype="datetime64[m]"))
+    assert index.slice() == []
+    with pytest.raises(KeyError):
+        index.nearest("2018-01-01")
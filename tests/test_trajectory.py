@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.table import SoundingTable
+from pyigra2.trajectory import bin_soundings, positions, trajectories
+
+
+@pytest.fixture(scope="module")
+def obs(info):
+    """Converted obs_multi"""
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield obs
+
+
+@pytest.fixture
+def ship(obs):
+    """obs_multi as a ship moving 1 degree east per sounding, last position missing"""
+    table = SoundingTable.from_reader(obs)
+    table.header["ID"] = np.full(len(table), "ZZV0000DBLK")
+    table.header["LAT"] = np.full(len(table), -700000.0)
+    table.header["LON"] = 1795000.0 + 10000.0 * np.arange(len(table))
+    table.header["LAT"][-1] = np.nan
+    yield table
+
+
+@pytest.mark.parametrize("source", ["raw", "converted"])
+def test_positions(obs, source):
+    """Raw and converted LAT/LON to degrees"""
+    lat, lon = positions(obs, source)
+    np.testing.assert_allclose(lat, 57.6572)
+    np.testing.assert_allclose(lon, 12.2911)
+
+
+def test_trajectories(obs, ship):
+    """One time sorted track per station"""
+    both = SoundingTable.concatenate([SoundingTable.from_reader(obs), ship])
+    tracks = trajectories(both)
+    assert sorted(tracks) == ["SWM00002527", "ZZV0000DBLK"]
+
+    track = tracks["ZZV0000DBLK"]
+    assert np.all(np.diff(track.times) >= np.timedelta64(0))
+    assert len(track.keys) == len(ship)
+
+    # Sorted by time, same order as the table apart from the two hour 00/99 pairs
+    order = np.argsort(ship.times, kind="stable")
+    np.testing.assert_allclose(track.lon, ship.header["LON"][order] * 1e-4)
+    assert np.isnan(track.lat).sum() == 1
+
+
+def test_bin_soundings(ship):
+    """Soundings are counted per day and grid cell, across the date line"""
+    bins = bin_soundings(ship, resolution=5.0, period="D")
+
+    # Last sounding has no position
+    assert bins.labels[-1] == -1
+    assert bins.count.sum() == len(ship) - 1
+
+    # 179.5, 180.5 (= -179.5) ... deg east
+    lon = ship.header["LON"] * 1e-4
+    for label, sounding_lon, time in zip(bins.labels[:-1], lon, ship.times):
+        assert bins.lat[label] == -70
+        assert bins.lon[label] == (175 if sounding_lon < 180 else -180)
+        assert bins.time[label] == time.astype("datetime64[D]")
+
+    # Two cells (west and east of the date line) with a coarse grid and long periods
+    bins = bin_soundings(ship, resolution=90.0, period="Y")
+    np.testing.assert_array_equal(bins.count, [len(ship) - 2, 1])
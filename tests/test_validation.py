@@ -0,0 +1,79 @@
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.derived import Derived
+
+
+@pytest.fixture
+def corrupt(info, tmp_path):
+    """obs_multi with a short line (2018-01-01 99_0), a non-numeric TEMP (2018-01-02 00)
+    and a missing data line (2018-01-02 99_0)"""
+    lines = info.obs_multi.path.read_text().splitlines(keepends=True)
+    lines[58] = lines[58][:20] + "\n"
+    lines[112] = lines[112][:22] + "  abc" + lines[112][27:]
+    del lines[170]
+
+    path = tmp_path / "corrupt.txt"
+    path.write_text("".join(lines))
+    yield path
+
+
+def test_valid_files(info):
+    """No problems in the test files"""
+    for case, cls in (
+        (info.obs_singel, Observations),
+        (info.obs_multi, Observations),
+        (info.der_singel, Derived),
+        (info.der_multi, Derived),
+    ):
+        reader = cls(case.path)
+        reader.read(tolerant=True)
+        assert reader.validate() == {}
+        assert reader.quarantine == {}
+
+
+def test_validate(corrupt):
+    """Problems are found and reported with line numbers"""
+    obs = Observations(corrupt)
+    obs.read()
+    problems = obs.validate()
+
+    assert sorted(problems) == [
+        ("2018-01-01", "99_0"),
+        ("2018-01-02", "00"),
+        ("2018-01-02", "99_0"),
+    ]
+    assert problems[("2018-01-01", "99_0")] == [
+        "Line 59 is too short (GPH, ZFLAG, TEMP, TFLAG, RH, DPDP, WDIR, WSPD incomplete)"
+    ]
+    assert problems[("2018-01-02", "00")] == ["Line 113 has non-numeric TEMP"]
+    assert problems[("2018-01-02", "99_0")] == [
+        "NUMLEV is 56 but the sounding has 55 levels"
+    ]
+
+    # Strict conversion fails on the malformed soundings
+    with pytest.raises(ValueError):
+        obs.convert_to_numpy()
+
+
+def test_tolerant(corrupt):
+    """Malformed soundings are quarantined, the rest is kept"""
+    obs = Observations(corrupt)
+    obs.read(tolerant=True)
+    assert list(obs.raw_data) == ["2018-01-01", "2018-01-02"]
+    assert list(obs.raw_data["2018-01-01"]) == ["00"]
+    assert list(obs.raw_data["2018-01-02"]) == ["99_1"]
+
+    assert list(obs.quarantine["2018-01-02"]) == ["00", "99_0"]
+    quarantined = obs.quarantine["2018-01-02"]["00"]
+    assert quarantined["errors"] == ["Line 113 has non-numeric TEMP"]
+    assert "parameters" in quarantined and "header" in quarantined
+
+    obs.convert_to_numpy()
+    assert list(obs.converted_data["2018-01-02"]) == ["99_1"]
+
+    # Quarantine when converting
+    obs = Observations(corrupt)
+    obs.read()
+    obs.convert_to_numpy(tolerant=True)
+    assert len(obs.quarantine["2018-01-02"]) == 2
+    assert list(obs.converted_data["2018-01-01"]) == ["00"]
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.derived import Derived
+from pyigra2.table import SoundingTable
+from pyigra2.wind import (
+    bulk_shear,
+    components,
+    mean_wind,
+    storm_motion,
+    storm_relative_helicity,
+    to_components,
+    to_direction_speed,
+    wind_at,
+)
+
+
+@pytest.fixture
+def table():
+    """Westerly wind increasing 1 m/s per km from 100 m (ground) and a 2 km sounding"""
+    heights = np.array([100, 1600, 3100, 6100, 9100, 100, 1100, 2100], dtype=float)
+    speed = (heights - 100) / 1000
+    speed[5:] = 5
+    header = {
+        "YEAR": np.array(["2020", "2020"]),
+        "MONTH": np.array(["01", "01"]),
+        "DAY": np.array(["01", "02"]),
+        "HOUR": np.array(["00", "00"]),
+        "RELTIME": np.array(["0000", "0000"]),
+    }
+    parameters = {
+        "GPH": heights,
+        "WDIR": np.full(len(heights), np.radians(270)),
+        "WSPD": speed,
+    }
+    yield SoundingTable(
+        [("2020-01-01", "00"), ("2020-01-02", "00")], header, parameters, [0, 5, 8]
+    )
+
+
+def test_conversion():
+    """dir/speed <-> u/v"""
+    direction = np.radians([0, 90, 180, 270])
+    u, v = to_components(direction, [1, 2, 3, 4])
+    np.testing.assert_allclose(u, [0, -2, 0, 4], atol=1e-12)
+    np.testing.assert_allclose(v, [-1, 0, 3, 0], atol=1e-12)
+
+    back_direction, back_speed = to_direction_speed(u, v)
+    np.testing.assert_allclose(back_direction, direction, atol=1e-12)
+    np.testing.assert_allclose(back_speed, [1, 2, 3, 4])
+
+
+def test_components(info, table):
+    """Components from either reader"""
+    u, v = components(table)
+    np.testing.assert_allclose(u, table.parameters["WSPD"])
+
+    derived = Derived(info.der_singel.path)
+    derived.read()
+    derived.convert_to_numpy()
+    u, v = components(derived)
+    np.testing.assert_array_equal(
+        u, SoundingTable.from_reader(derived).parameters["UWND"]
+    )
+
+
+def test_layers(table):
+    """Interpolation, shear and mean wind above ground"""
+    u, v = wind_at(table, [2250, 2000])
+    np.testing.assert_allclose(u, [2.25, 5])
+    np.testing.assert_allclose(v, 0, atol=1e-12)
+
+    # Exactly at the top, above the top
+    u, v = wind_at(table, [9000, 2001])
+    assert u[0] == pytest.approx(9) and np.isnan(u[1])
+
+    du, dv = bulk_shear(table, 0, 6000)
+    assert du[0] == pytest.approx(6) and np.isnan(du[1])
+    du, dv = bulk_shear(table, 500, 1500)
+    np.testing.assert_allclose(du, [1, 0], atol=1e-12)
+
+    mean_u, mean_v = mean_wind(table, 0, 6000)
+    assert mean_u[0] == pytest.approx(3) and np.isnan(mean_u[1])
+
+
+def test_helicity(table):
+    """SRH of a straight hodograph"""
+    # Storm moving 5 m/s to the south, the shear vector 10 m/s to the east over 3 km
+    srh = storm_relative_helicity(table, top=3000, motion=(0, -5))
+    assert srh[0] == pytest.approx(3 * 5)
+    assert np.isnan(srh[1])
+
+    # Bunkers: 3 m/s mean wind, deviation to the right of the (eastward) shear = south
+    cu, cv = storm_motion(table)
+    assert cu[0] == pytest.approx(3) and cv[0] == pytest.approx(-7.5)
+    assert storm_relative_helicity(table, top=3000)[0] == pytest.approx(3 * 7.5)
+
+
+def test_readers(info):
+    """Vectorized over all soundings of both readers"""
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    du, dv = bulk_shear(obs, 0, 6000)
+    assert len(du) == 5 and np.isfinite(du).all()
+
+    derived = Derived(info.der_multi.path)
+    derived.read()
+    derived.convert_to_numpy()
+    assert np.isfinite(storm_relative_helicity(derived)).all()
+
+
+def test_raw_source(info):
+    """Raw text is converted (missing values, tenths, degrees) before use"""
+    for reader in (Observations(info.obs_multi.path), Derived(info.der_multi.path)):
+        reader.read()
+        reader.convert_to_numpy()
+
+        u_raw, v_raw = components(reader, source="raw")
+        u, v = components(reader)
+        np.testing.assert_allclose(u_raw, u, equal_nan=True)
+        np.testing.assert_allclose(v_raw, v, equal_nan=True)
+        assert np.isnan(u).any() and np.nanmax(np.abs(u)) < 100
+
+        np.testing.assert_allclose(
+            bulk_shear(reader, 0, 6000, source="raw"), bulk_shear(reader, 0, 6000)
+        )
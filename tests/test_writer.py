@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from pyigra2.observations import Observations
+from pyigra2.derived import Derived
+from pyigra2.table import SoundingTable
+from pyigra2.writer import to_bytes, write_igra2
+
+
+def read_convert(reader):
+    """Read and convert a reader"""
+    reader.read()
+    reader.convert_to_numpy()
+    return reader
+
+
+@pytest.fixture(scope="module")
+def readers(info):
+    """All test files, read and converted"""
+    yield [
+        read_convert(Observations(info.obs_singel.path)),
+        read_convert(Observations(info.obs_multi.path)),
+        read_convert(Derived(info.der_singel.path)),
+        read_convert(Derived(info.der_multi.path)),
+    ]
+
+
+@pytest.mark.parametrize("source", ["raw", "converted"])
+def test_round_trip(readers, tmp_path, source):
+    """Parse -> write gives the test files byte for byte"""
+    for reader in readers:
+        path = tmp_path / reader.filename.name
+        write_igra2(reader, path, source=source)
+        assert path.read_bytes() == reader.filename.read_bytes()
+
+
+def test_table_filtered(readers):
+    """Filtered levels update NUMLEV and give a readable file"""
+    obs = readers[1]
+    table = SoundingTable.from_reader(obs)
+    keep = table.take([0, 2])
+
+    text = to_bytes(keep, "observations", source="converted").decode()
+    lines = text.splitlines()
+    assert lines[0].startswith("#SWM00002527 2018 01 01 00")
+    assert int(lines[0][32:36]) == keep.num_levels[0]
+    assert len(lines) == 2 + keep.offsets[-1]
+
+
+def test_written_file_reads_back(readers, tmp_path):
+    """Corrected values survive write and read"""
+    der = readers[2]
+    table = SoundingTable.from_reader(der)
+    table.parameters["TEMP"] = table.parameters["TEMP"] + 1.0
+
+    path = tmp_path / "corrected.txt"
+    write_igra2(table, path, source="converted", layout="derived")
+
+    corrected = read_convert(Derived(path))
+    np.testing.assert_allclose(
+        corrected.converted_data["2020-05-26"]["00"]["parameters"]["TEMP"],
+        der.converted_data["2020-05-26"]["00"]["parameters"]["TEMP"] + 1.0,
+    )
+
+
+def test_errors(readers):
+    """Wrong layout, type, source and too wide values"""
+    table = SoundingTable.from_reader(readers[0])
+    with pytest.raises(ValueError):
+        write_igra2(table, "unused.txt")
+    with pytest.raises(TypeError):
+        write_igra2({}, "unused.txt")
+    with pytest.raises(ValueError):
+        to_bytes(table, "observations", source="fail")
+
+    table.parameters["PRESS"] = table.parameters["PRESS"] * 1e6
+    with pytest.raises(ValueError):
+        to_bytes(table, "observations", source="converted")
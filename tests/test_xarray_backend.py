@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from pyigra2.derived import Derived
+from pyigra2.fileindex import FileIndex
+from pyigra2.observations import Observations
+from pyigra2.table import SoundingTable
+
+xr = pytest.importorskip("xarray")
+backend = pytest.importorskip("pyigra2.xarray_backend")
+
+
+@pytest.fixture(scope="module")
+def table(info):
+    """Table of the multi observation file"""
+    obs = Observations(info.obs_multi.path)
+    obs.read()
+    obs.convert_to_numpy()
+    yield SoundingTable.from_reader(obs)
+
+
+def open_dataset(path, **kwargs):
+    """Open with the backend"""
+    return xr.open_dataset(path, engine=backend.IGRA2BackendEntrypoint, **kwargs)
+
+
+def test_levels(info, table, monkeypatch):
+    """Standard pressure levels, parsed on access"""
+    parsed = []
+    table_method = FileIndex.table
+
+    def count(self, first=0, last=None, source="converted"):
+        parsed.append((first, last))
+        return table_method(self, first, last, source)
+
+    monkeypatch.setattr(FileIndex, "table", count)
+
+    dataset = open_dataset(info.obs_multi.path, chunk_size=2)
+    assert dataset.dims == {"time": 5, "pressure": 21}
+    assert "PFLAG" not in dataset
+    assert dataset["TEMP"].attrs["units"] == "K"
+    np.testing.assert_array_equal(
+        dataset["time"].values, table.times.astype("datetime64[ns]")
+    )
+
+    # Only the first sounding is parsed on open, for the names and dtypes
+    assert parsed == [(0, 1)]
+
+    np.testing.assert_array_equal(
+        dataset["TEMP"][3].values, table.level_matrix("TEMP")[3]
+    )
+    assert parsed == [(0, 1), (2, 4)]
+
+    np.testing.assert_array_equal(dataset["TEMP"].values, table.level_matrix("TEMP"))
+    np.testing.assert_array_equal(dataset["ID"].values, table.header["ID"])
+
+
+def test_ragged(info):
+    """All levels with row_size, derived file"""
+    der = Derived(info.der_multi.path)
+    der.read()
+    der.convert_to_numpy()
+    table = SoundingTable.from_reader(der)
+
+    dataset = open_dataset(info.der_multi.path, layout="ragged", chunk_size=1)
+    np.testing.assert_array_equal(dataset["row_size"].values, table.num_levels)
+    np.testing.assert_array_equal(
+        dataset["CALCGPH"].values, table.parameters["CALCGPH"]
+    )
+    start, stop = table.offsets[2], table.offsets[3]
+    np.testing.assert_array_equal(
+        dataset["PRESS"][start:stop].values, table.parameters["PRESS"][start:stop]
+    )
+
+
+def test_dask(info, table):
+    """Chunked along the sounding dimension"""
+    pytest.importorskip("dask")
+    dataset = open_dataset(info.obs_multi.path, chunk_size=2, chunks={})
+    assert dataset["TEMP"].chunks == ((2, 2, 1), (21,))
+    np.testing.assert_array_equal(
+        dataset["TEMP"].mean("pressure").values,
+        np.nanmean(table.level_matrix("TEMP"), axis=1),
+    )
+
+
+def test_guess_can_open(info, tmp_path):
+    """IGRA2 files are recognized"""
+    entrypoint = backend.IGRA2BackendEntrypoint()
+    assert entrypoint.guess_can_open(info.obs_singel.path)
+    assert not entrypoint.guess_can_open(tmp_path / "missing.txt")
+
+    with pytest.raises(ValueError):
+        open_dataset(info.obs_singel.path, layout="fail")
+
+
+def test_no_cache(info, tmp_path):
+    """Opening does not write next to the data unless asked to"""
+    path = tmp_path / info.obs_multi.path.name
+    path.write_bytes(info.obs_multi.path.read_bytes())
+
+    open_dataset(path).close()
+    assert list(tmp_path.iterdir()) == [path]
+
+    open_dataset(path, cache_index=True).close()
+    assert path.with_name(path.name + ".idx.npz").exists()